@@ -5,10 +5,14 @@
 import os
 from configparser import ConfigParser
 from datetime import datetime
+from pathlib import Path
 import argparse
+import json
+import re
 
 from core.dfd_extraction import perform_analysis
 from output_generators.logger import logger
+import output_generators.traceability_index as traceability_index
 import tmp.tmp as tmp
 
 CONFIG_SECTIONS = ["Analysis Settings", "Repository", "Technology Profiles", "DFD"]
@@ -62,6 +66,26 @@ def api_invocation(url: str, commit: str) -> dict:
     return response
 
 
+def query_invocation(url: str, commit: str, file: str, first_line=None, last_line=None) -> list:
+    """Entry function for traceability queries: returns the DFD items that were extracted from a file, optionally only
+    from the given lines, in the analysis of the repository at the commit.
+    """
+
+    if os.path.isdir(url):
+        repo_name = Path(url).expanduser().resolve().name
+    else:
+        repo_name = re.sub(r"\.git$", "", url.rstrip("/").split("/")[-1])
+    for name in [repo_name, commit]:
+        if name in ["", ".", ".."] or os.path.basename(name) != name:
+            raise ValueError(f"Invalid repository or commit name {name}")
+    output_path = os.path.join(os.getcwd(), "code2DFD_output", repo_name.replace("/", "--"), commit)
+    index_path = traceability_index.get_index_path(output_path)
+    if not os.path.isfile(index_path):
+        raise FileNotFoundError(f"No traceability index for {repo_name} at commit {commit}, analyse it first")
+
+    return traceability_index.query(index_path, file, first_line, last_line)
+
+
 def cli_invocation():
     parser = argparse.ArgumentParser()
     parser.add_argument("--config_path", type=str, help="Path to the config file to use (can be replaced with following CLI arguments")
@@ -72,6 +96,8 @@ def cli_invocation():
     settings = parser.add_argument_group("Analysis Settings", "Parameters for additional analysis settings")
     settings.add_argument("--commit", type=str, help="Analyze repository at this commit")
     settings.add_argument("--development_mode", action='store_true', help="Switch on development mode")
+    queries = parser.add_argument_group("Traceability Queries", "Look up the DFD items of an analysed commit instead of analysing it")
+    queries.add_argument("--query_traceability", type=str, metavar="FILE[:LINE[-LINE]]", help="Print the DFD items extracted from this file (relative to the repository) and lines")
 
     args = parser.parse_args()
 
@@ -111,6 +137,18 @@ def cli_invocation():
         commit = tmp.tmp_config.get("Analysis Settings", "commit")[:7]
         tmp.tmp_config.set("Analysis Settings", "commit", commit)
 
+    if args.query_traceability:
+        if not tmp.tmp_config.has_option("Analysis Settings", "commit"):
+            raise AttributeError("Parameter [Analysis Settings][commit] must be provided for traceability queries")
+        file, first_line, last_line = args.query_traceability, None, None
+        location = re.fullmatch(r"(.*):(\d+)(?:-(\d+))?", args.query_traceability)
+        if location:
+            file, first_line, last_line = location.group(1), int(location.group(2)), location.group(3)
+            last_line = int(last_line) if last_line else None
+        results = query_invocation(tmp.tmp_config.get("Repository", "url"), commit, file, first_line, last_line)
+        print(json.dumps(results, indent=4))
+        return
+
     perform_analysis()
 
 
@@ -1,43 +1,209 @@
-from core.service import CService
-from core.external_entity import CExternalEntity
-from core.information_flow import CInformationFlow
+class CCollection(dict):
+    """Collection of model items (services, information flows, external components), mapping ids to items.
+    Behaves like a dict and prints like one. Additionally, it allocates ids from a monotonic counter and keeps secondary
+    indexes name -> ids and (sender, receiver) -> ids, plus value -> ids for other fields looked up with find_by().
+    Items are indexed lazily on the next lookup after they were inserted, since extractors usually insert an empty item
+    and fill in its fields afterwards. Names or flow ends of indexed items have to be changed through rename() /
+    set_flow_ends(), or reindex() has to be called after changing indexed fields directly.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.counter = max((id for id in self.keys() if isinstance(id, int)), default=-1) + 1
+        self.names = dict()     # name -> ids
+        self.flows = dict()     # (sender, receiver) -> ids
+        self.fields = dict()    # field -> value -> ids, for the fields looked up with find_by()
+        self.indexed = dict()   # id -> (name, (sender, receiver), {field: value}) as entered in the indexes
+        self.dirty = set(self.keys())
+
+    def __reduce__(self):
+        return (type(self), (dict(self),), {"counter": self.counter})
+
+    def __setstate__(self, state):
+        self.counter = max(self.counter, state["counter"])     # ids of deleted items stay used in copies
+
+    def __setitem__(self, id, item):
+        super().__setitem__(id, item)
+        self.dirty.add(id)
+        if isinstance(id, int) and id >= self.counter:
+            self.counter = id + 1
+
+    def __delitem__(self, id):
+        super().__delitem__(id)
+        self.dirty.add(id)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        for id, item in dict(*args, **kwargs).items():
+            self[id] = item
+
+    def setdefault(self, id, default=None):
+        if id not in self:
+            self[id] = default
+        return self[id]
+
+    def pop(self, id, *default):
+        self.dirty.add(id)
+        return super().pop(id, *default)
+
+    def popitem(self):
+        id, item = super().popitem()
+        self.dirty.add(id)
+        return id, item
+
+    def clear(self):
+        super().clear()
+        self.names.clear()
+        self.flows.clear()
+        self.fields.clear()
+        self.indexed.clear()
+        self.dirty.clear()
+
+    def copy(self):
+        collection = type(self)(self)
+        collection.counter = self.counter
+        return collection
+
+    def next_id(self) -> int:
+        """Returns the id for the next new item. Ids are never reused, even if items are deleted.
+        """
+
+        return self.counter
+
+    def add(self, item: dict) -> int:
+        """Inserts an item under a new id and returns the id.
+        """
+
+        id = self.counter
+        self[id] = item
+        return id
+
+    def find_by_name(self, name: str) -> list:
+        """Returns the ids of all items with the given name, in id order.
+        """
+
+        self.refresh()
+        return [id for id in sorted(self.names.get(name, ())) if self[id].get("name") == name]
+
+    def find_flows(self, sender: str, receiver: str) -> list:
+        """Returns the ids of all information flows from sender to receiver, in id order.
+        """
+
+        self.refresh()
+        return [id for id in sorted(self.flows.get((sender, receiver), ()))
+                if self[id].get("sender") == sender and self[id].get("receiver") == receiver]
+
+    def find_by(self, field: str, value) -> list:
+        """Returns the ids of all items whose field has the given value (a string or number), in id order.
+        The first lookup of a field indexes all items.
+        """
+
+        if field not in self.fields:
+            self.fields[field] = dict()
+            self.reindex()
+        self.refresh()
+        return [id for id in sorted(self.fields[field].get(value, ())) if self[id].get(field) == value]
+
+    def rename(self, id, name: str):
+        """Changes an item's name and keeps the index up to date.
+        """
+
+        self[id]["name"] = name
+        self.dirty.add(id)
+
+    def set_flow_ends(self, id, sender: str, receiver: str):
+        """Changes an information flow's sender and receiver and keeps the index up to date.
+        """
+
+        self[id]["sender"] = sender
+        self[id]["receiver"] = receiver
+        self.dirty.add(id)
+
+    def reindex(self):
+        """Marks all items for reindexing, e.g. after names were changed directly.
+        """
+
+        self.dirty.update(self.keys())
+
+    def refresh(self):
+        """Brings the indexes up to date for all items inserted, replaced, or changed since the last lookup.
+        Items that have neither a name nor flow ends yet stay pending.
+        """
+
+        for id in list(self.dirty):
+            name, ends, values = self.indexed.pop(id, (None, None, dict()))
+            if name is not None:
+                self.names[name].discard(id)
+            if ends is not None:
+                self.flows[ends].discard(id)
+            for field, value in values.items():
+                self.fields[field][value].discard(id)
+
+            item = dict.get(self, id)
+            if not isinstance(item, dict):
+                self.dirty.discard(id)
+                continue
+            name = item.get("name")
+            ends = (item["sender"], item["receiver"]) if "sender" in item and "receiver" in item else None
+            if name is None and ends is None:
+                continue
+            if name is not None:
+                self.names.setdefault(name, set()).add(id)
+            if ends is not None:
+                self.flows.setdefault(ends, set()).add(id)
+            values = {field: item[field] for field in self.fields if isinstance(item.get(field), (str, int, float))}
+            for field, value in values.items():
+                self.fields[field].setdefault(value, set()).add(id)
+            self.indexed[id] = (name, ends, values)
+            self.dirty.discard(id)
+
+
+def collection_property(attribute: str) -> property:
+    """Model attribute that holds a CCollection. Plain dicts assigned to it are converted.
+    """
+
+    def get(self):
+        return getattr(self, attribute)
+
+    def set(self, items):
+        if items is not None and not isinstance(items, CCollection):
+            items = CCollection(items)
+        setattr(self, attribute, items)
+
+    return property(get, set)
 
 
 class CDFD:
     """Class CDFD as central collection of all extracted information.
+    The extractors read and modify the model's collections directly. Each one maps ids to items and is None until set.
     """
 
+    microservices = collection_property("_microservices")
+    information_flows = collection_property("_information_flows")
+    external_components = collection_property("_external_components")
+
     def __init__(self, name):
         self.name = name
-        self.services = [CService]
-        self.external_entities = [CExternalEntity]
-        self.information_flows = [CInformationFlow]
         self.traceability = dict()
 
+        self.microservices = None           # id -> {"name", "image", "type", "properties", "stereotype_instances", "tagged_values", ...}
+        self.information_flows = None       # id -> {"sender", "receiver", "stereotype_instances", "tagged_values"}
+        self.external_components = None    # id -> {"name", "type", "stereotype_instances", "tagged_values"}
+        self.endpoints = None               # {(endpoint, service, method, file, line, span)} found by the RestTemplate extractor
+
     def __str__(self):
         return f"DFD {self.name}"
 
-    def add_service(self, service: CService):
-        if not service.name in [s.name for s in self.services]:
-            self.services.append(service)
-        else:
-            # merge stereotypes
-            pass
-        
-
-    def add_external_entity(self, external_entity):
-        if not external_entity.name in [e.name for e in self.external_entities]:
-            self.external_entities.append(external_entity)
-        else:
-            # merge stereotypes
-            pass
-
-    def add_information_flow(self, information_flow):
-        if not information_flow.name in [i.name for i in self.information_flows]:
-            self.information_flows.append(information_flow)
-        else:
-            # merge stereotypes
-            pass
+    def write_to_config(self, config):
+        """Writes the model's collections to the [DFD] section of a config, for debugging.
+        """
+
+        for collection in ["microservices", "information_flows", "external_components", "endpoints"]:
+            if getattr(self, collection) is not None:
+                config.set("DFD", collection, str(getattr(self, collection)).replace("%", "%%"))
 
     def create_png(self):
         pass
@@ -0,0 +1,110 @@
+"""Resolution of ambiguous file-to-service attributions.
+When a file's path names no service or several services with the same name, the service is chosen by
+[Analysis Settings] attribution_mode:
+    ranked (default)    candidates are ranked by build-file proximity (the service whose pom.xml or build.gradle is in
+                        the deepest ancestor directory of the file), then by the deepest path component naming them,
+                        then by model order; files without any evidence are not attributed
+    interactive         the user is asked on the terminal; falls back to ranked if there is no terminal
+Every ambiguous attribution is recorded and written to PROJECT_attribution_report.json in the output directory.
+"""
+
+import json
+import os
+from pathlib import Path
+import sys
+
+import core.corpus as corpus
+from output_generators.logger import logger
+import tmp.tmp as tmp
+
+
+MODES = ["ranked", "interactive"]
+
+report = list()     # {"file", "candidates", "service", "mode"} per ambiguous attribution
+
+
+def reset():
+    """Drops the recorded attributions. Has to be called together with corpus.reset().
+    """
+
+    global report
+
+    report = list()
+
+
+def get_mode() -> str:
+    """Returns the configured attribution mode, or the default.
+    """
+
+    mode = tmp.tmp_config.get("Analysis Settings", "attribution_mode", fallback="ranked").strip().casefold()
+    if mode not in MODES:
+        logger.info(f"Unknown attribution_mode {mode}, using ranked")
+        return "ranked"
+    return mode
+
+
+def resolve(file_path: str, candidates: list, microservices: dict):
+    """Chooses the service for a file from the candidate service names, or returns False if none fits.
+    """
+
+    mode = get_mode()
+    if mode == "interactive" and not sys.stdin.isatty():
+        mode = "ranked"
+
+    if mode == "interactive":
+        print("\tFound " + str(len(candidates)) + " microservices for file " + str(file_path) + ". \
+        \n\tPlease choose microservice that the file belongs to: ")
+        i = 1
+        for m in candidates:
+            print("\t[" + str(i) + "] " + str(m))
+            i += 1
+        service = candidates[int(input("\n\t > ")) - 1]
+    else:
+        service = rank(file_path, candidates, microservices)
+
+    report.append({"file": str(file_path), "candidates": list(candidates), "service": service, "mode": mode})
+    logger.info(f"Ambiguous attribution of {file_path} to {candidates}, chose {service}")
+    return service
+
+
+def rank(file_path: str, candidates: list, microservices: dict):
+    """Returns the best ranked candidate, or False if no candidate is supported by the file's path.
+    """
+
+    path = corpus.relative_path(str(file_path))
+    path_parts = Path(path).parts
+
+    best = False
+    best_score = None
+    for candidate in dict.fromkeys(candidates):     # unique, in model order
+        build_file_depth = -1
+        for m in microservices.find_by_name(candidate):
+            for build_file in ["pom_path", "gradle_path"]:
+                directory = os.path.dirname(str(microservices[m].get(build_file, "")))
+                if directory and path.startswith(directory + os.sep):
+                    build_file_depth = max(build_file_depth, len(Path(directory).parts))
+        path_depth = max((i for i, part in enumerate(path_parts) if part == candidate), default=-1)
+
+        score = (build_file_depth, path_depth)
+        if score == (-1, -1):
+            continue
+        if best_score is None or score > best_score:
+            best, best_score = candidate, score
+    return best
+
+
+def save():
+    """Writes the report of ambiguous attributions to the output directory, if there were any.
+    """
+
+    if not report or not tmp.tmp_config.has_option("Analysis Settings", "output_path"):
+        return
+    output_path = tmp.tmp_config["Analysis Settings"]["output_path"]
+    parts = Path(output_path).parts
+    report_path = os.path.join(output_path, f"{parts[-2]}--{parts[-1]}_attribution_report.json")
+    try:
+        os.makedirs(output_path, exist_ok=True)
+        with open(report_path, "w") as file:
+            json.dump(report, file, indent=4)
+    except OSError as e:
+        logger.info(f"Could not write attribution report {report_path}: {e}")
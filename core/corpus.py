@@ -0,0 +1,353 @@
+"""In-memory corpus of the analysed repository.
+The checked-out repository is walked once per analysis and every text file is kept with its lines, path, and name,
+so that keyword searches and file lookups don't have to spawn subprocesses or re-read files from disk.
+Paths ignored via .gitignore or excluded in the config ([Analysis Settings] excluded_paths) are not walked at all.
+"""
+
+import ast
+import fnmatch
+import hashlib
+import os
+import re
+
+import core.extractor_profile as extractor_profile
+from output_generators.logger import logger
+import tmp.tmp as tmp
+
+
+DEFAULT_EXCLUDED_PATHS = ["target/", "build/", "node_modules/"]
+
+files = dict()          # relative path -> {"id", "name", "path", "full_path", "size", "searchable"} (+ "content", "hash" once read)
+directories = dict()    # relative path ("" for the root) -> {"path", "parent", "subdirectories", "files"}
+names = dict()          # file name -> relative paths of all files with that name, in walk order
+name_queries = dict()   # glob pattern -> relative paths of all files whose name matches, in walk order
+casefolded_names = dict()   # casefolded file name -> relative paths, built on first use
+repo_path = None
+loaded = False
+
+
+def reset():
+    """Drops the corpus. Has to be called whenever the checked-out state of the repository changes.
+    """
+
+    global files, directories, names, name_queries, casefolded_names, repo_path, loaded
+
+    files = dict()
+    directories = dict()
+    names = dict()
+    name_queries = dict()
+    casefolded_names = dict()
+    repo_path = None
+    loaded = False
+
+
+def load():
+    """Walks the local repository once and registers all directories and files in it.
+    File contents are read lazily on first access and kept from then on.
+    """
+
+    global files, directories, names, name_queries, casefolded_names, repo_path, loaded
+
+    local_path = tmp.tmp_config["Repository"]["local_path"]
+    if loaded and repo_path == local_path:
+        return
+
+    files = dict()
+    directories = dict()
+    names = dict()
+    name_queries = dict()
+    casefolded_names = dict()
+    repo_path = local_path
+    excludes = [compile_ignore_pattern("", pattern) for pattern in get_excluded_paths()]
+    walk(local_path, "", None, excludes, list())
+    loaded = True
+    logger.info(f"Corpus of {local_path} holds {len(files)} files in {len(directories)} directories")
+
+
+def walk(full_path: str, path: str, parent, excludes: list, ignore_rules: list):
+    """Registers the directory and everything below it, depth-first in directory order.
+    Symbolic links, the .git folder, and excluded or git-ignored paths are not followed.
+    """
+
+    subdirectories = list()
+    directory_files = list()
+    directories[path] = {"path": path, "parent": parent, "subdirectories": subdirectories, "files": directory_files}
+    ignore_rules = ignore_rules + read_gitignore(full_path, path)
+
+    try:
+        entries = os.scandir(full_path)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_symlink():
+                continue
+            entry_path = os.path.join(path, entry.name)
+            is_dir = entry.is_dir()
+            if (is_dir and entry.name == ".git") or is_ignored(entry_path, is_dir, excludes, ignore_rules):
+                continue
+            if is_dir:
+                subdirectories.append(entry_path)
+                walk(entry.path, entry_path, path, excludes, ignore_rules)
+            elif entry.is_file():
+                files[entry_path] = {"id": len(files), "name": entry.name, "path": entry_path, "full_path": entry.path,
+                                     "size": entry.stat().st_size, "searchable": is_searchable(entry.path)}
+                names.setdefault(entry.name, list()).append(entry_path)
+                directory_files.append(entry_path)
+
+    directories[path]["subdirectories"] = tuple(subdirectories)
+    directories[path]["files"] = tuple(directory_files)
+
+
+def is_searchable(full_path: str) -> bool:
+    """Heuristic of the keyword search: tests and markdown files are never searched, so they are never read for it.
+    """
+
+    return not ("test" in full_path or len(full_path) < 3 or os.path.splitext(full_path)[1] == ".md")
+
+
+def get_excluded_paths() -> list:
+    """Returns the exclude patterns (.gitignore syntax) from the config, or the defaults.
+    """
+
+    if tmp.tmp_config.has_option("Analysis Settings", "excluded_paths"):
+        return ast.literal_eval(tmp.tmp_config["Analysis Settings"]["excluded_paths"])
+    return DEFAULT_EXCLUDED_PATHS
+
+
+def read_gitignore(full_path: str, path: str) -> list:
+    """Reads the rules of a directory's .gitignore file, if there is one.
+    """
+
+    rules = list()
+    try:
+        with open(os.path.join(full_path, ".gitignore"), "r") as file:
+            lines = file.readlines()
+    except (OSError, UnicodeDecodeError):
+        return rules
+    for line in lines:
+        line = line.rstrip("\n").rstrip()
+        if line and not line.startswith("#"):
+            rules.append(compile_ignore_pattern(path, line))
+    return rules
+
+
+def compile_ignore_pattern(base: str, pattern: str) -> tuple:
+    """Translates a .gitignore pattern into a rule (base directory, regex, negated, directories only).
+    """
+
+    negated = pattern.startswith("!")
+    if negated or pattern.startswith("\\"):
+        pattern = pattern[1:]
+    directories_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+            continue
+        if pattern.startswith("/**", i) and i + 3 == len(pattern):
+            regex += "/.*"
+            i += 3
+            continue
+        char = pattern[i]
+        if char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            character_class = pattern[i + 1:end]
+            if character_class.startswith("!"):
+                character_class = "^" + character_class[1:]
+            regex += "[" + character_class.replace("\\", "\\\\") + "]"
+            i = end
+        elif char == "\\" and i + 1 < len(pattern):
+            i += 1
+            regex += re.escape(pattern[i])
+        else:
+            regex += re.escape(char)
+        i += 1
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+
+    return (base, re.compile(regex), negated, directories_only)
+
+
+def is_ignored(path: str, is_dir: bool, excludes: list, ignore_rules: list) -> bool:
+    """Checks a path against the configured excludes and the .gitignore rules of its ancestors (last matching rule wins).
+    """
+
+    for _, regex, _, directories_only in excludes:
+        if (is_dir or not directories_only) and regex.fullmatch(path):
+            return True
+
+    ignored = False
+    for base, regex, negated, directories_only in ignore_rules:
+        if directories_only and not is_dir:
+            continue
+        relative = path[len(base) + 1:] if base else path
+        if regex.fullmatch(relative):
+            ignored = not negated
+    return ignored
+
+
+def relative_path(path: str) -> str:
+    """Turns a path (relative to the repository or absolute) into the corpus' key format.
+    """
+
+    load()
+    if os.path.isabs(path):
+        path = os.path.relpath(path, start=repo_path)
+    path = os.path.normpath(path)
+    return "" if path == "." else path
+
+
+def get_files() -> dict:
+    """Returns all files of the corpus, keyed by path relative to the repository root.
+    """
+
+    load()
+    return files
+
+
+def get_file(path: str):
+    """Returns the corpus entry for a path (relative to the repository or absolute), or None if it is not part of it.
+    """
+
+    path = relative_path(path)     # loads the corpus before it is looked up
+    return files.get(path)
+
+
+def get_directory(path: str):
+    """Returns the directory entry for a path (relative to the repository or absolute), or None if it doesn't exist.
+    """
+
+    path = relative_path(path)
+    return directories.get(path)
+
+
+def get_directory_files(path: str) -> list:
+    """Returns the corpus entries of the files directly inside a directory.
+    """
+
+    directory = get_directory(path)
+    if directory is None:
+        return list()
+    return [files[file_path] for file_path in directory["files"]]
+
+
+def get_subtree_files(path: str):
+    """Yields the corpus entries of all files in a directory and its subdirectories.
+    The order is the one of a stack-based scandir walk: a directory's files, then the last subdirectory first.
+    """
+
+    directory = get_directory(path)
+    if directory is None:
+        return
+    to_visit = [directory]
+    while to_visit:
+        directory = to_visit.pop()
+        for file_path in directory["files"]:
+            yield files[file_path]
+        to_visit.extend(directories[subdirectory] for subdirectory in directory["subdirectories"])
+
+
+def get_ancestor_directories(path: str):
+    """Yields the directory entries from the file's directory up to, but excluding, the repository root.
+    """
+
+    path = os.path.dirname(relative_path(path))
+    while path != "":
+        directory = directories.get(path)
+        if directory is not None:
+            yield directory
+        path = os.path.dirname(path)
+
+
+def find_files(pattern: str) -> list:
+    """Returns the corpus entries of all files whose name matches the pattern (a file name or a glob like "docker-compose*").
+    """
+
+    extractor_profile.count("finds")
+    load()
+    if pattern not in name_queries:
+        if any(char in pattern for char in "*?["):
+            matches = [path for name in names.keys() if fnmatch.fnmatchcase(name, pattern) for path in names[name]]
+            matches.sort(key=lambda path: files[path]["id"])
+        else:
+            matches = names.get(pattern, list())
+        name_queries[pattern] = matches
+    return [files[path] for path in name_queries[pattern]]
+
+
+def find_files_ignorecase(name: str) -> list:
+    """Returns the corpus entries of all files whose casefolded name equals the given (casefolded) name.
+    """
+
+    extractor_profile.count("finds")
+    load()
+    if not casefolded_names:
+        for file in files.values():
+            casefolded_names.setdefault(file["name"].casefold(), list()).append(file["path"])
+    return [files[path] for path in casefolded_names.get(name, list())]
+
+
+def get_lines(file: dict):
+    """Returns the file's lines as returned by readlines(), or False if it is not a text file.
+    The list is shared between all callers and must not be modified.
+    """
+
+    if "content" not in file:
+        raw = read_bytes(file["full_path"])
+        file["hash"] = blob_hash(raw) if raw is not None else None
+        file["content"] = split_lines(raw) if raw is not None else False
+    return file["content"]
+
+
+def get_blob_hash(file: dict):
+    """Returns the git blob hash of the file's content, or None if it can't be read.
+    """
+
+    if "hash" not in file:
+        get_lines(file)
+    return file["hash"]
+
+
+def blob_hash(raw: bytes) -> str:
+    """Hashes content the way git hashes blobs, so that identical files have the same key in every clone and commit.
+    """
+
+    return hashlib.sha1(b"blob %d\0" % len(raw) + raw).hexdigest()
+
+
+def read_bytes(full_path: str):
+    """Reads a file's raw content, or returns None if it can't be read.
+    """
+
+    try:
+        with open(full_path, "rb") as file:
+            raw = file.read()
+    except OSError:
+        return None
+    extractor_profile.count("files_read")
+    extractor_profile.count("bytes_read", len(raw))
+    return raw
+
+
+def split_lines(raw: bytes):
+    """Decodes raw content into lines. Binary and undecodable content yields False.
+    """
+
+    if b"\0" in raw:
+        return False
+    try:
+        text = raw.decode()
+    except UnicodeDecodeError:
+        return False
+    return text.replace("\r\n", "\n").replace("\r", "\n").splitlines(keepends=True)
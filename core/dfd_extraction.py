@@ -1,54 +1,73 @@
-import ast
+import copy
 from datetime import datetime
-from itertools import combinations
 import os
 
 from pydriller import Repository
 
 import output_generators.codeable_model as codeable_model
+import core.attribution as attribution
+import core.corpus as corpus
+import core.extractor_profile as extractor_profile
+import core.extractors as extractors
+import core.fact_cache as fact_cache
+import core.file_facts as file_facts
+import core.java_index as java_index
+import core.keyword_matcher as keyword_matcher
+import core.placeholders as placeholders
+import core.search_index as search_index
+import core.service_roots as service_roots
+import core.symbol_table as symbol_table
 import core.technology_switch as tech_sw
+import core.yaml_loader as yaml_loader
 import tmp.tmp as tmp
 import output_generators.json_architecture as json_architecture
 import output_generators.json_edges as json_edges
 import output_generators.traceability as traceability
 import output_generators.visualizer as visualizer
 import output_generators.plaintext as plaintext
-from technology_specific_extractors.apache_httpd.aph_entry import detect_apachehttpd_webserver
-from technology_specific_extractors.circuit_breaker.cbr_entry import detect_circuit_breakers
-from technology_specific_extractors.consul.cns_entry import detect_consul
+import technology_specific_extractors.maven.mvn_reactor as mvn_reactor
+# The entry modules register their extractors with core.extractors when imported
+import technology_specific_extractors.apache_httpd.aph_entry
+import technology_specific_extractors.circuit_breaker.cbr_entry
+import technology_specific_extractors.consul.cns_entry
 from technology_specific_extractors.database_connections.dbc_entry import clean_database_connections
-from technology_specific_extractors.databases.dbs_entry import detect_databases
-from technology_specific_extractors.elasticsearch.ela_entry import detect_elasticsearch
-from technology_specific_extractors.eureka.eur_entry import detect_eureka, detect_eureka_server_only
-from technology_specific_extractors.grafana.grf_entry import detect_grafana
-from technology_specific_extractors.http_security.hts_entry import detect_authentication_scopes
-from technology_specific_extractors.hystrix.hsx_entry import (detect_hystrix_circuit_breakers,
-                                     detect_hystrix_dashboard)
+import technology_specific_extractors.databases.dbs_entry
+import technology_specific_extractors.elasticsearch.ela_entry
+import technology_specific_extractors.eureka.eur_entry
+import technology_specific_extractors.grafana.grf_entry
+import technology_specific_extractors.http_security.hts_entry
+import technology_specific_extractors.hystrix.hsx_entry
 from technology_specific_extractors.kafka.kfk_entry import detect_kafka_server
-from technology_specific_extractors.kibana.kib_entry import detect_kibana
-from technology_specific_extractors.load_balancer.lob_entry import detect_load_balancers
-from technology_specific_extractors.local_logging.llo_entry import detect_local_logging
-from technology_specific_extractors.logstash.log_entry import detect_logstash
-from technology_specific_extractors.nginx.ngn_entry import detect_nginx
-from technology_specific_extractors.plaintext_credentials.plc_entry import set_plaintext_credentials
-from technology_specific_extractors.prometheus.prm_entry import detect_prometheus_server
+import technology_specific_extractors.kibana.kib_entry
+import technology_specific_extractors.load_balancer.lob_entry
+import technology_specific_extractors.local_logging.llo_entry
+import technology_specific_extractors.logstash.log_entry
+import technology_specific_extractors.nginx.ngn_entry
+import technology_specific_extractors.plaintext_credentials.plc_entry
+import technology_specific_extractors.prometheus.prm_entry
 from technology_specific_extractors.rabbitmq.rmq_entry import detect_rabbitmq_server
-from technology_specific_extractors.repository_rest_resource.rrr_entry import detect_endpoints
-from technology_specific_extractors.ribbon.rib_entry import detect_ribbon_load_balancers
-from technology_specific_extractors.service_functionality_classification.itf_entry import \
-    classify_internal_infrastructural
-from technology_specific_extractors.spring_admin.sad_entry import detect_spring_admin_server
-from technology_specific_extractors.spring_config.cnf_entry import detect_spring_config
-from technology_specific_extractors.spring_encryption.enc_entry import detect_spring_encryption
-from technology_specific_extractors.spring_gateway.sgt_entry import detect_spring_cloud_gateway
-from technology_specific_extractors.spring_oauth.soa_entry import detect_spring_oauth
-from technology_specific_extractors.ssl.ssl_entry import detect_ssl_services
-from technology_specific_extractors.turbine.trb_entry import detect_turbine
-from technology_specific_extractors.zipkin.zip_entry import detect_zipkin_server
-from technology_specific_extractors.zookeeper.zoo_entry import detect_zookeeper
-from technology_specific_extractors.zuul.zul_entry import detect_zuul
-
-from core.DFD import CDFD
+import technology_specific_extractors.repository_rest_resource.rrr_entry
+import technology_specific_extractors.ribbon.rib_entry
+import technology_specific_extractors.service_functionality_classification.itf_entry
+import technology_specific_extractors.spring_admin.sad_entry
+import technology_specific_extractors.spring_config.cnf_entry
+import technology_specific_extractors.spring_encryption.enc_entry
+import technology_specific_extractors.spring_gateway.sgt_entry
+import technology_specific_extractors.spring_oauth.soa_entry
+import technology_specific_extractors.ssl.ssl_entry
+import technology_specific_extractors.turbine.trb_entry
+import technology_specific_extractors.zipkin.zip_entry
+import technology_specific_extractors.zookeeper.zoo_entry
+import technology_specific_extractors.zuul.zul_entry
+
+from core.DFD import CCollection, CDFD
+
+
+# Extractors of the phases of the extraction, by registered name. Extractors that depend on each other run in this order.
+SERVICE_EXTRACTORS = ("dbs", "port", "ssl", "cnf", "eur_server", "port", "brokers", "hts")
+CLASSIFICATION_EXTRACTORS = ("eur", "zul", "sgt", "soa", "cns", "hsx_dashboard", "trb", "llo", "zip", "sad", "prm", "cbr",
+                             "lob", "rib", "hsx", "zoo", "kib", "ela", "log", "ngn", "grf", "enc", "rrr", "misc", "aph",
+                             "itf", "plc")
 
 
 def perform_analysis():
@@ -70,8 +89,25 @@ def perform_analysis():
         repo_name = git_repo.project_name
         tmp.tmp_config.set("Analysis Settings", "output_path", os.path.join(os.getcwd(), "code2DFD_output", repo_name.replace("/", "--"), commit))
         git_repo.checkout(commit)
+        corpus.reset()
+        attribution.reset()
+        extractor_profile.reset()
+        keyword_matcher.reset()
+        search_index.reset()
+        service_roots.reset()
+        yaml_loader.reset()
+        java_index.reset()
+        symbol_table.reset()
+        placeholders.reset()
+        mvn_reactor.reset()
+        file_facts.reset()
+        file_facts.load_parent(git_repo, commit)
         print(f"\nStart extraction of DFD for {repo_name} on commit {commit} at {datetime.now().strftime('%H:%M:%S')}")
         codeable_models, traceability_content = DFD_extraction()
+        file_facts.save()
+        attribution.save()
+        extractor_profile.save()
+        fact_cache.save()
         print(f"Finished: {datetime.now().strftime('%H:%M:%S')}")
 
         git_repo.checkout(head)
@@ -84,46 +120,33 @@ def DFD_extraction():
     """
     dfd = CDFD("TestDFD")
 
-    microservices, information_flows, external_components = dict(), dict(), dict()
+    microservices, information_flows, external_components = CCollection(), CCollection(), CCollection()
 
-    microservices = tech_sw.get_microservices(dfd)
-    
-    microservices = detect_databases(microservices)
-    microservices = overwrite_port(microservices)
-    microservices = detect_ssl_services(microservices)
+    # Working copy, the model keeps the services from build- and IaC-files until the classification below is done
+    microservices = copy.deepcopy(tech_sw.get_microservices(dfd))
     print("Extracted services from build- and IaC-files")
 
-    # Parse internal and external configuration files
-    microservices, information_flows, external_components = detect_spring_config(microservices, information_flows, external_components, dfd)
-    microservices = detect_eureka_server_only(microservices, dfd)
-    microservices = overwrite_port(microservices)
-
-    # Classify brokers (needed for information flows)
-    microservices = classify_brokers(microservices)
-
-    # Check authentication information of services
-    microservices = detect_authentication_scopes(microservices, dfd)
-    tmp.tmp_config.set("DFD", "microservices", str(microservices).replace("%", "%%"))
+    # Parse configuration files, classify brokers (needed for information flows), check authentication of services
+    state = {"microservices": microservices, "information_flows": information_flows, "external_components": external_components, "dfd": dfd}
+    extractors.run(SERVICE_EXTRACTORS, state, "services")
+    microservices, information_flows, external_components = state["microservices"], state["information_flows"], state["external_components"]
+    dfd.microservices = microservices
 
     # Get information flows
-    tmp.tmp_config.set("DFD", "external_components", str(external_components).replace("%", "%%"))
+    dfd.external_components = external_components
 
     new_information_flows = tech_sw.get_information_flows(dfd)
-    external_components = ast.literal_eval(tmp.tmp_config["DFD"]["external_components"])
+    external_components = dfd.external_components
 
     # Merge old and new
     for new_flow in new_information_flows.keys():
-        try:
-            id = max(information_flows.keys()) + 1
-        except:
-            id = 0
-        information_flows[id] = dict()
-        information_flows[id] = new_information_flows[new_flow]
+        information_flows.add(new_information_flows[new_flow])
     print("Extracted information flows from API-calls, message brokers, and database connections")
 
     # Detect everything else / execute all technology implementations
     print("Classifying all services")
-    microservices = tech_sw.get_microservices(dfd)
+    # Working copy, detect_microservice() keeps looking services up in the model as it is after the information flows
+    microservices = copy.deepcopy(tech_sw.get_microservices(dfd))
     microservices, information_flows, external_components = classify_microservices(microservices, information_flows, external_components, dfd)
 
     # Merging
@@ -146,9 +169,11 @@ def DFD_extraction():
     print("\nFinished extraction")
 
     # Saving
-    tmp.tmp_config.set("DFD", "microservices", str(microservices).replace("%", "%%"))
-    tmp.tmp_config.set("DFD", "information_flows", str(information_flows).replace("%", "%%"))
-    tmp.tmp_config.set("DFD", "external_components", str(external_components).replace("%", "%%"))
+    dfd.microservices = microservices
+    dfd.information_flows = information_flows
+    dfd.external_components = external_components
+    if tmp.tmp_config.getboolean("Analysis Settings", "development_mode", fallback=False):
+        dfd.write_to_config(tmp.tmp_config)
 
     plaintext.write_plaintext(microservices, information_flows, external_components)
     codeable_models, codeable_models_path = codeable_model.output_codeable_model(microservices, information_flows, external_components)
@@ -164,13 +189,15 @@ def DFD_extraction():
     return codeable_models, traceability_content
 
 
-def classify_brokers(microservices: dict) -> dict:
+@extractors.extractor("brokers", arguments=("microservices", "dfd"), returns=("microservices",), reads=("services",),
+                      writes=("annotations", "model"), files=("docker-compose*",))
+def classify_brokers(microservices: dict, dfd) -> dict:
     """Classifies kafka and rabbitmq servers, because they are needed for the information flows.
     """
 
     microservices = detect_rabbitmq_server(microservices)
     microservices = detect_kafka_server(microservices)
-    tmp.tmp_config.set("DFD", "microservices", str(microservices).replace("%", "%%"))
+    dfd.microservices = microservices
     return microservices
 
 
@@ -178,38 +205,14 @@ def classify_microservices(microservices: dict, information_flows: dict, externa
     """Tries to determine the microservice's funcitonality.
     """
 
-    microservices, information_flows = detect_eureka(microservices, information_flows, dfd)
-    microservices, information_flows, external_components = detect_zuul(microservices, information_flows, external_components, dfd)
-    microservices, information_flows, external_components = detect_spring_cloud_gateway(microservices, information_flows, external_components, dfd)
-    microservices, information_flows = detect_spring_oauth(microservices, information_flows, dfd)
-    microservices, information_flows = detect_consul(microservices, information_flows, dfd)
-    microservices, information_flows = detect_hystrix_dashboard(microservices, information_flows, dfd)
-    microservices, information_flows = detect_turbine(microservices, information_flows, dfd)
-    microservices, information_flows = detect_local_logging(microservices, information_flows, dfd)
-    microservices, information_flows = detect_zipkin_server(microservices, information_flows, dfd)
-    microservices, information_flows = detect_spring_admin_server(microservices, information_flows, dfd)
-    microservices, information_flows = detect_prometheus_server(microservices, information_flows, dfd)
-    microservices, information_flows = detect_circuit_breakers(microservices, information_flows, dfd)
-    microservices, information_flows = detect_load_balancers(microservices, information_flows, dfd)
-    microservices, information_flows = detect_ribbon_load_balancers(microservices, information_flows, dfd)
-    microservices, information_flows = detect_hystrix_circuit_breakers(microservices, information_flows, dfd)
-    microservices, information_flows = detect_zookeeper(microservices, information_flows, dfd)
-    microservices, information_flows = detect_kibana(microservices, information_flows, dfd)
-    microservices, information_flows = detect_elasticsearch(microservices, information_flows, dfd)
-    microservices, information_flows, external_components = detect_logstash(microservices, information_flows, external_components, dfd)
-    microservices, information_flows, external_components = detect_nginx(microservices, information_flows, external_components, dfd)
-    microservices, information_flows = detect_grafana(microservices, information_flows, dfd)
-    microservices, information_flows = detect_spring_encryption(microservices, information_flows, dfd)
-    microservices = detect_endpoints(microservices, dfd)
-
-    microservices, information_flows, external_components = detect_miscellaneous(microservices, information_flows, external_components)
-    microservices, information_flows, external_components = detect_apachehttpd_webserver(microservices, information_flows, external_components, dfd)
-    microservices = classify_internal_infrastructural(microservices)
-    microservices = set_plaintext_credentials(microservices)
+    state = {"microservices": microservices, "information_flows": information_flows, "external_components": external_components, "dfd": dfd}
+    extractors.run(CLASSIFICATION_EXTRACTORS, state, "classification")
 
-    return microservices, information_flows, external_components
+    return state["microservices"], state["information_flows"], state["external_components"]
 
 
+@extractors.extractor("port", arguments=("microservices",), returns=("microservices",), reads=("properties",),
+                      writes=("annotations",))
 def overwrite_port(microservices: dict) -> dict:
     """Writes port from properties to tagged vallues.
     """
@@ -243,6 +246,9 @@ def overwrite_port(microservices: dict) -> dict:
     return microservices
 
 
+@extractors.extractor("misc", arguments=("microservices", "information_flows", "external_components"),
+                      returns=("microservices", "information_flows", "external_components"),
+                      reads=("services", "properties", "annotations"), writes=("flows", "components"))
 def detect_miscellaneous(microservices: dict, information_flows: dict, external_components: dict) -> tuple[dict, dict, dict]:
     """Goes through properties extracted for each service to check for some things that don't fit anywhere else (mail servers, external websites, etc.).
     """
@@ -258,7 +264,7 @@ def detect_miscellaneous(microservices: dict, information_flows: dict, external_
                     elif prop2[0] == "mail_username":
                         mail_username = prop2[1]
                 # create external mail server
-                id_ = max(external_components.keys(), default=-1) + 1
+                id_ = external_components.next_id()
                 external_components[id_] = dict()
                 external_components[id_]["name"] = "mail-server"
                 external_components[id_]["stereotype_instances"] = ["mail_server", "entrypoint", "exitpoint"]
@@ -302,7 +308,7 @@ def detect_miscellaneous(microservices: dict, information_flows: dict, external_
                 traceability.add_trace(trace)
 
                 # create connection
-                id2 = max(information_flows.keys(), default=-1) + 1
+                id2 = information_flows.next_id()
                 information_flows[id2] = dict()
                 information_flows[id2]["sender"] = microservice["name"]
                 information_flows[id2]["receiver"] = "mail-server"
@@ -321,7 +327,7 @@ def detect_miscellaneous(microservices: dict, information_flows: dict, external_
             # external api rate website
             elif prop[0] == "rates_url":
                 # create external component
-                id_ = max(external_components.keys(), default=-1) + 1
+                id_ = external_components.next_id()
                 external_components[id_] = dict()
                 external_components[id_]["name"] = "external-website"
                 external_components[id_]["stereotype_instances"] = ["external_website", "entrypoint", "exitpoint"]
@@ -360,7 +366,7 @@ def detect_miscellaneous(microservices: dict, information_flows: dict, external_
                 traceability.add_trace(trace)
 
                 # create connection
-                id2 = max(information_flows.keys(), default=-1) + 1
+                id2 = information_flows.next_id()
                 information_flows[id2] = dict()
                 information_flows[id2]["sender"] = "external-website"
                 information_flows[id2]["receiver"] = microservice["name"]
@@ -379,7 +385,7 @@ def detect_miscellaneous(microservices: dict, information_flows: dict, external_
                 for m2 in microservices.values():
                     for stereotype in m2.get("stereotype_instances", []):
                         if stereotype == "configuration_server":
-                            id_ = max(information_flows.keys(), default=-1) + 1
+                            id_ = information_flows.next_id()
                             information_flows[id_] = dict()
                             information_flows[id_]["sender"] = m2["name"]
                             information_flows[id_]["receiver"] = microservice["name"]
@@ -396,69 +402,62 @@ def detect_miscellaneous(microservices: dict, information_flows: dict, external_
     return microservices, information_flows, external_components
 
 
-def merge_duplicate_flows(information_flows: dict):
+def merge_duplicate_flows(information_flows: CCollection):
     """Multiple flows with the same sender and receiver might occur. They are merged here.
+    Flows are grouped by casefolded sender and receiver in one pass; the first flow of each group takes over the
+    annotations of the others. Flows without sender or receiver are deleted.
     """
 
     to_delete = set()
-    for i, j in combinations(information_flows.keys(), 2):
-        flow_i = information_flows[i]
-        if flow_i["sender"] and flow_i["receiver"]:
-            flow_i["sender"] = flow_i["sender"].casefold()
-            flow_i["receiver"] = flow_i["receiver"].casefold()
-        else:
-            to_delete.add(i)
-            continue
-        if i == j:
-            continue
-        flow_j = information_flows[j]
-        if flow_j["sender"] and flow_j["receiver"]:
-            flow_j["sender"] = flow_j["sender"].casefold()
-            flow_j["receiver"] = flow_j["receiver"].casefold()
-        else:
-            to_delete.add(j)
+    first_flows = dict()    # (sender, receiver) -> id of the first flow between them
+    for id in information_flows.keys():
+        flow = information_flows[id]
+        if not (flow["sender"] and flow["receiver"]):
+            to_delete.add(id)
             continue
+        information_flows.set_flow_ends(id, flow["sender"].casefold(), flow["receiver"].casefold())
 
-        if flow_i["sender"] == flow_j["sender"] and flow_i["receiver"] == flow_j["receiver"]:
-            # merge
-            for field, j_value in flow_j.items():
-                if field not in ["sender", "receiver"]:
-                    try:
-                        flow_i[field] = flow_i.get(field, list()) + list(j_value)
-                    except:
-                        flow_i[field] = list(j_value).append(flow_i.get(field, list()))
-            to_delete.add(j)
+        ends = (flow["sender"], flow["receiver"])
+        if ends in first_flows:
+            merge_fields(information_flows[first_flows[ends]], flow, ["sender", "receiver"])
+            to_delete.add(id)
+        else:
+            first_flows[ends] = id
     for k in to_delete:
         del information_flows[k]
 
 
-def merge_duplicate_nodes(nodes: dict):
-    """Merge duplicate nodes
+def merge_duplicate_nodes(nodes: CCollection):
+    """Merge duplicate nodes, i.e. nodes with the same casefolded name, into the first one of them.
     """
 
-    # Microservices
     to_delete = set()
-    for i, j in combinations(nodes.keys(), 2):
-        node_i = nodes[i]
-        node_i["name"] = node_i["name"].casefold()
-        if i == j:
-            continue
-        node_j = nodes[j]
-        node_j["name"] = node_j["name"].casefold()
-
-        if node_i["name"] == node_j["name"]:
-            # merge
-            for field, j_value in node_j.items():
-                if field not in ["name", "type"]:
-                    try:
-                        node_i[field] = node_i.get(field, list()) + list(j_value)
-                    except:
-                        node_i[field] = list(j_value).append(node_i.get(field, list()))
-            to_delete.add(j)
+    first_nodes = dict()    # name -> id of the first node with that name
+    for id in nodes.keys():
+        nodes.rename(id, nodes[id]["name"].casefold())
+
+        name = nodes[id]["name"]
+        if name in first_nodes:
+            merge_fields(nodes[first_nodes[name]], nodes[id], ["name", "type"])
+            to_delete.add(id)
+        else:
+            first_nodes[name] = id
     for k in to_delete:
         del nodes[k]
 
 
+def merge_fields(item: dict, duplicate: dict, identifying_fields: list):
+    """Appends the annotations of a duplicate to the item's.
+    """
+
+    for field, duplicate_value in duplicate.items():
+        if field not in identifying_fields:
+            try:
+                item[field] = item.get(field, list()) + list(duplicate_value)
+            except:
+                item[field] = list(duplicate_value).append(item.get(field, list()))
+
+
 def merge_duplicate_annotations(collection: dict):
     """Merge annotations of all items
     """
@@ -5,10 +5,7 @@ def add_user(external_components: dict) -> dict:
     """Adds an user to the external components.
     """
 
-    try:
-        id = max(external_components.keys()) + 1
-    except:
-        id = 0
+    id = external_components.next_id()
     external_components[id] = dict()
     external_components[id]["name"] = "user"
     external_components[id]["type"] = "external_component"
@@ -51,10 +48,7 @@ def add_user(external_components: dict) -> dict:
 
 def add_user_connections(information_flows: dict, microservice: str) -> dict:
 
-    try:
-        id = max(information_flows.keys()) + 1
-    except:
-        id = 0
+    id = information_flows.next_id()
     information_flows[id] = dict()
     information_flows[id]["sender"] = "user"
     information_flows[id]["receiver"] = microservice
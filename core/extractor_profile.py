@@ -0,0 +1,128 @@
+"""Timing and I/O accounting of the extractors.
+Every extractor call (see core.extractors.call()) is recorded with the phase of the extraction it ran in:
+    wall_time, cpu_time     seconds spent in the extractor (CPU time of the process running it)
+    searches                calls of file_interaction.search_keywords()
+    finds                   look-ups of files by name in the corpus
+    files_read, bytes_read  files read from disk for the first time (the corpus keeps their content afterwards)
+    traces                  calls of traceability.add_trace()
+    model_before, model_after   number of services, information flows, and external components
+Counters are incremented wherever the work happens, e.g. in the corpus, and attributed to the extractor running at the
+time. Per phase, the wall and CPU time of the whole phase and the skipped extractors are recorded as well.
+The profile is written to PROJECT_extractor_profile.json in the output directory.
+"""
+
+import json
+import os
+from pathlib import Path
+import time
+
+from output_generators.logger import logger
+import tmp.tmp as tmp
+
+
+COUNTERS = ["searches", "finds", "files_read", "bytes_read", "traces"]
+MODEL = {"services": "microservices", "flows": "information_flows", "components": "external_components"}
+
+counters = dict.fromkeys(COUNTERS, 0)
+records = list()    # one per extractor call, in the order the calls were made (or merged from worker processes)
+phases = list()     # {"phase", "wall_time", "cpu_time", "extractors", "skipped"} per run of a sequence of extractors
+phase = None        # phase running at the moment
+
+
+def reset():
+    """Drops the profile. Has to be called together with corpus.reset().
+    """
+
+    global counters, records, phases, phase
+
+    counters = dict.fromkeys(COUNTERS, 0)
+    records = list()
+    phases = list()
+    phase = None
+
+
+def count(counter: str, amount: int = 1):
+    """Increments one of the counters.
+    """
+
+    counters[counter] += amount
+
+
+def get_model_size(state: dict) -> dict:
+    """Returns the number of services, information flows, and external components in the state of an extraction, or,
+    for extractors only working on the DFD, in the DFD.
+    """
+
+    size = dict()
+    for item, entry in MODEL.items():
+        collection = state[entry] if entry in state else getattr(state.get("dfd"), entry, None)
+        size[item] = len(collection) if collection is not None else 0
+    return size
+
+
+def start(state: dict) -> dict:
+    """Takes the measurements before an extractor runs.
+    """
+
+    return {"wall_time": time.perf_counter(), "cpu_time": time.process_time(), "counters": dict(counters),
+            "model": get_model_size(state)}
+
+
+def stop(name: str, before: dict, state: dict):
+    """Records an extractor call from the measurements before and after it.
+    """
+
+    record = {
+        "phase": phase,
+        "extractor": name,
+        "wall_time": round(time.perf_counter() - before["wall_time"], 6),
+        "cpu_time": round(time.process_time() - before["cpu_time"], 6),
+    }
+    for counter in COUNTERS:
+        record[counter] = counters[counter] - before["counters"][counter]
+    record["model_before"] = before["model"]
+    record["model_after"] = get_model_size(state)
+    records.append(record)
+
+
+def start_phase(name: str) -> dict:
+    """Starts a phase, i.e. the run of a sequence of extractors.
+    """
+
+    global phase
+
+    phase = name
+    return {"wall_time": time.perf_counter(), "cpu_time": time.process_time()}
+
+
+def stop_phase(before: dict, extractors: list, skipped: list):
+    """Records a phase from the measurements before and after it.
+    """
+
+    global phase
+
+    phases.append({
+        "phase": phase,
+        "wall_time": round(time.perf_counter() - before["wall_time"], 6),
+        "cpu_time": round(time.process_time() - before["cpu_time"], 6),
+        "extractors": extractors,
+        "skipped": skipped,
+    })
+    phase = None
+
+
+def save():
+    """Writes the profile to the output directory.
+    """
+
+    if not records and not phases or not tmp.tmp_config.has_option("Analysis Settings", "output_path"):
+        return
+    output_path = tmp.tmp_config["Analysis Settings"]["output_path"]
+    parts = Path(output_path).parts
+    profile_path = os.path.join(output_path, f"{parts[-2]}--{parts[-1]}_extractor_profile.json")
+    try:
+        os.makedirs(output_path, exist_ok=True)
+        with open(profile_path, "w") as file:
+            json.dump({"phases": phases, "extractors": records}, file, indent=4)
+    except OSError as e:
+        logger.info(f"Could not write extractor profile {profile_path}: {e}")
@@ -0,0 +1,350 @@
+"""Registry of the technology-specific extractors and scheduler running them.
+Every extractor declares, with the decorator below, what it is called with and returns (state entries: microservices,
+information_flows, external_components, dfd) and what it reads and writes of the model:
+    services        the services themselves, e.g. services added by an extractor
+    properties      the services' properties
+    annotations     the services' type, stereotype instances, and tagged values
+    flows           the information flows and their annotations
+    components      the external components
+    model           the services held by the DFD, in which detect_microservice() looks up the service of a file
+    placeholders    the scopes of core.placeholders, which resolving a service's placeholders fills in
+besides the keywords (registered with the keyword matcher) and file globs of the repository it reads, and its triggers:
+keywords of which at least one has to occur in the repository for the extractor to find anything. Before a sequence
+is run, the presence of all triggers is determined in one scan of the corpus, and extractors none of whose triggers
+occur are skipped. Extractors without triggers (e.g. those classifying services by their image) always run.
+A sequence of extractors (a phase of the extraction) is run in its order. Its dependency DAG, in which an extractor
+depends on the earlier ones of the sequence that write what it reads, groups it into levels: extractors of the same
+level are independent of each other as long as each sees the state as it was before the level and their writes, which
+append to the model, are applied in the order of the sequence. An extractor that writes what an earlier one of the
+sequence reads or writes is never put into a level before that one's, so it can't change what the earlier one sees or
+append before it.
+With [Analysis Settings] extractor_workers > 1, this is done: consecutive extractors of a level that return everything
+they write, i.e. that write neither the model nor the placeholder scopes, are run concurrently in forked worker
+processes, each on the state as it was before them. A worker returns the changes of its extractor to the collections of
+the state (new items, appended list entries, gained and lost set elements, changed fields), its traces, and its
+attributions, which are applied in the order of the sequence, so the result equals a sequential run. Memoised parses
+(core.yaml_loader, core.java_index, core.fact_cache) made in a worker are not kept; they are made again when needed.
+Every call of an extractor is timed and its I/O counted, see core.extractor_profile.
+"""
+
+import copy
+import multiprocessing
+import os
+
+import core.attribution as attribution
+import core.extractor_profile as extractor_profile
+import core.keyword_matcher as keyword_matcher
+from output_generators.logger import logger
+import output_generators.traceability as traceability
+import tmp.tmp as tmp
+
+
+FIELDS = {"services", "properties", "annotations", "flows", "components", "model", "placeholders"}
+COLLECTIONS = ["microservices", "information_flows", "external_components"]
+PROCESS_FIELDS = {"model", "placeholders"}     # held by modules, not the state: writes to them in a worker would be lost
+MISSING = object()
+
+registered = dict()     # name -> {"name", "function", "arguments", "returns", "reads", "writes", "keywords", "files",
+                        #         "triggers"}
+worker_state = None     # state the forked workers run their extractors on
+
+
+def extractor(name: str, arguments: tuple, returns: tuple = (), reads: tuple = (), writes: tuple = (),
+              keywords: tuple = (), files: tuple = (), triggers: tuple = ()):
+    """Decorator registering an extractor under a name.
+    """
+
+    unknown = (set(reads) | set(writes)) - FIELDS
+    if unknown:
+        raise ValueError(f"Extractor {name} declares unknown model fields {sorted(unknown)}")
+
+    def decorator(function):
+        registered[name] = {
+            "name": name,
+            "function": function,
+            "arguments": tuple(arguments),
+            "returns": tuple(returns),
+            "reads": frozenset(reads),
+            "writes": frozenset(writes),
+            "keywords": tuple(keywords),
+            "files": tuple(files),
+            "triggers": tuple(triggers),
+        }
+        keyword_matcher.register(*keywords, *triggers)
+        return function
+    return decorator
+
+
+def get_extractors(names) -> list:
+    """Returns the registered extractors of a sequence of names. Unknown names are skipped.
+    """
+
+    extractors = list()
+    for name in names:
+        if name in registered:
+            extractors.append(registered[name])
+        else:
+            logger.warning(f"No extractor registered as {name}, skipped")
+    return extractors
+
+
+def filter_triggered(extractors: list) -> tuple[list, list]:
+    """Splits a sequence of extractors into those that have no triggers or of whose triggers at least one occurs, and
+    the skipped ones.
+    """
+
+    presence = keyword_matcher.get_presence([trigger for extractor in extractors for trigger in extractor["triggers"]])
+    triggered, skipped = list(), list()
+    for extractor in extractors:
+        if not extractor["triggers"] or any(presence[trigger] for trigger in extractor["triggers"]):
+            triggered.append(extractor)
+        else:
+            logger.debug(f"Skipping extractor {extractor['name']}, none of its triggers occurs")
+            skipped.append(extractor)
+    return triggered, skipped
+
+
+def depends_on(later: dict, earlier: dict) -> bool:
+    """Checks if an extractor has to run after an earlier one of its sequence.
+    """
+
+    return bool(earlier["writes"] & later["reads"])
+
+
+def conflicts_with(later: dict, earlier: dict) -> bool:
+    """Checks if an extractor must not run before an earlier one of its sequence: it writes what the earlier one reads
+    or writes as well.
+    """
+
+    return bool(later["writes"] & (earlier["reads"] | earlier["writes"]))
+
+
+def create_graph(extractors: list) -> dict:
+    """Returns the dependency DAG of a sequence of extractors as predecessors per position in the sequence.
+    """
+
+    return {j: {i for i in range(j) if depends_on(extractors[j], extractors[i])} for j in range(len(extractors))}
+
+
+def get_levels(extractors: list) -> list:
+    """Returns the positions of a sequence of extractors grouped into levels of its DAG. The extractors of a level only
+    depend on those of earlier levels, i.e. they are independent of each other, and none is in an earlier level than an
+    extractor before it in the sequence that it conflicts with, so that levels keep the order of the sequence where it
+    matters.
+    """
+
+    predecessors = create_graph(extractors)
+    levels = list()
+    level_of = dict()
+    for j in range(len(extractors)):
+        level = max([level_of[i] + 1 for i in predecessors[j]]
+                    + [level_of[i] for i in range(j) if conflicts_with(extractors[j], extractors[i])], default=0)
+        level_of[j] = level
+        if level == len(levels):
+            levels.append(list())
+        levels[level].append(j)
+    return levels
+
+
+def run(names, state: dict, phase: str) -> dict:
+    """Runs the extractors of a sequence of names, as a phase of the extraction, on the state and returns it, updated
+    with their results.
+    """
+
+    measurements = extractor_profile.start_phase(phase)
+    extractors, skipped = filter_triggered(get_extractors(names))
+    workers = get_workers()
+    if workers > 1:
+        for level in get_levels(extractors):
+            run_level([extractors[i] for i in level], state, workers)
+    else:
+        for extractor in extractors:
+            call(extractor, state)
+    extractor_profile.stop_phase(measurements, [extractor["name"] for extractor in extractors],
+                                 [extractor["name"] for extractor in skipped])
+    return state
+
+
+def get_workers() -> int:
+    """Returns the configured number of worker processes (0 for one per CPU), or 1 if extractors can't run in workers.
+    """
+
+    workers = tmp.tmp_config.getint("Analysis Settings", "extractor_workers", fallback=1)
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        logger.info("Extractors can't run in forked workers on this platform, running them sequentially")
+        return 1
+    if workers > 1 and attribution.get_mode() == "interactive":
+        return 1        # questions on the terminal can't be asked from several processes
+    return workers
+
+
+def can_run_in_worker(extractor: dict) -> bool:
+    """Checks if all that an extractor writes reaches the state through its results.
+    """
+
+    return not extractor["writes"] & PROCESS_FIELDS and all(entry in COLLECTIONS for entry in extractor["returns"]) \
+        and (bool(extractor["returns"]) or not extractor["writes"])
+
+
+def run_level(extractors: list, state: dict, workers: int):
+    """Runs the extractors of a level of the DAG, consecutive ones that can run in workers concurrently.
+    """
+
+    batch = list()
+    for extractor in extractors + [None]:
+        if extractor is not None and can_run_in_worker(extractor):
+            batch.append(extractor)
+            continue
+        if len(batch) > 1:
+            run_batch(batch, state, workers)
+        elif batch:
+            call(batch[0], state)
+        batch = list()
+        if extractor is not None:
+            call(extractor, state)
+
+
+def run_batch(extractors: list, state: dict, workers: int):
+    """Runs extractors concurrently in forked worker processes and applies their changes in order.
+    """
+
+    global worker_state
+
+    for extractor in extractors:        # scans the corpus for all registered keywords here, not in every worker
+        for keyword in extractor["keywords"]:
+            keyword_matcher.search(keyword)
+
+    logger.debug(f"Running extractors {[extractor['name'] for extractor in extractors]} in worker processes")
+    worker_state = state
+    pool = multiprocessing.get_context("fork").Pool(min(workers, len(extractors)))
+    try:
+        results = pool.map(run_in_worker, [extractor["name"] for extractor in extractors])
+    finally:
+        pool.close()
+        pool.join()
+        worker_state = None
+
+    for result in results:
+        apply_result(result, state)
+
+
+def run_in_worker(name: str) -> dict:
+    """Runs an extractor on the state inherited from the parent process and returns what it changed.
+    """
+
+    state = worker_state
+    before = {entry: copy.deepcopy(state[entry]) for entry in COLLECTIONS if entry in state}
+    traceability.recorded = list()
+    attributions = len(attribution.report)
+    records = len(extractor_profile.records)
+
+    call(registered[name], state)
+
+    return {
+        "changes": {entry: get_changes(before[entry], state[entry]) for entry in before},
+        "traces": traceability.recorded,
+        "attributions": attribution.report[attributions:],
+        "profile": extractor_profile.records[records:],
+    }
+
+
+def get_changes(before: dict, after: dict) -> dict:
+    """Returns the changes between two states of a collection: items added (in order), removed, and changed.
+    """
+
+    changes = {"added": list(), "removed": [id for id in before if id not in after], "changed": dict()}
+    for id, item in after.items():
+        if id not in before:
+            changes["added"].append(item)
+        elif item != before[id] or type(item) is not type(before[id]):
+            changes["changed"][id] = get_item_changes(before[id], item)
+    return changes
+
+
+def get_item_changes(before: dict, after: dict) -> list:
+    """Returns the changes of an item's fields as (field, "extend" / "union" / "difference" / "set" / "delete", value).
+    Lists that were only appended to are extended; of sets, the elements gained are united and the ones lost removed,
+    also if the set was replaced, so that the changes of other extractors to the same set are kept.
+    """
+
+    changes = list()
+    for field, value in after.items():
+        old = before.get(field, MISSING)
+        if type(old) is type(value) and old == value:
+            continue
+        if isinstance(value, list) and (old is MISSING or isinstance(old, list) and value[:len(old)] == old):
+            changes.append((field, "extend", value[0 if old is MISSING else len(old):]))
+        elif isinstance(value, set) and (old is MISSING or isinstance(old, set)):
+            gained, lost = (value, set()) if old is MISSING else (value - old, old - value)
+            if gained or old is MISSING:
+                changes.append((field, "union", gained))
+            if lost:
+                changes.append((field, "difference", lost))
+        else:
+            changes.append((field, "set", value))
+    for field in before:
+        if field not in after:
+            changes.append((field, "delete", None))
+    return changes
+
+
+def apply_result(result: dict, state: dict):
+    """Applies the changes, traces, attributions, and profile of an extractor run in a worker.
+    """
+
+    for entry, changes in result["changes"].items():
+        collection = state[entry]
+        for id in changes["removed"]:
+            if id in collection:
+                del collection[id]
+        for id, item_changes in changes["changed"].items():
+            if id in collection:
+                apply_item_changes(collection[id], item_changes)
+        for item in changes["added"]:
+            collection[collection.next_id()] = item
+        if changes["changed"]:
+            collection.reindex()
+    for function, arguments in result["traces"]:
+        getattr(traceability, function)(*arguments)
+    attribution.report += result["attributions"]
+    extractor_profile.records += result["profile"]
+
+
+def apply_item_changes(item: dict, changes: list):
+    """Applies changes of an item's fields made in a worker to the item.
+    """
+
+    for field, change, value in changes:
+        if change == "extend":
+            if isinstance(item.get(field), list):
+                item[field] += value
+            else:
+                item[field] = list(value)
+        elif change == "union":
+            if isinstance(item.get(field), set):
+                item[field] |= value
+            else:
+                item[field] = set(value)
+        elif change == "difference":
+            if isinstance(item.get(field), set):
+                item[field] -= value
+        elif change == "set":
+            item[field] = value
+        else:
+            item.pop(field, None)
+
+
+def call(extractor: dict, state: dict):
+    """Calls an extractor with its arguments from the state and enters its results into the state.
+    """
+
+    logger.debug(f"Running extractor {extractor['name']}")
+    measurements = extractor_profile.start(state)
+    results = extractor["function"](*[state[argument] for argument in extractor["arguments"]])
+    if len(extractor["returns"]) == 1:
+        results = (results,)
+    for entry, result in zip(extractor["returns"], results or ()):
+        state[entry] = result
+    extractor_profile.stop(extractor["name"], measurements, state)
@@ -0,0 +1,173 @@
+"""Content-addressed cache of per-file extraction facts.
+Results of parsing a file (YAML and .properties configurations, pom.xml files, keyword hits) only depend on the file's
+content, so they are kept under the file's git blob hash. Identical files, e.g. the same application.yml in many
+services or the same file in another commit, branch, or fork, are parsed only once.
+The cache is a size-bounded LRU ([Analysis Settings] fact_cache_size entries) that is stored in
+code2DFD_output/fact_cache.pickle between runs.
+"""
+
+from collections import OrderedDict
+import functools
+import os
+import pickle
+
+import core.corpus as corpus
+from output_generators.logger import logger
+import tmp.tmp as tmp
+
+
+FORMAT = 6
+DEFAULT_SIZE = 50000
+PATH = "\0path"                 # placeholders for the parsed file's path in cached results
+FULL_PATH = "\0full_path"
+
+entries = None      # (kind, blob hash) -> facts, least recently used first; None until loaded
+modified = False
+
+
+def load():
+    """Reads the stored cache on first use.
+    """
+
+    global entries
+
+    if entries is not None:
+        return
+    entries = OrderedDict()
+    cache_path = get_cache_path()
+    if not os.path.isfile(cache_path):
+        return
+    try:
+        with open(cache_path, "rb") as file:
+            stored = pickle.load(file)
+        if stored.get("format") == FORMAT:
+            entries = stored["entries"]
+            logger.info(f"Loaded {len(entries)} cached file facts from {cache_path}")
+    except Exception as e:
+        logger.info(f"Could not read fact cache {cache_path}: {e}")
+
+
+def save():
+    """Writes the cache, if anything was added to it, and evicts least recently used entries beyond the size limit.
+    """
+
+    global modified
+
+    if entries is None or not modified:
+        return
+    evict()
+    cache_path = get_cache_path()
+    temporary_path = cache_path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temporary_path, "wb") as file:
+            pickle.dump({"format": FORMAT, "entries": entries}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, cache_path)
+        modified = False
+    except Exception as e:
+        logger.info(f"Could not write fact cache {cache_path}: {e}")
+
+
+def get_cache_path() -> str:
+    """Returns the location of the stored cache.
+    """
+
+    return os.path.join(os.getcwd(), "code2DFD_output", "fact_cache.pickle")
+
+
+def get_size() -> int:
+    """Returns the maximum number of entries from the config, or the default.
+    """
+
+    if tmp.tmp_config.has_option("Analysis Settings", "fact_cache_size"):
+        return int(tmp.tmp_config["Analysis Settings"]["fact_cache_size"])
+    return DEFAULT_SIZE
+
+
+def evict():
+    """Drops least recently used entries until the cache fits its size limit.
+    """
+
+    size = max(get_size(), 0)
+    while len(entries) > size:
+        entries.popitem(last=False)
+
+
+def get(kind: str, key):
+    """Returns the cached facts of the given kind for a blob hash, or None.
+    """
+
+    if key is None or get_size() <= 0:
+        return None
+    load()
+    facts = entries.get((kind, key))
+    if facts is not None:
+        entries.move_to_end((kind, key))
+    return facts
+
+
+def put(kind: str, key, facts):
+    """Stores facts of the given kind for a blob hash.
+    """
+
+    global modified
+
+    if key is None or get_size() <= 0:
+        return
+    load()
+    entries[(kind, key)] = facts
+    entries.move_to_end((kind, key))
+    modified = True
+    if len(entries) > 2 * get_size():       # evict in batches, not on every insertion
+        evict()
+
+
+def get_file_hash(path: str):
+    """Returns the blob hash of a file given by path (relative to the repository or absolute), or None if it can't be read.
+    """
+
+    file = corpus.get_file(path)
+    if file is not None:
+        return corpus.get_blob_hash(file)
+    raw = corpus.read_bytes(get_full_path(path))
+    return corpus.blob_hash(raw) if raw is not None else None
+
+
+def get_full_path(path: str) -> str:
+    """Joins a path relative to the repository with the repository's location, like the parsers do.
+    """
+
+    return os.path.join(tmp.tmp_config.get("Repository", "local_path"), path)
+
+
+def cached(kind: str):
+    """Decorator for parse functions that take a file path as first argument and whose result only depends on the file's content.
+    Occurrences of the path in the result (e.g. in traces) are stored as placeholders and filled in with the current path.
+    """
+
+    def decorator(parse):
+        @functools.wraps(parse)
+        def wrapper(path: str):
+            key = get_file_hash(path)
+            facts = get(kind, key)
+            if facts is None:
+                facts = parse(path)
+                put(kind, key, relocate(facts, {path: PATH, get_full_path(path): FULL_PATH}))
+                return facts
+            return relocate(facts, {PATH: path, FULL_PATH: get_full_path(path)})
+        return wrapper
+    return decorator
+
+
+def relocate(facts, paths: dict):
+    """Returns a copy of the facts in which strings equal to one of the given paths are replaced.
+    Containers are copied, so callers can't modify cached facts.
+    """
+
+    if type(facts) is str:
+        return paths.get(facts, facts)
+    if isinstance(facts, (list, tuple, set, frozenset)):
+        return type(facts)(relocate(item, paths) for item in facts)
+    if isinstance(facts, dict):
+        return {relocate(key, paths): relocate(value, paths) for key, value in facts.items()}
+    return facts
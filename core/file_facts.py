@@ -0,0 +1,142 @@
+"""Per-file extraction facts of analysed commits, used for incremental re-analysis.
+For every searched keyword, the first matching line of each file is recorded and stored next to the other outputs in
+code2DFD_output/<repo>/<commit>. When a commit is analysed whose parent has already been analysed, the facts of all
+files that git diff reports as unchanged are taken over from the parent and only the changed files are scanned again.
+The DFD itself is always recomputed from the facts.
+
+File layout (JSON):
+    {"format": int, "commit": full hash, "files": {path: size}, "keywords": {keyword: {path: [line_nr, span]}}}
+"""
+
+import json
+import os
+from pathlib import Path
+
+import core.corpus as corpus
+from output_generators.logger import logger
+import tmp.tmp as tmp
+
+
+FORMAT = 1
+
+parent = None       # facts of the analysed parent commit, in the file layout above
+changed = set()     # paths that differ between the parent commit and the analysed one
+current = dict()    # keyword -> {path: [line_nr, span]} found in this analysis
+commit_hash = None
+
+
+def reset():
+    """Drops all facts. Has to be called together with corpus.reset().
+    """
+
+    global parent, changed, current, commit_hash
+
+    parent = None
+    changed = set()
+    current = dict()
+    commit_hash = None
+
+
+def load_parent(git_repo, commit: str):
+    """Looks for stored facts of the commit's parents (or of the commit itself, for repeated runs) and the paths changed since.
+    """
+
+    global parent, changed, commit_hash
+
+    try:
+        git_commit = git_repo.get_commit(commit)
+    except Exception as e:
+        logger.info(f"Could not resolve commit {commit}: {e}")
+        return
+    commit_hash = git_commit.hash
+
+    for candidate in [commit_hash] + list(git_commit.parents):
+        facts = read_facts(candidate)
+        if facts is None:
+            continue
+        try:
+            diff = git_repo.repo.git.diff("--name-only", "--no-renames", "-z", candidate, commit_hash)
+        except Exception as e:
+            logger.info(f"Could not diff {candidate[:7]} and {commit_hash[:7]}: {e}")
+            continue
+        parent = facts
+        changed = {os.path.normpath(path) for path in diff.split("\0") if path}
+        logger.info(f"Reusing facts of analysed commit {candidate[:7]}, {len(changed)} paths changed")
+        return
+
+
+def read_facts(commit: str):
+    """Reads the stored facts of a commit, or None if it hasn't been analysed.
+    """
+
+    output_path = tmp.tmp_config["Analysis Settings"]["output_path"]
+    for directory in [commit[:7], commit]:
+        facts_path = get_facts_path(os.path.join(os.path.dirname(output_path), directory))
+        if not os.path.isfile(facts_path):
+            continue
+        try:
+            with open(facts_path, "r") as file:
+                facts = json.load(file)
+        except (OSError, ValueError) as e:
+            logger.info(f"Could not read facts {facts_path}: {e}")
+            continue
+        if facts.get("format") == FORMAT and facts.get("commit") == commit:
+            return facts
+    return None
+
+
+def get_facts_path(output_path: str) -> str:
+    """Returns the path of the facts file in an output directory.
+    """
+
+    parts = Path(output_path).parts
+    return os.path.join(output_path, f"{parts[-2]}--{parts[-1]}_file_facts.json")
+
+
+def reusable_matches(keyword: str):
+    """Returns the parent's matches of the keyword as {path: [line_nr, span]}, or None if the parent never searched it.
+    """
+
+    if parent is None:
+        return None
+    return parent["keywords"].get(keyword)
+
+
+def is_unchanged(file: dict) -> bool:
+    """Checks whether the parent's facts for the file are still valid.
+    """
+
+    return parent is not None and file["path"] not in changed and parent["files"].get(file["path"]) == file["size"]
+
+
+def record(keyword: str, path: str, line_nr: str, span: str):
+    """Records the first match of a keyword in a file.
+    """
+
+    current.setdefault(keyword, dict())[path] = [line_nr, span]
+
+
+def record_keyword(keyword: str):
+    """Records that a keyword has been searched, so that files without a match are known to have none.
+    """
+
+    current.setdefault(keyword, dict())
+
+
+def save():
+    """Writes the facts of the analysed commit to its output directory.
+    """
+
+    if commit_hash is None or not tmp.tmp_config.has_option("Analysis Settings", "output_path"):
+        return
+    facts_path = get_facts_path(tmp.tmp_config["Analysis Settings"]["output_path"])
+    facts = {"format": FORMAT,
+             "commit": commit_hash,
+             "files": {file["path"]: file["size"] for file in corpus.get_files().values() if file["searchable"]},
+             "keywords": current}
+    try:
+        os.makedirs(os.path.dirname(facts_path), exist_ok=True)
+        with open(facts_path, "w") as file:
+            json.dump(facts, file)
+    except OSError as e:
+        logger.info(f"Could not write facts {facts_path}: {e}")
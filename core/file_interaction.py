@@ -1,8 +1,13 @@
 import os
-import re
-import subprocess
 from pathlib import Path, PurePosixPath
 
+import core.attribution as attribution
+import core.corpus as corpus
+import core.extractor_profile as extractor_profile
+import core.java_index as java_index
+import core.keyword_matcher as keyword_matcher
+import core.placeholders as placeholders
+import core.symbol_table as symbol_table
 from output_generators.logger import logger
 import core.technology_switch as tech_sw
 import tmp.tmp as tmp
@@ -58,58 +63,19 @@ def extract_variable(line, submodule):
 
 
 def search_keywords(keywords: str):
-    """Searches keywords locally using grep.
+    """Searches keywords (regular expressions) in the repository's corpus.
+    Returns the first matching line per file, excluding tests and markdown files.
     """
 
-    repo_folder = tmp.tmp_config["Repository"]["local_path"]
-
+    extractor_profile.count("searches")
     results = dict()
 
     if isinstance(keywords, str):
         keywords = [keywords]
 
     for keyword in keywords:
-        if keyword[-1] == "(":
-            keyword = "\"" + keyword + "\""
-        out = subprocess.Popen(['grep', '-rn', keyword, repo_folder], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-        stdout, stderr = out.communicate()
-        seen = set()
-        for line in stdout.decode().splitlines():
-            if line.startswith("Binary file"):
-                continue
-            line_parts = line.split(":")
-            if len(line_parts) < 3:
-                continue
-            full_path = line_parts[0]
-            if full_path not in seen:
-                seen.add(full_path)
-                if not "test" in full_path and len(full_path) >= 3 and not os.path.splitext(full_path)[1] == ".md":
-                    path = os.path.relpath(full_path, start=repo_folder)
-                    name = os.path.basename(path)
-                    line_nr = line_parts[1]
-                    code_line = ":".join(line_parts[2:])
-                    try:
-                        match = re.search(keyword, code_line)
-                    except Exception as e:
-                        logger.info(f"Error in regex matching for regex keyword {keyword}: {e}")
-                        match = None
-                    if match is None:
-                        continue
-                    span = match.span()
-                    try:
-                        with open(full_path) as file:
-                            content = file.readlines()
-                    except:
-                        content = False
-
-                    if content:
-                        id_ = max(results.keys(), default=-1) + 1
-                        results[id_] = dict()
-                        results[id_]["content"] = content
-                        results[id_]["name"] = name
-                        results[id_]["path"] = path
-                        results[id_]["line_nr"] = line_nr
-                        results[id_]["span"] = str(span)
+        for result in keyword_matcher.search(keyword).values():
+            results[len(results)] = result
     return results
 
 
@@ -122,10 +88,7 @@ def pagList2lines(pagList) -> dict:
         containing_files_URLs = extract_downloadURL(p)
         for file in containing_files_URLs.keys():
             f = containing_files_URLs[file]
-            try:
-                id_ = max(results.keys()) + 1
-            except:
-                id_ = 0
+            id_ = len(results)
             results[id_] = dict()
 
             results[id_]["content"] = file_as_lines(f["path"])
@@ -141,10 +104,7 @@ def extract_downloadURL(files) -> dict:
 
     containing_files_URLs = dict()
     for f in files:
-        try:
-            id_ = max(containing_files_URLs.keys()) + 1
-        except:
-            id_ = 0
+        id_ = len(containing_files_URLs)
         containing_files_URLs[id_] = dict()
 
         containing_files_URLs[id_]["path"] = f.path
@@ -168,9 +128,15 @@ def get_struct(repo):
 
 
 def file_as_lines(path):
-    """Downloads and splits raw file into lines.
+    """Returns a file of the repository split into lines.
     """
 
+    file = corpus.get_file(path)
+    if file:
+        content = corpus.get_lines(file)
+        if content is not False:
+            return content
+
     local_path = tmp.tmp_config.get("Repository", "local_path")
     local_path = os.path.join(local_path, path)
 
@@ -180,35 +146,23 @@ def file_as_lines(path):
 
 
 def detect_microservice(file_path, dfd):
-    """Finds microservice that a file belongs to.
+    """Finds microservice that a file belongs to, based on the first part of its path that names services.
+    Ambiguous cases (no or several matching services) are resolved as configured, see core/attribution.py.
     """
 
     microservices_set = tech_sw.get_microservices(dfd)
     microservices = [microservices_set[x]["name"] for x in microservices_set.keys()]
 
     file_path_parts = Path(file_path).parts
-    count = 0
+    matches = list()
     part = 0
-    found = False
-
-    while part < len(file_path_parts) and not found:
-        for m in microservices:
-            if m == file_path_parts[part]:
-                microservice = m
-                count += 1
-        if count > 0:
-            found = True
+
+    while part < len(file_path_parts) and not matches:
+        matches = [m for m in microservices if m == file_path_parts[part]]
         part += 1
-    if count == 1:
-        return microservice
-    else:
-        print("\tFound " + str(count) + " microservices for file " + str(file_path) +". \
-        \n\tPlease choose microservice that the file belongs to: ")
-        i = 1
-        for m in microservices:
-            print("\t[" + str(i) + "] " + str(m))
-            i += 1
-        return microservices[int(input("\n\t > ")) - 1]
+    if len(matches) == 1:
+        return matches[0]
+    return attribution.resolve(file_path, matches or microservices, microservices_set)
 
 
 def find_variable(parameter: str, file) -> str:
@@ -220,40 +174,30 @@ def find_variable(parameter: str, file) -> str:
     if parameter[0] == "\"" and parameter[-1] == "\"":      # already string as needed, return this
         return parameter.strip("\"")
 
-    elif "." in parameter:               # means that it refers to some other file -> look for that file, then go through lines
+    elif "." in parameter:               # means that it refers to some other file -> look it up in the project's fields
         try:
             parameter_variable = parameter.split(".")[-1]
             parameter_class = parameter.split(".")[-2]
-            files_containing_class = search_keywords("class " + str(parameter_class))
-            correct_file = None
-            variable = None
-            for filec in files_containing_class.keys():
-                fc = files_containing_class[filec]
-                for linec in range(len(fc["content"])):
-                    if "class" in fc["content"][linec] and parameter_class in fc["content"][linec]:
-                        correct_file = fc["name"]
-                        inside_class_definition = True
-                        lines_class = len(fc["content"]) - linec
-                        i = 0
-                        while inside_class_definition and i < lines_class:
-                            if "}" in fc["content"][i]:
-                                inside_class_definition = False
-                            i += 1
-                            if parameter_variable in fc["content"][linec + i] and "=" in fc["content"][linec + i]:
-                                variable = fc["content"][linec + i].split("=")[1].strip().strip(";").strip().strip("\"")
-            logger.info(f"Found {variable} in file {correct_file}")
+            variable = symbol_table.evaluate(parameter)
+            if variable is None:        # not a constant expression, take it as written
+                declarations = symbol_table.lookup(parameter_class, parameter_variable)
+                variable = declarations[0]["initialiser"].strip("\"") if declarations else None
+            logger.info(f"Found {variable} for {parameter}")
         except:
             logger.info(f"Could not find a definition for {parameter}")
             return None
-    else:           # means that it's a variable in this file -> go through lines to find it
+    else:           # means that it's a variable in this file -> look it up in the file's fields
         if parameter[-2:-1] == "()":
             return parameter
         else:
             try:
-                parameter_variable = parameter
-                for line in range(len(file["content"])):
-                    if parameter_variable in file["content"][line] and "=" in file["content"][line] and ("private" in file["content"][line] or "public" in file["content"][line] or "protected" in file["content"][line]):
-                        variable = file["content"][line].split("=")[1].strip().strip(";").strip().strip("\"")
+                variable = None
+                for field in java_index.get_index(file["path"])["fields"]:
+                    if field["name"] == parameter and field["initialiser"] is not None \
+                            and set(field["modifiers"]) & {"private", "protected", "public"}:
+                        variable = symbol_table.resolve(field["class"], field["name"])
+                        if variable is None:
+                            variable = field["initialiser"].strip("\"")
                 name = file["name"]
                 logger.info(f"Found {variable} in this file ({name})")
             except:
@@ -263,22 +207,18 @@ def find_variable(parameter: str, file) -> str:
 
 
 def find_instances(class_of_interest: str) -> set:
-    """For the input class name, finds instantiations of it and returns set of names of these objects.
-    Uses regular expression for it. In case of wrong findings, the regex needs to be adjusted.
+    """For the input class name, finds fields of that class and returns set of names of these objects.
+    Uses the Java index for it, so that declarations in comments are ignored.
     """
 
     instances = set()
     files = search_keywords(class_of_interest)
 
-    regex = re.compile("^ *\t*(private|protected|public) (final )?" + class_of_interest + "(<.*>)? \w+ *;")        # last part means: 0 or 1 <> with something in it, then whitespace, then any legal variable character as often as wanted, then whitespace if wanted, then semicolon
-    re.ASCII
     for file in files.keys():
         f = files[file]
-        for line in range(len(f["content"])):
-            match = re.search(regex, f["content"][line])
-            if match:
-                obj = f["content"][line].split(class_of_interest)[1].split(">")[-1].strip().strip(";").strip()
-                instances.add(obj)
+        for field in java_index.find_fields(f["path"], class_of_interest):
+            if set(field["modifiers"]) & {"private", "protected", "public"}:
+                instances.add(field["name"])
 
     return instances
 
@@ -290,6 +230,10 @@ def resolve_url(url: str, microservice: str, dfd) -> str:
     microservices = tech_sw.get_microservices(dfd)
     target_service = False
 
+    if "${" in url:     # resolved in the scope of the service it is used in
+        service = next((microservices[m] for m in microservices.keys() if microservices[m]["name"] == microservice), None)
+        url = placeholders.resolve(url, service)
+
     if "http" in url:
         if "localhost" in url:
             url_parts = url.split("/")
@@ -311,17 +255,6 @@ def resolve_url(url: str, microservice: str, dfd) -> str:
                 for url_part in url_parts:
                     if microservices[m]["name"] in url_part.split(":")[0]:
                         target_service = microservices[m]["name"]
-    elif url[0] == "$":  # is environment variable
-        if microservice:
-            for m in microservices.keys():
-                if microservices[m]["name"] == microservice:
-                    try:
-                        if "Spring Config" in microservices[m]["properties"]:
-                            for mi in microservices.keys():
-                                if ("Configuration Server", "Spring Cloud Config") in microservices[mi]["tagged_values"]:
-                                    pass
-                    except Exception as e:
-                        pass
 
     return target_service
 
@@ -329,7 +262,6 @@ def resolve_url(url: str, microservice: str, dfd) -> str:
 def check_dockerfile(build_path: str):
     """Checks if under the service's build-path there is a dockerfile. If yes, returns it.
     """
-    local_repo_path = tmp.tmp_config["Repository"]["local_path"]
 
     # find docker-compose path, since build-path is relative to that
     raw_files = get_file_as_lines("docker-compose.yml")
@@ -343,23 +275,13 @@ def check_dockerfile(build_path: str):
     build_path = PurePosixPath(build_path.strip("-'"))  # Build path is always posix, so resolve it accordingly
     build_path = os.path.normpath(build_path)
 
-    docker_path = os.path.join(local_repo_path, os.path.join(docker_compose_dir, build_path))
+    docker_path = os.path.join(docker_compose_dir, build_path)
 
     lines = list()
 
-    dirs = list()
-
-    if os.path.exists(docker_path):
-        dirs.append(os.scandir(docker_path))
-        while dirs:
-            d = dirs.pop()
-            for entry in d:
-                if entry.is_file():
-                    if entry.name.casefold() == "dockerfile":
-                        with open(entry.path, "r") as file:
-                            lines = file.readlines()
-                elif entry.is_dir():
-                    dirs.append(os.scandir(entry.path))
+    for file in corpus.get_subtree_files(docker_path):
+        if file["name"].casefold() == "dockerfile":
+            lines = corpus.get_lines(file) or list()
 
     return lines
 
@@ -368,21 +290,7 @@ def file_exists(file_name: str) -> bool:
     """Checks if a file exists in the repository.
     """
 
-    local_repo_path = tmp.tmp_config["Repository"]["local_path"]
-
-    dirs = list()
-    dirs.append(os.scandir(local_repo_path))
-
-    while dirs:
-        d = dirs.pop()
-        for entry in d:
-            if entry.is_file():
-                if entry.name.casefold() == file_name:
-                    return True
-            elif entry.is_dir():
-                dirs.append(os.scandir(entry.path))
-
-    return False
+    return len(corpus.find_files_ignorecase(file_name)) > 0
 
 
 def get_repo_contents_local(path: str) -> set:
@@ -409,51 +317,37 @@ def get_repo_contents_local(path: str) -> set:
 
 
 def get_file_as_yaml(filename: str) -> dict:
-    """Looks for a file in the repository and downloads it if existing.
+    """Looks for a file in the repository and returns its content if existing.
     """
 
     files = dict()
 
-    local_path = tmp.tmp_config["Repository"]["local_path"]
-    out = subprocess.Popen(['find', local_path, '-name', filename], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-    stdout, stderr = out.communicate()
-
-    if stdout:
-        for line in stdout.decode().splitlines():
-            if os.path.isfile(line):
-                id_ = max(files.keys(), default=-1) + 1
-                files[id_] = dict()
-                with open(line, 'r') as file:
-                    files[id_]["content"] = file.read()
-
-                files[id_]["path"] = os.path.relpath(line, start=local_path)
+    for file in corpus.find_files(filename):
+        content = corpus.get_lines(file)
+        if content is False:
+            continue
+        id_ = len(files)
+        files[id_] = dict()
+        files[id_]["content"] = "".join(content)
+        files[id_]["path"] = file["path"]
 
     return files
 
 
 def get_file_as_lines(filename: str) -> dict:
-    """Looks for a file in the repository and downloads it if existing.
+    """Looks for a file in the repository and returns it as lines if existing.
     """
 
     files = dict()
 
-    local_path = tmp.tmp_config["Repository"]["local_path"]
-    out = subprocess.Popen(['find', local_path, '-name', filename], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-    stdout, stderr = out.communicate()
-
-    if stdout:
-        for line in stdout.decode().splitlines():
-            try:
-                id_ = max(files.keys()) + 1
-            except:
-                id_ = 0
-            files[id_] = dict()
-
-            with open(line, 'r') as file:
-                files[id_]["content"] = file.readlines()
-
-            files[id_]["name"] = os.path.basename(line)
-
-            files[id_]["path"] = os.path.relpath(line, start=local_path)
+    for file in corpus.find_files(filename):
+        content = corpus.get_lines(file)
+        if content is False:
+            continue
+        id_ = len(files)
+        files[id_] = dict()
+        files[id_]["content"] = content
+        files[id_]["name"] = file["name"]
+        files[id_]["path"] = file["path"]
 
     return files
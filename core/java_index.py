@@ -0,0 +1,336 @@
+"""Index of the structure of Java source files.
+Every file is tokenised once per content (the index is kept in the fact cache by blob hash) with a lightweight lexer
+that skips comments and string literals, and the index records what the extractors look for:
+    annotations     {"name", "arguments": text between the parentheses or None, "line", "column", "depth"}
+    classes         {"kind": class, interface, enum, record, or @interface, "name", "first_line", "last_line"}
+    fields          {"class": name of the enclosing class, "type", "name", "modifiers", "initialiser": expression or None,
+                     "line", "column"}
+    methods         {"name", "parameters": text between the parentheses, "line", "column"} (declarations)
+    calls           {"qualifier": dotted names before the method or None, "method", "arguments", "line", "column"}
+Lines are 0-based indices into the file's lines, depth is the number of curly brackets open at the annotation.
+Kotlin and Groovy files share Java's lexical syntax and are indexed alike. Indexes are shared between all callers and
+must not be modified.
+"""
+
+from bisect import bisect_right
+import re
+
+import core.corpus as corpus
+import core.fact_cache as fact_cache
+
+
+TOKEN = re.compile(r"""
+    (?P<comment>/\*.*?(?:\*/|\Z)|//[^\n]*)
+    |(?P<text_block>\"\"\"(?:.|\n)*?(?:\"\"\"|\Z))
+    |(?P<string>"(?:[^"\\\n]|\\.)*"?|'(?:[^'\\\n]|\\.)*'?)
+    |(?P<name>[A-Za-z_$][\w$]*)
+    |(?P<number>\d[\w.]*)
+    |(?P<space>\s+)
+    |(?P<symbol>.)
+    """, re.X | re.S)
+
+CLASS_KEYWORDS = {"class", "interface", "enum", "record"}
+MODIFIERS = {"public", "protected", "private", "static", "final", "transient", "volatile", "abstract", "native",
+             "synchronized", "default", "strictfp"}
+NOT_CALLED = {"if", "for", "while", "switch", "catch", "synchronized", "return", "throw", "new", "super", "this",
+              "assert", "try"}
+EXPRESSION_KEYWORDS = {"return", "throw", "else", "case", "yield", "assert", "await"}    # may precede a call
+
+indexes = dict()    # blob hash of the content -> index
+
+
+def reset():
+    """Drops all indexes. Has to be called together with corpus.reset().
+    """
+
+    global indexes
+
+    indexes = dict()
+
+
+def get_index(path: str) -> dict:
+    """Returns the index of a file of the corpus (path relative to the repository or absolute). Files that can't be
+    read have an empty index.
+    """
+
+    file = corpus.get_file(path)
+    lines = corpus.get_lines(file) if file is not None else False
+    if not lines:
+        return create_index([])
+    key = corpus.get_blob_hash(file)
+    if key not in indexes:
+        index = fact_cache.get("java", key)
+        if index is None:
+            index = create_index(lines)
+            fact_cache.put("java", key, index)
+        indexes[key] = index
+    return indexes[key]
+
+
+def find_annotations(path: str, names) -> list:
+    """Returns the file's annotations with one of the given (simple) names, in the order of the file.
+    """
+
+    if isinstance(names, str):
+        names = [names]
+    return [annotation for annotation in get_index(path)["annotations"] if annotation["name"] in names]
+
+
+def find_calls(path: str, method: str, qualifier=None) -> list:
+    """Returns the file's calls of a method, in the order of the file. If a qualifier is given, only calls on it are
+    returned, e.g. qualifier "restTemplate" matches restTemplate.exchange(...) and this.restTemplate.exchange(...).
+    """
+
+    calls = list()
+    for call in get_index(path)["calls"]:
+        if call["method"] != method:
+            continue
+        if qualifier is not None and (call["qualifier"] is None or call["qualifier"].split(".")[-1] != qualifier):
+            continue
+        calls.append(call)
+    return calls
+
+
+def find_methods(path: str, name: str) -> list:
+    """Returns the file's declarations of methods with the given name.
+    """
+
+    return [method for method in get_index(path)["methods"] if method["name"] == name]
+
+
+def find_fields(path: str, type_name: str) -> list:
+    """Returns the file's fields whose type is the given class, with or without type arguments.
+    """
+
+    return [field for field in get_index(path)["fields"] if field["type"].split("<")[0].split(".")[-1].strip() == type_name]
+
+
+def tokenise(text: str) -> list:
+    """Splits source text into (kind, text, start, end) tokens, without comments and whitespace.
+    """
+
+    tokens = list()
+    for match in TOKEN.finditer(text):
+        kind = match.lastgroup
+        if kind == "comment" or kind == "space":
+            continue
+        if kind == "text_block":
+            kind = "string"
+        tokens.append((kind, match.group(), match.start(), match.end()))
+    return tokens
+
+
+def match_brackets(tokens: list) -> dict:
+    """Returns the index of the closing parenthesis for the index of every opening one that is closed.
+    """
+
+    closing = dict()
+    open_brackets = list()
+    for i, token in enumerate(tokens):
+        if token[1] == "(":
+            open_brackets.append(i)
+        elif token[1] == ")" and open_brackets:
+            closing[open_brackets.pop()] = i
+    return closing
+
+
+def create_index(lines: list) -> dict:
+    """Tokenises a file's lines and records its annotations, classes, fields, method declarations, and calls.
+    """
+
+    index = {"annotations": list(), "classes": list(), "fields": list(), "methods": list(), "calls": list()}
+
+    text = "".join(lines)
+    line_starts = list()
+    offset = 0
+    for line in lines:
+        line_starts.append(offset)
+        offset += len(line)
+
+    def position(offset: int) -> tuple:
+        line = bisect_right(line_starts, offset) - 1
+        return line, offset - line_starts[line]
+
+    def between(open_bracket: int, close_bracket) -> str:
+        if close_bracket is None:
+            return text[tokens[open_bracket][3]:]
+        return text[tokens[open_bracket][3]:tokens[close_bracket][2]]
+
+    tokens = tokenise(text)
+    closing = match_brackets(tokens)
+
+    depth = 0
+    parentheses = 0
+    classes = list()        # (class, depth of its body) of the enclosing classes
+    pending_class = None    # declared class whose body hasn't been opened yet
+    statement = list()      # tokens of the current member declaration
+    in_method = False       # the current member declaration is a method's
+
+    i = 0
+    while i < len(tokens):
+        kind, value, start, end = tokens[i]
+        member_level = bool(classes) and depth == classes[-1][1] and parentheses == 0
+
+        if value == "@" and i + 1 < len(tokens) and tokens[i + 1][0] == "name":
+            if tokens[i + 1][1] == "interface":
+                if i + 2 < len(tokens) and tokens[i + 2][0] == "name":
+                    pending_class = {"kind": "@interface", "name": tokens[i + 2][1], "first_line": position(start)[0],
+                                     "last_line": None}
+                    statement = list()
+                i += 3
+                continue
+            j = i + 1
+            while j + 2 < len(tokens) and tokens[j + 1][1] == "." and tokens[j + 2][0] == "name":
+                j += 2
+            line, column = position(start)
+            annotation = {"name": tokens[j][1], "arguments": None, "line": line, "column": column, "depth": depth}
+            if j + 1 < len(tokens) and tokens[j + 1][1] == "(":
+                annotation["arguments"] = between(j + 1, closing.get(j + 1))
+                j = closing.get(j + 1, len(tokens))
+            index["annotations"].append(annotation)
+            i = j + 1
+            continue
+
+        if kind == "name" and value in CLASS_KEYWORDS and i + 1 < len(tokens) and tokens[i + 1][0] == "name" \
+                and (i == 0 or tokens[i - 1][1] != "."):
+            pending_class = {"kind": value, "name": tokens[i + 1][1], "first_line": position(start)[0], "last_line": None}
+            statement = list()
+            i += 2
+            continue
+
+        if value == "{":
+            if pending_class is not None:
+                index["classes"].append(pending_class)
+                classes.append((pending_class, depth + 1))
+                pending_class = None
+                statement = list()
+            elif member_level and not any(token[1] == "=" for token in statement):
+                statement = list()      # method body or initialiser block
+                in_method = False
+            depth += 1
+        elif value == "}":
+            depth -= 1
+            if classes and depth < classes[-1][1]:
+                classes.pop()[0]["last_line"] = position(start)[0]
+                statement = list()
+                in_method = False
+            elif classes and depth == classes[-1][1] and not any(token[1] == "=" for token in statement):
+                statement = list()
+                in_method = False
+        elif value == "(":
+            name = tokens[i - 1] if i > 0 else None
+            before = tokens[i - 2] if i > 1 else None
+            typed = before is not None and before[0] == "name" and before[1] not in EXPRESSION_KEYWORDS    # or new
+            declared = typed and before[1] != "new" or before is not None and before[1] in [">", "]"] \
+                or member_level and name is not None and name[1] == classes[-1][0]["name"]      # constructor
+            if member_level and pending_class is None and not in_method and name is not None and name[0] == "name" \
+                    and declared and not any(token[1] == "=" for token in statement):
+                line, column = position(name[2])
+                index["methods"].append({"name": name[1], "parameters": between(i, closing.get(i)),
+                                         "line": line, "column": column})
+                in_method = True
+                i = closing.get(i, len(tokens) - 1) + 1
+                continue
+            if name is not None and name[0] == "name" and name[1] not in NOT_CALLED and not typed:
+                qualifier = list()
+                j = i - 2
+                while j >= 1 and tokens[j][1] == "." and tokens[j - 1][0] == "name":
+                    qualifier.insert(0, tokens[j - 1][1])
+                    j -= 2
+                if j >= 0 and tokens[j][1] == ".":      # called on the result of an expression
+                    qualifier = list()
+                line, column = position(name[2])
+                index["calls"].append({"qualifier": ".".join(qualifier) if qualifier else None, "method": name[1],
+                                       "arguments": between(i, closing.get(i)), "line": line, "column": column})
+            parentheses += 1
+        elif value == ")":
+            parentheses = max(parentheses - 1, 0)
+        elif value == ";" and member_level:
+            if not in_method:
+                index["fields"] += create_fields(classes[-1][0]["name"], statement, text[:start], position)
+            statement = list()
+            in_method = False
+        elif member_level:
+            statement.append(tokens[i])
+        i += 1
+
+    for enclosing in classes:       # not closed
+        enclosing[0]["last_line"] = len(lines) - 1
+    return index
+
+
+def create_fields(class_name: str, statement: list, text: str, position) -> list:
+    """Returns the fields declared by the tokens of a member declaration, e.g. "private final List<String> a, b = ...".
+    The text ends at the declaration's semicolon.
+    """
+
+    declarators = list()        # (tokens up to the "=", initialiser or None) per declarator
+    declaration = list()
+    equals = None
+    brackets = 0
+    number = 0
+    while number < len(statement):
+        token = statement[number]
+        if token[1] == "<":
+            end = find_type_arguments_end(statement, number)
+            if end is not None:
+                if equals is None:
+                    declaration += statement[number:end + 1]
+                number = end + 1
+                continue
+        if token[1] in ("(", "[", "{"):
+            brackets += 1
+        elif token[1] in (")", "]", "}"):
+            brackets -= 1
+        elif token[1] == "," and brackets == 0:
+            declarators.append((declaration, text[equals[3]:token[2]].strip() if equals else None))
+            declaration = list()
+            equals = None
+            number += 1
+            continue
+        elif token[1] == "=" and brackets == 0 and equals is None:
+            equals = token
+            number += 1
+            continue
+        if equals is None:
+            declaration.append(token)
+        number += 1
+    declarators.append((declaration, text[equals[3]:].strip() if equals else None))
+    initialisers = [initialiser for _, initialiser in declarators]
+    declarators = [declaration for declaration, _ in declarators]
+
+    first = declarators[0]
+    modifiers = list()
+    while first and first[0][1] in MODIFIERS:
+        modifiers.append(first.pop(0)[1])
+    if len(first) < 2 or first[-1][0] != "name":
+        return list()
+    type_name = text[first[0][2]:first[-2][3]]
+
+    fields = list()
+    for declarator, initialiser in zip(declarators, initialisers):
+        if not declarator or declarator[-1][0] != "name":
+            continue
+        line, column = position(declarator[-1][2])
+        fields.append({"class": class_name, "type": type_name, "name": declarator[-1][1], "modifiers": modifiers,
+                       "initialiser": initialiser, "line": line, "column": column})
+    return fields
+
+
+def find_type_arguments_end(tokens: list, start: int):
+    """Returns the index of the ">" closing type arguments opened by the "<" at the start index, or None if the "<" is a
+    comparison, i.e. something other than names, dots, commas, wildcards, and array brackets follows before it closes.
+    """
+
+    angle_brackets = 0
+    for number in range(start, len(tokens)):
+        value = tokens[number][1]
+        if value == "<":
+            angle_brackets += 1
+        elif value == ">":
+            angle_brackets -= 1
+            if angle_brackets == 0:
+                return number
+        elif tokens[number][0] != "name" and value not in (".", ",", "?", "[", "]", "&"):
+            return None
+    return None
@@ -0,0 +1,161 @@
+"""Single-pass matching of many keywords over the repository's corpus.
+Extractors register the keywords they search for and their triggers. The first search for (or presence check of) any
+registered keyword matches all of them in one scan of the corpus: the search index narrows down the files per keyword,
+a combined pattern of all keywords rejects non-matching files and lines, and only the lines passing it are checked
+against the individual keywords.
+Files unchanged since an already analysed parent commit take their matches from its stored facts instead, and files
+whose content has been scanned before (in any run) take them from the fact cache.
+Results are kept until the corpus is reset.
+"""
+
+import re
+
+import core.corpus as corpus
+import core.fact_cache as fact_cache
+import core.file_facts as file_facts
+import core.search_index as search_index
+from output_generators.logger import logger
+
+
+registered = list()     # keywords declared by the extractors
+results_cache = dict()  # keyword -> results in the format of file_interaction.search_keywords
+keyword_sets = dict()   # shares the tuples of checked keywords between the fact cache entries of all files
+
+
+def register(*keywords: str):
+    """Registers keywords that are matched together in the next scan of the corpus.
+    """
+
+    for keyword in keywords:
+        if keyword not in registered:
+            registered.append(keyword)
+
+
+def reset():
+    """Drops all results. Has to be called together with corpus.reset().
+    """
+
+    results_cache.clear()
+
+
+def search(keyword: str) -> dict:
+    """Returns the first matching line per file for the keyword (a regular expression).
+    Tests and markdown files are excluded.
+    """
+
+    if keyword not in results_cache:
+        if keyword in registered:
+            scan([k for k in registered if k not in results_cache])
+        else:
+            scan([keyword])
+
+    return {id_: dict(result) for id_, result in results_cache[keyword].items()}
+
+
+def get_presence(keywords) -> dict:
+    """Returns for each keyword whether it occurs in the corpus (as search() would find it), scanning once for all
+    keywords that haven't been matched yet.
+    """
+
+    keywords = list(dict.fromkeys(keywords))
+    if any(keyword not in results_cache for keyword in keywords):
+        scan([k for k in registered if k not in results_cache]
+             + [k for k in keywords if k not in results_cache and k not in registered])
+    return {keyword: bool(results_cache[keyword]) for keyword in keywords}
+
+
+def scan(keywords: list):
+    """Matches all given keywords in a single pass over the corpus and stores the per-keyword results.
+    """
+
+    regexes = dict()
+    for keyword in keywords:
+        results_cache[keyword] = dict()
+        try:
+            regexes[keyword] = re.compile(keyword)
+        except Exception as e:
+            logger.info(f"Error in regex matching for regex keyword {keyword}: {e}")
+    if not regexes:
+        return
+    try:
+        combined = re.compile("|".join(f"(?:{regex.pattern})" for regex in regexes.values()), re.MULTILINE)
+    except re.error:
+        combined = re.compile("")       # keywords can't be combined (e.g. group references), so don't pre-filter
+
+    # Keywords known from the parent commit only have to be scanned in changed files, so the search index isn't needed
+    reusable = {keyword: file_facts.reusable_matches(keyword) for keyword in regexes.keys()}
+    candidates = {keyword: search_index.candidate_files(keyword) for keyword in regexes.keys() if reusable[keyword] is None}
+
+    for keyword in regexes.keys():
+        file_facts.record_keyword(keyword)
+
+    for file in corpus.get_files().values():
+        if not file["searchable"]:
+            continue
+        pending = dict()
+        unchanged = file_facts.is_unchanged(file)
+        for keyword, regex in regexes.items():
+            if reusable[keyword] is not None and unchanged:
+                if file["path"] in reusable[keyword]:
+                    add_result(keyword, file, corpus.get_lines(file), *reusable[keyword][file["path"]])
+            elif candidates.get(keyword) is None or file["path"] in candidates[keyword]:
+                pending[keyword] = regex
+        if not pending:
+            continue
+        content = corpus.get_lines(file)
+        if not content:
+            continue
+
+        # Cached hits: (keywords checked in this content before, {keyword: (line_nr, span)} of those that matched)
+        checked, hits = fact_cache.get("keywords", corpus.get_blob_hash(file)) or ((), dict())
+        for keyword in checked:
+            if keyword in pending:
+                if keyword in hits:
+                    add_result(keyword, file, content, *hits[keyword])
+                del pending[keyword]
+        if not pending:
+            continue
+
+        new_hits = match_file(content, pending, combined)
+        for keyword, hit in new_hits.items():
+            add_result(keyword, file, content, *hit)
+        checked = checked + tuple(pending.keys())
+        fact_cache.put("keywords", corpus.get_blob_hash(file), (keyword_sets.setdefault(checked, checked), {**hits, **new_hits}))
+
+
+def match_file(content: list, regexes: dict, combined) -> dict:
+    """Returns the first match of each keyword in the file's lines as {keyword: (line_nr, span)}.
+    """
+
+    hits = dict()
+    if not combined.search("".join(content)):
+        return hits
+
+    pending = dict(regexes)
+    for line_nr, line in enumerate(content, start=1):
+        line = line.rstrip("\n")
+        if not combined.search(line):
+            continue
+        for keyword, regex in list(pending.items()):
+            match = regex.search(line)
+            if match:
+                hits[keyword] = (str(line_nr), str(match.span()))
+                del pending[keyword]
+        if not pending:
+            break
+    return hits
+
+
+def add_result(keyword: str, file: dict, content: list, line_nr: str, span: str):
+    """Adds a file's first match of the keyword to the results and to the facts of the analysed commit.
+    """
+
+    results = results_cache[keyword]
+    id_ = len(results)
+    results[id_] = dict()
+    results[id_]["content"] = content
+    results[id_]["name"] = file["name"]
+    results[id_]["path"] = file["path"]
+    results[id_]["line_nr"] = line_nr
+    results[id_]["span"] = span
+    file_facts.record(keyword, file["path"], line_nr, span)
@@ -1,201 +1,160 @@
 import re
 import os
 
-import ruamel.yaml
-
+import core.fact_cache as fact_cache
 import core.file_interaction as fi
+import core.yaml_loader as yaml_loader
 import tmp.tmp as tmp
 from output_generators.logger import logger
 
 
-# The following is taken from ruamel.yaml's authro as a workaround for getting line count for str objects
-# https://stackoverflow.com/questions/45716281/parsing-yaml-get-line-numbers-even-in-ordered-maps/45717104#45717104
-class Str(ruamel.yaml.scalarstring.ScalarString):
-    __slots__ = ('lc')
-
-    style = ""
-
-    def __new__(cls, value):
-        return ruamel.yaml.scalarstring.ScalarString.__new__(cls, value)
+@fact_cache.cached("properties")
+def parse_properties_file(file_path: str) -> str:
+    """Extracts servicename from a .properties file.
+    """
 
-class MyPreservedScalarString(ruamel.yaml.scalarstring.PreservedScalarString):
-    __slots__ = ('lc')
+    properties = set()
+    microservice = [False, False]
 
-class MyDoubleQuotedScalarString(ruamel.yaml.scalarstring.DoubleQuotedScalarString):
-    __slots__ = ('lc')
+    file = fi.file_as_lines(file_path)
 
-class MySingleQuotedScalarString(ruamel.yaml.scalarstring.SingleQuotedScalarString):
-    __slots__ = ('lc')
+    for i, line in enumerate(file):
+        match = match_property(line)
+        if match is None:
+            continue
+        key, key_start, handler = match
+        handler(microservice, properties, key, key_start, get_value(line), file_path, file, i)
 
-class MyConstructor(ruamel.yaml.constructor.RoundTripConstructor):
-    def construct_scalar(self, node):
-        if not isinstance(node, ruamel.yaml.nodes.ScalarNode):
-            raise ruamel.yaml.constructor.ConstructorError(
-                None, None,
-                "expected a scalar node, but found %s" % node.id,
-                node.start_mark)
+    return microservice, properties
 
-        if node.style == '|' and isinstance(node.value, ruamel.yaml.compat.text_type):
-            ret_val = MyPreservedScalarString(node.value)
-        elif bool(self._preserve_quotes) and isinstance(node.value, ruamel.yaml.compat.text_type):
-            if node.style == "'":
-                ret_val = MySingleQuotedScalarString(node.value)
-            elif node.style == '"':
-                ret_val = MyDoubleQuotedScalarString(node.value)
-            else:
-                ret_val = Str(node.value)
-        else:
-            ret_val = Str(node.value)
-        ret_val.lc = ruamel.yaml.comments.LineCol()
-        ret_val.lc.line = node.start_mark.line
-        ret_val.lc.col = node.start_mark.column
-        return ret_val
-# end of external code
 
+def match_property(line: str):
+    """Returns the first key of PROPERTY_HANDLERS occurring anywhere in the line, with its offset and handler, or None.
+    Keys are matched as substrings in the table's order, as the extractors always did, so e.g. server.ssl.* lines
+    are handled by server.ssl.
+    """
 
+    for key, handler in PROPERTY_HANDLERS.items():
+        key_start = line.find(key)
+        if key_start != -1:
+            return key, key_start, handler
+    return None
 
 
-def parse_properties_file(file_path: str) -> str:
-    """Extracts servicename from a .properties file.
+def get_value(line: str):
+    """Returns the value of a line as the extractors expect it: the text between the first and a further "=", or None if
+    the line has no "=".
     """
 
+    return line.split("=", 2)[1] if "=" in line else None
 
-    properties = set()
-    microservice = [False, False]
 
-    file = fi.file_as_lines(file_path)
+def set_application_name(microservice: list, properties: set, key: str, key_start: int, value: str, file_path: str, lines: list, line_nr: int):
+    if not "$" in lines[line_nr] and value is not None:
+        microservice[0] = value.strip()
 
-    i = 0
-    for line in file:
-        # Servicename
-        if "spring.application.name" in line:
-            if not "$" in line:
-                microservice[0] = line.split("=")[1].strip()
-
-                # Traceability
-                microservice[1] = create_trace(microservice[0], file_path, file, i)
-
-        # Port
-        elif "server.port" in line:
-            try:
-                port = int(line.split("=")[1].strip()) if "=" in line else None
-                if port:
-                    span = re.search("server.port", line).span()
-                    trace = (file_path, i, span)
-                    properties.add(("port", port, trace))
-            except:
-                logger.debug(f"Port is not an integer in line {line}")
-
-        # Datasource
-        elif "spring.datasource.url" in line:
-            data_url = line.split("=")[1]
-            if data_url:
-                span = re.search("spring.datasource.url", line).span()
-                trace = (file_path, i, span)
-                properties.add(("datasource_url", data_url, trace))
-        elif "spring.datasource.password" in line:
-            password = line.split("=")[1]
-            if password:
-                span = re.search("spring.datasource.password", line).span()
-                trace = (file_path, i, span)
-                properties.add(("datasource_password", password, trace))
-        elif "spring.datasource.username" in line:
-            username = line.split("=")[1]
-            if username:
-                span = re.search("spring.datasource.username", line).span()
-                trace = (file_path, i, span)
-                properties.add(("datasource_username", username, trace))
-
-        # Config
-        elif "spring.cloud.config.server.git.uri" in line:
-            config_uri = line.split("=")[1]
-            if config_uri:
-                span = re.search("spring.cloud.config.server.git.uri", line).span()
-                trace = (file_path, i, span)
-                properties.add(("config_repo_uri", config_uri, trace))
-        elif "spring.cloud.config.uri" in line:
-            config_uri = line.split("=")[1]
-            if config_uri:
-                span = re.search("spring.cloud.config.uri", line).span()
-                trace = (file_path, i, span)
-                properties.add(("config_uri", config_uri, trace))
-                properties.add(("config_connected", True, trace))
-
-        # SSL
-        elif "server.ssl" in line:
-            # Default for enabled is true when ssl keyword is given
-
-            span = re.search("server.ssl", line).span()
-            trace = (file_path, i, span)
-            properties.add(("ssl_enabled", True, trace))
-            # Check if disabled
-            if "server.ssl.enabled" in line:
-                ssl_enabled = line.split("=")[1]
-                if ssl_enabled != None:
-                    span = re.search("server.ssl.enabled", line).span()
-                    trace = (file_path, i, span)
-                    properties.add(("ssl_enabled", ssl_enabled, trace))
-
-        # Eureka
-        elif "eureka.client.serviceUrl.defaultZone" in line:
-            span = re.search("eureka.client.serviceUrl.defaultZone", line).span()
-            trace = (file_path, i, span)
-            properties.add(("eureka_connected", True, trace))
-
-        # Kafka
-        elif "spring.cloud.stream.kafka.binder.brokers" in line:
-            kafka_server = line.split("=")[1].strip().strip("\"").strip()
-            span = re.search("spring.cloud.stream.kafka.binder.brokers", line).span()
-            trace = (file_path, i, span)
-            properties.add(("kafka_stream_binder", kafka_server, trace))
-        elif "spring.cloud.stream.bindings.output.destination" in line:
-            span = re.search("spring.cloud.stream.bindings.output.destination", line).span()
-            trace = (file_path, i, span)
-            properties.add(("kafka_stream_topic_out", line.split("=")[1].strip(), trace))
-        elif "spring.cloud.stream.bindings.input.destination" in line:
-            span = re.search("spring.cloud.stream.bindings.input.destination", line).span()
-            trace = (file_path, i, span)
-            properties.add(("kafka_stream_topic_in", line.split("=")[1].strip(), trace))
-
-        # Admin server
-        elif "spring.boot.admin.url" in line:
-            span = re.search("spring.boot.admin.url", line).span()
-            trace = (file_path, i, span)
-            properties.add(("admin_server_url", line.split("=")[1].split(",")[0], trace))
-
-
-        i += 1
-    return microservice, properties
+        # Traceability
+        microservice[1] = create_trace(microservice[0], file_path, lines, line_nr)
 
 
+def add_port(microservice: list, properties: set, key: str, key_start: int, value: str, file_path: str, lines: list, line_nr: int):
+    if value is None:
+        return
+    try:
+        port = int(value.strip())
+    except ValueError:
+        logger.debug(f"Port is not an integer in line {lines[line_nr]}")
+        return
+    if port:
+        trace = (file_path, line_nr, (key_start, key_start + len(key)))
+        properties.add(("port", port, trace))
+
+
+def add_ssl(microservice: list, properties: set, key: str, key_start: int, value: str, file_path: str, lines: list, line_nr: int):
+    # Default for enabled is true when ssl keyword is given
+    trace = (file_path, line_nr, (key_start, key_start + len(key)))
+    properties.add(("ssl_enabled", True, trace))
+    # Check if disabled
+    enabled_start = lines[line_nr].find("server.ssl.enabled")
+    if enabled_start != -1 and value is not None:
+        trace = (file_path, line_nr, (enabled_start, enabled_start + len("server.ssl.enabled")))
+        properties.add(("ssl_enabled", value, trace))
+
+
+def add_flag(microservice: list, properties: set, key: str, key_start: int, value: str, file_path: str, lines: list, line_nr: int):
+    trace = (file_path, line_nr, (key_start, key_start + len(key)))
+    properties.add((PROPERTY_FLAGS[key], True, trace))
+
+
+def add_properties(microservice: list, properties: set, key: str, key_start: int, value: str, file_path: str, lines: list, line_nr: int):
+    if value is None:
+        return
+    trace = (file_path, line_nr, (key_start, key_start + len(key)))
+    for name, convert in PROPERTY_KEYS[key]:
+        converted = convert(value)
+        if converted is not None:
+            properties.add((name, converted, trace))
+
+
+# Keys of .properties files -> properties they set, each with a conversion of the value (None skips the property)
+PROPERTY_KEYS = {
+    # Datasource
+    "spring.datasource.url": [("datasource_url", lambda value: value or None)],
+    "spring.datasource.password": [("datasource_password", lambda value: value or None)],
+    "spring.datasource.username": [("datasource_username", lambda value: value or None)],
+    # Config
+    "spring.cloud.config.server.git.uri": [("config_repo_uri", lambda value: value or None)],
+    "spring.cloud.config.uri": [("config_uri", lambda value: value or None), ("config_connected", lambda value: True if value else None)],
+    # Kafka
+    "spring.cloud.stream.kafka.binder.brokers": [("kafka_stream_binder", lambda value: value.strip().strip("\"").strip())],
+    "spring.cloud.stream.bindings.output.destination": [("kafka_stream_topic_out", lambda value: value.strip())],
+    "spring.cloud.stream.bindings.input.destination": [("kafka_stream_topic_in", lambda value: value.strip())],
+    # Admin server
+    "spring.boot.admin.url": [("admin_server_url", lambda value: value.split(",")[0])],
+}
+
+# Keys of .properties files -> properties that are set to True whatever the value
+PROPERTY_FLAGS = {
+    # Eureka
+    "eureka.client.serviceUrl.defaultZone": "eureka_connected",
+}
+
+# Keys in the order they are matched; of several keys in a line, the first one handles it
+PROPERTY_HANDLERS = {
+    "spring.application.name": set_application_name,
+    "server.port": add_port,
+    "spring.datasource.url": add_properties,
+    "spring.datasource.password": add_properties,
+    "spring.datasource.username": add_properties,
+    "spring.cloud.config.server.git.uri": add_properties,
+    "spring.cloud.config.uri": add_properties,
+    "server.ssl": add_ssl,      # server.ssl and server.ssl.*
+    "eureka.client.serviceUrl.defaultZone": add_flag,
+    "spring.cloud.stream.kafka.binder.brokers": add_properties,
+    "spring.cloud.stream.bindings.output.destination": add_properties,
+    "spring.cloud.stream.bindings.input.destination": add_properties,
+    "spring.boot.admin.url": add_properties,
+}
+
+
+@fact_cache.cached("yaml")
 def parse_yaml_file(file_path: str) -> str:
     """Extracts servicename from a .yml or .yaml file.
     """
 
 
+    raw_lines = fi.file_as_lines(file_path)
     local_path = tmp.tmp_config.get("Repository", "local_path")
     file_path = os.path.join(local_path, file_path)
-    yaml = ruamel.yaml.YAML()
-    yaml.Constructor = MyConstructor
 
     properties = set()
     microservice = [False, False]
-    lines = False
-    with open(file_path, "r") as file:
-        lines = list()
-        for line in file.readlines():
-            lines.append(line.strip("\n"))
-    if not lines:
-        return microservice, properties
-
-    content = False
-    with open(file_path, "r") as file:
-            content = file.read()
-    if not content:
+    if not raw_lines:
         return microservice, properties
+    lines = [line.strip("\n") for line in raw_lines]
 
     try:
-        documents = yaml.load_all(content)
+        documents = yaml_loader.load_all("".join(raw_lines), file_path)
         for document in documents:
             # Zuul routes
             if "zuul" in document and "routes" in document.get("zuul"):
@@ -0,0 +1,423 @@
+"""Resolution of property placeholders such as ${EUREKA_URI:http://localhost:8761}.
+The properties of every service are resolved once, after the services have been extracted, against the service's
+scope, which is assembled from (highest precedence first):
+    the service's environment in docker-compose files
+    ENV instructions of the service's Dockerfile
+    the service's Spring configuration (application* and bootstrap* .yml/.yaml/.properties files below its build file,
+        the active profiles' files and documents over the default ones)
+    the repository's root .env file
+Environment variables are also found by the relaxed name Spring binds them with (eureka.uri -> EUREKA_URI).
+Placeholders may be nested and have defaults after ":". Interpolation is memoised per scope; unknown placeholders
+without a default and cyclic ones are kept as written. Values in docker-compose files are interpolated against the .env
+file with compose's syntax ($name, ${name}, $$); a value whose variables can't be resolved counts as unset, so that the
+lower sources apply.
+"""
+
+import os
+import re
+
+import core.corpus as corpus
+import core.service_roots as service_roots
+import core.yaml_loader as yaml_loader
+from output_generators.logger import logger
+
+
+CONFIGURATION_FILE = re.compile(r"^(application|bootstrap)(-(?P<profile>[^.]+))?\.(yml|yaml|properties)$")
+COMPOSE_VARIABLE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+dotenv = None       # variables of the root .env file; None until read
+compose = None      # compose service name -> {"directory", "environment"}; None until read
+scopes = dict()     # service name (None for the .env file alone) -> scope
+
+
+def reset():
+    """Drops all scopes. Has to be called together with corpus.reset().
+    """
+
+    global dotenv, compose, scopes
+
+    dotenv = None
+    compose = None
+    scopes = dict()
+
+
+def resolve_properties(microservices: dict):
+    """Resolves the placeholders in the values of all services' properties, in place.
+    """
+
+    for m in microservices.keys():
+        resolve_service(microservices[m])
+
+
+def resolve_service(microservice: dict):
+    """Resolves the placeholders in the values of a service's properties, in place.
+    """
+
+    properties = microservice.get("properties")
+    if not properties or not any(has_placeholder(prop) for prop in properties):
+        return
+    scope = get_scope(microservice)
+    resolved = [(prop[0], interpolate(prop[1], scope), *prop[2:]) if has_placeholder(prop) else prop for prop in properties]
+    microservice["properties"] = type(properties)(resolved)
+
+
+def has_placeholder(prop) -> bool:
+    """Checks if a property is a (name, value, trace) tuple whose value contains a placeholder.
+    """
+
+    return type(prop) is tuple and len(prop) > 1 and isinstance(prop[1], str) and "${" in prop[1]
+
+
+def resolve(value: str, microservice=None) -> str:
+    """Resolves the placeholders in a value, in the scope of the given service or, without one, of the .env file.
+    """
+
+    if "${" not in value:
+        return value
+    scope = get_scope(microservice) if microservice is not None else get_dotenv_scope()
+    return interpolate(value, scope)
+
+
+def get_dotenv() -> dict:
+    """Returns the variables of the repository's root .env file.
+    """
+
+    global dotenv
+
+    if dotenv is None:
+        dotenv = dict()
+        file = corpus.get_file(".env")
+        for line in (corpus.get_lines(file) or list()) if file is not None else list():
+            line = line.strip()
+            if "=" in line and not line.startswith("#"):
+                name, value = line.split("=", 1)
+                dotenv[name.strip().removeprefix("export ").strip()] = value.strip().strip("\"'")
+    return dotenv
+
+
+def get_dotenv_scope() -> dict:
+    """Returns the scope of the .env file alone, in which e.g. docker-compose files are interpolated.
+    """
+
+    if None not in scopes:
+        scopes[None] = create_scope([(get_dotenv(), True)])
+    return scopes[None]
+
+
+def get_compose_services() -> dict:
+    """Returns the services of all docker-compose files, with their build directory (relative to the repository) and
+    their environment, in which compose's own placeholders are resolved against the .env file.
+    """
+
+    global compose
+
+    if compose is None:
+        compose = dict()
+        for file in corpus.find_files("docker-compose*"):
+            if not file["name"].endswith((".yml", ".yaml")) or not corpus.get_lines(file):
+                continue
+            for document in yaml_loader.load_all("".join(corpus.get_lines(file)), file["path"]):
+                services = document.get("services", document) if isinstance(document, dict) else None
+                if not isinstance(services, dict):
+                    continue
+                for name, service in services.items():
+                    if not isinstance(service, dict):
+                        continue
+                    build = service.get("build")
+                    if isinstance(build, dict):
+                        build = build.get("context")
+                    directory = os.path.normpath(os.path.join(os.path.dirname(file["path"]), str(build))) if build else None
+                    environment = dict()
+                    for name_value in to_pairs(service.get("environment")):
+                        value = interpolate_compose(name_value[1], get_dotenv_scope())
+                        if value is not None:       # unresolved variables leave the name unset, as in compose
+                            environment[name_value[0]] = value
+                    compose.setdefault(str(name), {"directory": directory, "environment": dict()})["environment"].update(environment)
+    return compose
+
+
+def to_pairs(environment) -> list:
+    """Returns the (name, value) pairs of a compose environment given as mapping or as list of NAME=value. Names
+    without a value are taken from the shell by compose and left out.
+    """
+
+    if isinstance(environment, dict):
+        return [(str(name), str(value)) for name, value in environment.items() if value is not None]
+    if isinstance(environment, list):
+        return [tuple(str(entry).split("=", 1)) for entry in environment if "=" in str(entry)]
+    return list()
+
+
+def get_service_directory(microservice: dict):
+    """Returns the directory of the service's build file, relative to the repository, or None.
+    """
+
+    for build_file in ["pom_path", "gradle_path"]:
+        if microservice.get(build_file):
+            return os.path.dirname(corpus.relative_path(str(microservice[build_file])))
+    return None
+
+
+def get_scope(microservice: dict) -> dict:
+    """Returns the scope of a service, assembling it on first use.
+    """
+
+    name = microservice.get("name")
+    if name not in scopes:
+        directory = get_service_directory(microservice)
+
+        services = [service for compose_name, service in get_compose_services().items()
+                    if compose_name == name or directory is not None and service["directory"] == directory]
+        environment = dict()
+        for service in services:
+            environment.update(service["environment"])
+        if directory is None:       # e.g. a service only defined in a docker-compose file
+            directory = next((service["directory"] for service in services if service["directory"]), None)
+
+        dockerfile = service_roots.find_build_file(os.path.join(directory, "Dockerfile"), "dockerfile") if directory else None
+        dockerfile_environment = read_dockerfile_environment(dockerfile) if dockerfile else dict()
+
+        active_profiles = environment.get("SPRING_PROFILES_ACTIVE", dockerfile_environment.get("SPRING_PROFILES_ACTIVE"))
+        spring = read_spring_configuration(directory, active_profiles) if directory else dict()
+
+        scopes[name] = create_scope([(environment, True), (dockerfile_environment, True), (spring, False), (get_dotenv(), True)])
+        logger.debug(f"Placeholder scope of {name}: {len(environment)} compose, {len(dockerfile_environment)} Dockerfile, {len(spring)} Spring entries")
+    return scopes[name]
+
+
+def create_scope(sources: list) -> dict:
+    """Returns a scope looking names up in the given (mapping, is environment) sources, in order. In environments,
+    names are also looked up by their relaxed name.
+    """
+
+    return {"sources": sources, "values": dict()}
+
+
+def lookup(name: str, scope: dict):
+    """Returns the raw value of a name in a scope, or None.
+    """
+
+    relaxed = name.replace(".", "_").replace("-", "").upper()
+    for source, is_environment in scope["sources"]:
+        if name in source:
+            return source[name]
+        if is_environment and relaxed in source:
+            return source[relaxed]
+    return None
+
+
+def interpolate(value: str, scope: dict, resolving=frozenset()) -> str:
+    """Replaces the placeholders in a value. Names that are being resolved further up are kept as written.
+    """
+
+    result = str()
+    start = 0
+    while True:
+        begin = value.find("${", start)
+        if begin == -1:
+            return result + value[start:]
+        end = find_closing_brace(value, begin + 2)
+        if end == -1:
+            return result + value[start:]
+        result += value[start:begin] + resolve_placeholder(value[begin:end + 1], scope, resolving)
+        start = end + 1
+
+
+def interpolate_compose(value: str, scope: dict):
+    """Replaces the variables in a value of a docker-compose file, which are written as ${name} (with defaults as in
+    interpolate()) or $name, with $$ as escaped $. Returns None if a variable can't be resolved.
+    """
+
+    result = str()
+    start = 0
+    while True:
+        begin = value.find("$", start)
+        if begin == -1:
+            return result + value[start:]
+        result += value[start:begin]
+        if value.startswith("$$", begin):
+            result += "$"
+            start = begin + 2
+            continue
+        if value.startswith("${", begin):
+            end = find_closing_brace(value, begin + 2)
+            if end == -1:
+                return None
+            placeholder = to_placeholder(value[begin + 2:end])
+        else:
+            match = COMPOSE_VARIABLE.match(value, begin + 1)
+            if match is None:
+                result += "$"
+                start = begin + 1
+                continue
+            end = match.end() - 1
+            placeholder = "${" + match.group() + "}"
+        resolved = resolve_placeholder(placeholder, scope, frozenset())
+        if "${" in resolved:
+            return None
+        result += resolved
+        start = end + 1
+
+
+def to_placeholder(content: str) -> str:
+    """Translates the content of a compose variable "${...}" to a placeholder: ${name-default} and ${name:-default} have
+    a default, for ${name?error} and ${name:?error} an unset variable is unresolved.
+    """
+
+    match = COMPOSE_VARIABLE.match(content)
+    if match is None:
+        return "${" + content + "}"
+    name, operator = match.group(), content[match.end():]
+    if operator.startswith(("-", ":-")):
+        return "${" + name + ":-" + operator.split("-", 1)[1] + "}"
+    if operator.startswith(("?", ":?")):
+        return "${" + name + "}"
+    return "${" + content + "}"
+
+
+def find_closing_brace(value: str, start: int) -> int:
+    """Returns the index of the brace closing a placeholder whose content starts at the given index, or -1.
+    """
+
+    depth = 1
+    i = start
+    while i < len(value):
+        if value.startswith("${", i):
+            depth += 1
+            i += 2
+            continue
+        if value[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return -1
+
+
+def resolve_placeholder(placeholder: str, scope: dict, resolving: frozenset) -> str:
+    """Returns the value of a single placeholder "${name}", "${name:default}", or "${name:-default}".
+    """
+
+    content = placeholder[2:-1]
+    name, separator, default = content.partition(":")
+    default = default.removeprefix("-")
+    name = name.strip()
+
+    if name in resolving:
+        return placeholder
+    if name not in scope["values"]:
+        raw = lookup(name, scope)
+        scope["values"][name] = None if raw is None else interpolate(raw, scope, resolving | {name})
+    value = scope["values"][name]
+    if value is not None:
+        return value
+    if separator:
+        return interpolate(default, scope, resolving)
+    return placeholder
+
+
+def read_dockerfile_environment(path: str) -> dict:
+    """Returns the variables set by ENV instructions of a Dockerfile (ENV name=value ... or ENV name value).
+    """
+
+    environment = dict()
+    file = corpus.get_file(path)
+    lines = corpus.get_lines(file) if file is not None else False
+    for line in lines or list():
+        parts = line.strip().split(None, 1)
+        if len(parts) < 2 or parts[0].upper() != "ENV":
+            continue
+        if "=" in parts[1].split()[0]:
+            for assignment in re.findall(r"(\S+?)=(\"[^\"]*\"|'[^']*'|\S*)", parts[1]):
+                environment[assignment[0]] = assignment[1].strip("\"'")
+        else:
+            name, _, value = parts[1].partition(" ")
+            environment[name] = value.strip().strip("\"'")
+    return environment
+
+
+def read_spring_configuration(directory: str, active_profiles) -> dict:
+    """Returns the flattened Spring properties of the configuration files below a service's directory. The files and
+    documents of the active profiles override the default ones.
+    """
+
+    default_files = list()
+    profile_files = list()
+    for file in corpus.get_subtree_files(directory):
+        match = CONFIGURATION_FILE.match(file["name"])
+        if match is None or "test" in file["path"].casefold():
+            continue
+        if match.group("profile") is None:
+            default_files.append(file)
+        else:
+            profile_files.append((match.group("profile"), file))
+
+    default_documents = list()
+    profile_documents = list()
+    for file in default_files:
+        for document_profiles, document in read_configuration_file(file):
+            if document_profiles is None:
+                default_documents.append(document)
+            else:
+                profile_documents.append((document_profiles, document))
+
+    configuration = dict()
+    for document in default_documents:
+        configuration.update(document)
+    if active_profiles is None:
+        active_profiles = configuration.get("spring.profiles.active")
+    active = [profile.strip() for profile in str(active_profiles).split(",")] if active_profiles else list()
+
+    for document_profiles, document in profile_documents:
+        if set(document_profiles) & set(active):
+            configuration.update(document)
+    for profile in active:
+        for file_profile, file in profile_files:
+            if file_profile == profile:
+                for _, document in read_configuration_file(file):
+                    configuration.update(document)
+    return configuration
+
+
+def read_configuration_file(file: dict) -> list:
+    """Returns the flattened documents of a .yml/.yaml or .properties file, each with the profiles it is restricted to
+    (None if it isn't).
+    """
+
+    lines = corpus.get_lines(file)
+    if not lines:
+        return list()
+    if file["name"].endswith(".properties"):
+        properties = dict()
+        for line in lines:
+            line = line.strip()
+            if not line or line[0] in "#!":
+                continue
+            separators = [i for i in (line.find("="), line.find(":")) if i != -1]
+            if separators:
+                properties[line[:min(separators)].strip()] = line[min(separators) + 1:].strip()
+        return [(None, properties)]
+
+    documents = list()
+    for document in yaml_loader.load_all("".join(lines), file["path"]):
+        if not isinstance(document, dict):
+            continue
+        flat = dict()
+        flatten(document, "", flat)
+        profiles = flat.get("spring.config.activate.on-profile", flat.get("spring.profiles"))
+        documents.append(([profile.strip() for profile in str(profiles).split(",")] if profiles is not None else None, flat))
+    return documents
+
+
+def flatten(node, prefix: str, flat: dict):
+    """Enters the scalars of a YAML node into a flat mapping with Spring's dotted names, e.g. a.b[0].c.
+    """
+
+    if isinstance(node, dict):
+        for key, value in node.items():
+            flatten(value, f"{prefix}.{key}" if prefix else str(key), flat)
+    elif isinstance(node, list):
+        for i, value in enumerate(node):
+            flatten(value, f"{prefix}[{i}]", flat)
+    elif node is not None:
+        flat[prefix] = str(node).lower() if isinstance(node, bool) else str(node)
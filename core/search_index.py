@@ -0,0 +1,278 @@
+"""Persistent trigram index of the analysed repository.
+The index maps every trigram occurring in a searchable text file of the corpus to the files containing it. It is built once per
+analysed commit, stored next to the other outputs in code2DFD_output/<repo>/<commit>, and memory-mapped on later
+runs. Keyword searches use it to narrow down the files they have to look at; matches are always verified on the
+file's lines, so the index never changes results.
+
+File layout (little endian):
+    header      MAGIC, uint32 length of the file table, uint32 number of trigrams
+    file table  JSON: {"signature": str, "paths": [relative paths]}
+    key table   per trigram, sorted: 12 bytes trigram (UTF-32-LE), uint32 offset into postings, uint32 count
+    postings    uint32 file ids
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from pathlib import Path
+import struct
+
+import git
+
+import core.corpus as corpus
+from output_generators.logger import logger
+import tmp.tmp as tmp
+
+
+MAGIC = b"C2DIDX01"
+HEADER = struct.Struct("<8sII")
+KEY = struct.Struct("<12sII")
+POSTING = struct.Struct("<I")
+METACHARACTERS = ".^$*+?{}[]|()"
+
+index = None    # {"paths": list, "keys": memoryview, "postings": memoryview, "count": int} once loaded
+unavailable = False
+
+
+def reset():
+    """Closes the index. Has to be called together with corpus.reset().
+    """
+
+    global index, unavailable
+
+    index = None
+    unavailable = False
+
+
+def candidate_files(keyword: str):
+    """Returns the set of paths that can contain a match for the keyword (a regular expression).
+    None means that the index can't narrow down the search and all files have to be checked.
+    """
+
+    trigrams = required_trigrams(keyword)
+    if not trigrams or not load():
+        return None
+
+    file_ids = None
+    for trigram in trigrams:
+        postings = lookup(trigram)
+        file_ids = postings if file_ids is None else file_ids & postings
+        if not file_ids:
+            break
+    return {index["paths"][file_id] for file_id in file_ids}
+
+
+def required_trigrams(keyword: str) -> set:
+    """Returns trigrams that every match of the keyword contains, based on the literal parts of the regular expression.
+    """
+
+    if "(?" in keyword:        # flags and lookarounds
+        return set()
+
+    runs = list()
+    current = ""
+    i = 0
+    while i < len(keyword):
+        char = keyword[i]
+        if char == "|":         # alternatives, nothing is required
+            return set()
+        if char == "\\" and i + 1 < len(keyword):
+            i += 1
+            if keyword[i].isalnum():    # character class like \d or \w
+                runs.append(current)
+                current = ""
+            else:
+                current += keyword[i]
+        elif char in "*?{":     # previous character is optional
+            runs.append(current[:-1])
+            current = ""
+            if char == "{":
+                i = keyword.find("}", i) if "}" in keyword[i:] else len(keyword)
+        elif char == "[":
+            runs.append(current)
+            current = ""
+            i = keyword.find("]", i + 2) if "]" in keyword[i + 2:] else len(keyword)
+        elif char == "(":
+            runs.append(current)
+            current = ""
+            depth = 1
+            while depth and i + 1 < len(keyword):
+                i += 1
+                if keyword[i] == "\\":
+                    i += 1
+                elif keyword[i] == "(":
+                    depth += 1
+                elif keyword[i] == ")":
+                    depth -= 1
+        elif char in METACHARACTERS:
+            runs.append(current)
+            current = ""
+        else:
+            current += char
+        i += 1
+    runs.append(current)
+
+    return {run[j:j + 3] for run in runs for j in range(len(run) - 2)}
+
+
+def load() -> bool:
+    """Memory-maps the index of the current commit, building it first if needed. Returns whether an index is available.
+    """
+
+    global index, unavailable
+
+    if index is not None:
+        return True
+    if unavailable:
+        return False
+
+    index_path = get_index_path()
+    if not index_path:
+        unavailable = True
+        return False
+
+    signature = corpus_signature()
+    try:
+        index = open_index(index_path, signature)
+    except Exception as e:
+        logger.info(f"Could not read search index {index_path}: {e}")
+    if index is None:
+        try:
+            build(index_path, signature)
+            index = open_index(index_path, signature)
+        except Exception as e:
+            logger.info(f"Could not build search index {index_path}: {e}")
+    if index is None:
+        unavailable = True
+        return False
+    return True
+
+
+def get_index_path():
+    """Returns the path of the index file for the analysed commit, or None if there is no output path.
+    """
+
+    if not tmp.tmp_config.has_option("Analysis Settings", "output_path"):
+        return None
+    output_path = tmp.tmp_config["Analysis Settings"]["output_path"]
+    parts = Path(output_path).parts
+    filename = f"{parts[-2]}--{parts[-1]}_search_index.bin"
+    return os.path.join(output_path, filename)
+
+
+def corpus_signature() -> str:
+    """Hash over the paths and git blob hashes of the searchable files. An index built for different files or for
+    different content of the same files, e.g. after an edit in the working tree, is not used.
+    The blob hashes are taken from git's index, so only modified and untracked files have to be read.
+    """
+
+    files = corpus.get_files()
+    blob_hashes = git_blob_hashes()
+    signature = hashlib.sha1()
+    for file in files.values():
+        if file["searchable"]:
+            blob_hash = blob_hashes.get(file["path"]) or corpus.get_blob_hash(file)
+            signature.update(f"{file['path']}\0{blob_hash}\n".encode())
+    return signature.hexdigest()
+
+
+def git_blob_hashes() -> dict:
+    """Returns the blob hashes of the files in git's index whose working tree copy is unmodified, keyed by path relative
+    to the repository. Empty if the repository can't be queried with git.
+    """
+
+    try:
+        repo = git.Git(corpus.repo_path)
+        staged = repo.ls_files("-s", "-z")
+        modified = repo.ls_files("-m", "-o", "--exclude-standard", "-z")
+    except Exception as e:
+        logger.info(f"Could not list the blobs of {corpus.repo_path}: {e}")
+        return dict()
+
+    blob_hashes = dict()
+    for entry in staged.split("\0"):
+        if entry:
+            info, path = entry.split("\t", 1)      # <mode> <blob hash> <stage>\t<path>
+            blob_hashes[os.path.normpath(path)] = info.split()[1]
+    for path in modified.split("\0"):
+        blob_hashes.pop(os.path.normpath(path), None)
+    return blob_hashes
+
+
+def open_index(index_path: str, signature: str):
+    """Memory-maps an existing index file. Returns None if there is none or if it belongs to a different corpus.
+    """
+
+    if not os.path.isfile(index_path):
+        return None
+    with open(index_path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, table_length, count = HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        return None
+    table = json.loads(mapped[HEADER.size:HEADER.size + table_length])
+    if table["signature"] != signature:
+        logger.info(f"Search index {index_path} is outdated")
+        return None
+
+    keys_start = HEADER.size + table_length
+    postings_start = keys_start + count * KEY.size
+    view = memoryview(mapped)
+    logger.info(f"Loaded search index {index_path}")
+    return {"paths": table["paths"], "count": count, "keys": view[keys_start:postings_start], "postings": view[postings_start:]}
+
+
+def lookup(trigram: str) -> set:
+    """Binary search of a trigram in the key table. Returns the ids of the files containing it.
+    """
+
+    key = trigram.encode("utf-32-le", "surrogatepass")
+    low, high = 0, index["count"]
+    while low < high:
+        middle = (low + high) // 2
+        middle_key, offset, count = KEY.unpack_from(index["keys"], middle * KEY.size)
+        if middle_key < key:
+            low = middle + 1
+        elif middle_key > key:
+            high = middle
+        else:
+            return set(struct.unpack_from(f"<{count}I", index["postings"], offset * POSTING.size))
+    return set()
+
+
+def build(index_path: str, signature: str):
+    """Reads all searchable text files of the corpus and writes their trigrams to the index file.
+    """
+
+    logger.info(f"Building search index {index_path}")
+
+    paths = list()
+    trigram_files = dict()
+    for file in corpus.get_files().values():
+        if not file["searchable"]:
+            continue
+        content = corpus.get_lines(file)
+        if not content:
+            continue
+        file_id = len(paths)
+        paths.append(file["path"])
+        text = "".join(content)
+        for trigram in {text[i:i + 3] for i in range(len(text) - 2)}:
+            trigram_files.setdefault(trigram, list()).append(file_id)
+
+    table = json.dumps({"signature": signature, "paths": paths}).encode()
+    keys = sorted((trigram.encode("utf-32-le", "surrogatepass"), file_ids) for trigram, file_ids in trigram_files.items())
+
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    temporary_path = index_path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(table), len(keys)))
+        file.write(table)
+        offset = 0
+        for key, file_ids in keys:
+            file.write(KEY.pack(key, offset, len(file_ids)))
+            offset += len(file_ids)
+        for key, file_ids in keys:
+            file.write(struct.pack(f"<{len(file_ids)}I", *file_ids))
+    os.replace(temporary_path, index_path)
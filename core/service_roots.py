@@ -0,0 +1,63 @@
+"""Service root directories of the analysed repository, used to attribute files to services.
+Every directory below the repository root that contains a build file (pom.xml, build.gradle, Dockerfile) is entered
+into a trie of path components. The build file a file belongs to is the one in its deepest ancestor directory that
+has one, found with a single walk down the trie. Results are memoised per path until the corpus is reset.
+"""
+
+import os
+
+import core.corpus as corpus
+
+
+BUILD_FILES = ["pom.xml", "build.gradle", "dockerfile"]     # casefolded names
+
+trie = None             # {"children": {directory name: node}, "build_files": {casefolded name: path}}; None until built
+build_file_paths = dict()   # (casefolded build file name, path) -> path of the nearest build file, or None
+
+
+def reset():
+    """Drops the trie and all memoised results. Has to be called together with corpus.reset().
+    """
+
+    global trie, build_file_paths
+
+    trie = None
+    build_file_paths = dict()
+
+
+def build():
+    """Enters the directories of all build files of the corpus into the trie.
+    """
+
+    global trie
+
+    trie = {"children": dict(), "build_files": dict()}
+    for file in corpus.get_files().values():
+        name = file["name"].casefold()
+        directory = os.path.dirname(file["path"])
+        if name not in BUILD_FILES or directory == "":    # the repository root is never a service root
+            continue
+        node = trie
+        for part in directory.split(os.sep):
+            node = node["children"].setdefault(part, {"children": dict(), "build_files": dict()})
+        node["build_files"][name] = file["path"]     # the last one in walk order, if the name differs only in case
+
+
+def find_build_file(path: str, build_file: str):
+    """Returns the path of the build file (casefolded name, e.g. "pom.xml") in the file's deepest ancestor directory
+    that contains one, excluding the repository root, or None.
+    """
+
+    key = (build_file, path)
+    if key not in build_file_paths:
+        if trie is None:
+            build()
+        found = None
+        node = trie
+        for part in os.path.dirname(corpus.relative_path(path)).split(os.sep):
+            node = node["children"].get(part)
+            if node is None:
+                break
+            found = node["build_files"].get(build_file, found)
+        build_file_paths[key] = found
+    return build_file_paths[key]
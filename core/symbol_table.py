@@ -0,0 +1,116 @@
+"""Project-wide table of the initialised fields of Java sources, e.g. URL constants.
+All fields with an initialiser are entered by class and field name when the table is first used (from the Java index,
+so each file is only tokenised once). Their values are evaluated on demand and memoised until the corpus is reset.
+String and number literals, references to other fields (Class.FIELD, or FIELD within the same class), and
+concatenations of them with "+" are evaluated; other expressions, e.g. method calls, and cyclic references have no value.
+"""
+
+import core.corpus as corpus
+import core.java_index as java_index
+
+
+symbols = None      # (class name, field name) -> declarations {"initialiser", "path", "line", "column"} in walk order;
+                    # None until built
+values = dict()     # (class name, field name) -> evaluated value, or None if it has none
+
+
+def reset():
+    """Drops the table and all values. Has to be called together with corpus.reset().
+    """
+
+    global symbols, values
+
+    symbols = None
+    values = dict()
+
+
+def build():
+    """Enters the initialised fields of all Java files of the corpus.
+    """
+
+    global symbols
+
+    symbols = dict()
+    for file in corpus.get_files().values():
+        if not file["name"].endswith(".java"):
+            continue
+        for field in java_index.get_index(file["path"])["fields"]:
+            if field["initialiser"] is not None:
+                symbols.setdefault((field["class"], field["name"]), list()).append(
+                    {"initialiser": field["initialiser"], "path": file["path"], "line": field["line"],
+                     "column": field["column"]})
+
+
+def lookup(class_name: str, field_name: str) -> list:
+    """Returns the declarations of a field in the project, with their initialiser and the file and (0-based) line and
+    column of the field's name.
+    """
+
+    if symbols is None:
+        build()
+    return symbols.get((class_name, field_name), list())
+
+
+def resolve(class_name: str, field_name: str):
+    """Returns the value of a field as string, or None if it can't be evaluated.
+    Of several declarations (classes of the same name), the first one with a value is taken.
+    """
+
+    key = (class_name, field_name)
+    if key not in values:
+        values[key] = None      # references back to the field while it is evaluated have no value
+        for declaration in lookup(class_name, field_name):
+            value = evaluate(declaration["initialiser"], class_name)
+            if value is not None:
+                values[key] = value
+                break
+    return values[key]
+
+
+def evaluate(expression: str, class_name=None):
+    """Returns the value of an expression as string, or None if it can't be evaluated. Unqualified names refer to fields
+    of the given class.
+    """
+
+    value = str()
+    for operand in split_operands(java_index.tokenise(expression)):
+        if operand is None:
+            return None
+        part = evaluate_operand(operand, class_name)
+        if part is None:
+            return None
+        value += part
+    return value
+
+
+def split_operands(tokens: list) -> list:
+    """Splits the tokens of an expression at "+". An empty operand is None.
+    """
+
+    operands = [list()]
+    for token in tokens:
+        if token[1] == "+":
+            operands.append(list())
+        else:
+            operands[-1].append(token)
+    return [operand if operand else None for operand in operands]
+
+
+def evaluate_operand(operand: list, class_name):
+    """Returns the value of a literal or a (qualified) field reference, or None.
+    """
+
+    if len(operand) == 1 and operand[0][0] == "string":
+        literal = operand[0][1]
+        quotes = 3 if literal.startswith("\"\"\"") else 1
+        return literal[quotes:-quotes].replace("\\\"", "\"").replace("\\\\", "\\")
+    if len(operand) == 1 and operand[0][0] == "number":
+        return operand[0][1]
+
+    if len(operand) % 2 == 0 or any(token[0] != "name" for token in operand[0::2]) \
+            or any(token[1] != "." for token in operand[1::2]):
+        return None
+    names = [token[1] for token in operand[0::2]]
+    if len(names) == 1:
+        return resolve(class_name, names[0]) if class_name is not None else None
+    return resolve(names[-2], names[-1])
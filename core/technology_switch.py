@@ -1,5 +1,7 @@
 import ast
 
+import core.extractors as extractors
+import core.placeholders as placeholders
 from output_generators.logger import logger
 import technology_specific_extractors.database_connections.dbc_entry as dbc
 import technology_specific_extractors.docker_compose.dcm_entry as dcm
@@ -16,34 +18,34 @@ import tmp.tmp as tmp
 
 def get_microservices(dfd) -> dict:
     """Calls get_microservices from correct container technology or returns existing list.
+    The returned dict is the model's, changes to it are visible to all extractors.
     """
 
-    if tmp.tmp_config.has_option("DFD", "microservices"):
-        return ast.literal_eval(tmp.tmp_config["DFD"]["microservices"])
+    if dfd.microservices is not None:
+        return dfd.microservices
     else:
         logger.info("Microservices not set yet, start extraction")
 
         mvn.set_microservices(dfd)
         grd.set_microservices(dfd)
         dcm.set_microservices(dfd)
-        if tmp.tmp_config.has_option("DFD", "microservices"):
-            return ast.literal_eval(tmp.tmp_config["DFD"]["microservices"])
+        if dfd.microservices is not None:
+            placeholders.resolve_properties(dfd.microservices)
+        return dfd.microservices
 
 
 def get_information_flows(dfd) -> dict:
-    """Calls get_information_flows from correct communication technology.
+    """Runs the extractors of the communication technologies configured in communication_techs_list, by registered name.
     """
 
-    if tmp.tmp_config.has_option("DFD", "information_flows"):
-        return ast.literal_eval(tmp.tmp_config["DFD"]["information_flows"])
+    if dfd.information_flows is not None:
+        return dfd.information_flows
     else:
         logger.info("Information flows not set yet, start extraction")
         communication_techs_list = ast.literal_eval(tmp.tmp_config["Technology Profiles"]["communication_techs_list"])
-        for com_tech in communication_techs_list:
-            eval(com_tech[1]).set_information_flows(dfd)
+        extractors.run([com_tech[1] for com_tech in communication_techs_list], {"dfd": dfd}, "information_flows")
 
-        if tmp.tmp_config.has_option("DFD", "information_flows"):
-            return ast.literal_eval(tmp.tmp_config["DFD"]["information_flows"])
+        return dfd.information_flows
 
 
 def detect_microservice(file_path: str, dfd) -> str:
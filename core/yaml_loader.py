@@ -0,0 +1,211 @@
+"""Shared loading of YAML files.
+Parsed documents are kept by the content's blob hash until the corpus is reset, so that all extractors reading the
+same file (e.g. the docker-compose file), and files with identical content, share one parse. Documents are loaded
+with libyaml, if available, and the YAML 1.2 core schema like ruamel's round-trip loader used before, but only the
+start marks needed for traceability are kept: every string, mapping, and sequence carries the 0-based line and
+column of its node as .lc.line and .lc.col. Documents are shared between all callers and must not be modified.
+"""
+
+import re
+
+import yaml
+
+import core.corpus as corpus
+from output_generators.logger import logger
+
+
+class CLineCol:
+    """Start mark of a node.
+    """
+
+    __slots__ = ("line", "col")
+
+    def __init__(self, mark):
+        self.line = mark.line
+        self.col = mark.column
+
+
+class CStr(str):
+    __slots__ = ("lc",)
+
+
+class CMap(dict):
+    __slots__ = ("lc",)
+
+
+class CSeq(list):
+    __slots__ = ("lc",)
+
+
+class CResolver(yaml.resolver.BaseResolver):
+    """Resolves plain scalars by the YAML 1.2 core schema, e.g. "yes" and "8080:80" stay strings.
+    """
+
+
+CResolver.add_implicit_resolver("tag:yaml.org,2002:bool",
+    re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$"), list("tTfF"))
+CResolver.add_implicit_resolver("tag:yaml.org,2002:float",
+    re.compile(r"""^(?:[-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+]?[0-9]+)?
+        |[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)
+        |[-+]?\.[0-9_]+(?:[eE][-+][0-9]+)?
+        |[-+]?\.(?:inf|Inf|INF)
+        |\.(?:nan|NaN|NAN))$""", re.X), list("-+0123456789."))
+CResolver.add_implicit_resolver("tag:yaml.org,2002:int",
+    re.compile(r"""^(?:[-+]?0b[0-1_]+
+        |[-+]?0o?[0-7_]+
+        |[-+]?[0-9_]+
+        |[-+]?0x[0-9a-fA-F_]+)$""", re.X), list("-+0123456789"))
+CResolver.add_implicit_resolver("tag:yaml.org,2002:merge",
+    re.compile(r"^(?:<<)$"), ["<"])
+CResolver.add_implicit_resolver("tag:yaml.org,2002:null",
+    re.compile(r"^(?:~|null|Null|NULL|)$"), ["~", "n", "N", ""])
+CResolver.add_implicit_resolver("tag:yaml.org,2002:timestamp",
+    re.compile(r"""^(?:[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]
+        |[0-9][0-9][0-9][0-9] -[0-9][0-9]? -[0-9][0-9]?
+        (?:[Tt]|[ \t]+)[0-9][0-9]?
+        :[0-9][0-9] :[0-9][0-9] (?:\.[0-9]*)?
+        (?:[ \t]*(?:Z|[-+][0-9][0-9]?(?::[0-9][0-9])?))?)$""", re.X), list("0123456789"))
+
+
+class CConstructor(yaml.constructor.SafeConstructor):
+    """Safe constructor that marks strings, mappings, and sequences with their start marks.
+    Like ruamel's, it rejects duplicate keys and integers follow YAML 1.2 (no sexagesimal or 0-prefixed octal).
+    """
+
+    def construct_yaml_str(self, node):
+        value = CStr(self.construct_scalar(node))
+        value.lc = CLineCol(node.start_mark)
+        return value
+
+    def construct_yaml_seq(self, node):
+        data = CSeq()
+        data.lc = CLineCol(node.start_mark)
+        yield data
+        data.extend(self.construct_sequence(node))
+
+    def construct_yaml_map(self, node):
+        data = CMap()
+        data.lc = CLineCol(node.start_mark)
+        yield data
+        data.update(self.construct_mapping(node))
+
+    def construct_mapping(self, node, deep=False):
+        keys = set()
+        merged = False
+        if isinstance(node, yaml.MappingNode):
+            for key_node, value_node in node.value:
+                if key_node.tag == "tag:yaml.org,2002:merge":
+                    merged = True
+                    continue
+                key = (key_node.tag, key_node.value) if isinstance(key_node, yaml.ScalarNode) else id(key_node)
+                if key in keys:
+                    raise yaml.constructor.ConstructorError("while constructing a mapping", node.start_mark,
+                        f"found duplicate key {key_node.value}", key_node.start_mark)
+                keys.add(key)
+        mapping = super().construct_mapping(node, deep=deep)
+        if not merged:
+            return mapping
+
+        # Merged keys are put in front of the explicit ones; ruamel keeps the explicit ones first
+        order = dict.fromkeys(self.construct_object(key_node) for key_node, value_node in node.value[len(node.value) - len(keys):])
+        order.update(dict.fromkeys(mapping))
+        return {key: mapping[key] for key in order}
+
+    def construct_yaml_int(self, node):
+        value = self.construct_scalar(node).replace("_", "")
+        sign = -1 if value[0] == "-" else 1
+        if value[0] in "+-":
+            value = value[1:]
+        for prefix, base in [("0b", 2), ("0x", 16), ("0o", 8)]:
+            if value.startswith(prefix):
+                return sign * int(value[2:], base)
+        return sign * int(value)
+
+    def construct_undefined(self, node):
+        """Unknown tags (e.g. !Ref) are loaded like untagged nodes.
+        """
+
+        if isinstance(node, yaml.MappingNode):
+            return self.construct_yaml_map(node)
+        if isinstance(node, yaml.SequenceNode):
+            return self.construct_yaml_seq(node)
+        return self.construct_yaml_str(node)
+
+
+CConstructor.add_constructor("tag:yaml.org,2002:str", CConstructor.construct_yaml_str)
+CConstructor.add_constructor("tag:yaml.org,2002:seq", CConstructor.construct_yaml_seq)
+CConstructor.add_constructor("tag:yaml.org,2002:map", CConstructor.construct_yaml_map)
+CConstructor.add_constructor("tag:yaml.org,2002:int", CConstructor.construct_yaml_int)
+CConstructor.add_constructor(None, CConstructor.construct_undefined)
+
+
+if yaml.__with_libyaml__:
+    class CLoader(yaml.cyaml.CParser, CConstructor, CResolver):
+        def __init__(self, stream):
+            yaml.cyaml.CParser.__init__(self, stream)
+            CConstructor.__init__(self)
+            CResolver.__init__(self)
+else:
+    class CLoader(yaml.reader.Reader, yaml.scanner.Scanner, yaml.parser.Parser, yaml.composer.Composer, CConstructor, CResolver):
+        def __init__(self, stream):
+            yaml.reader.Reader.__init__(self, stream)
+            yaml.scanner.Scanner.__init__(self)
+            yaml.parser.Parser.__init__(self)
+            yaml.composer.Composer.__init__(self)
+            CConstructor.__init__(self)
+            CResolver.__init__(self)
+
+
+parsed = dict()     # blob hash of the content -> (documents, error that stopped the parse or None)
+
+
+def reset():
+    """Drops all parsed documents. Has to be called together with corpus.reset().
+    """
+
+    global parsed
+
+    parsed = dict()
+
+
+def parse(content: str) -> tuple:
+    """Returns the parsed documents of a content, or the ones before the first error together with that error.
+    """
+
+    key = corpus.blob_hash(content.encode())
+    if key not in parsed:
+        documents = list()
+        error = None
+        loader = CLoader(content)
+        try:
+            while loader.check_data():
+                documents.append(loader.get_data())
+        except yaml.YAMLError as e:
+            error = e
+        finally:
+            loader.dispose()
+        parsed[key] = (documents, error)
+    return parsed[key]
+
+
+def load_all(content: str, path=None) -> list:
+    """Returns all documents of a YAML content, up to the first one that can't be parsed. The path is only reported.
+    """
+
+    documents, error = parse(content)
+    if error is not None:
+        logger.debug(f"Could not parse all documents of YAML file {path}: {error}")
+    return documents
+
+
+def load(content: str, path=None):
+    """Returns the single document of a YAML content (None if it is empty). Raises yaml.YAMLError if it can't be parsed.
+    The path is only reported.
+    """
+
+    documents, error = parse(content)
+    if error is not None:
+        raise error
+    if len(documents) > 1:
+        raise yaml.YAMLError(f"Expected a single document in YAML file {path}, found {len(documents)}")
+    return documents[0] if documents else None
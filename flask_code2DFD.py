@@ -11,7 +11,9 @@ def index():
     Provide a GitHub URL to endpoint /dfd as parameter \"url\" to receive the extracted DFD: \
     /dfd?url=https://github.com/georgwittberger/apache-spring-boot \
            -microservice-example; \
-                     Optionally provide a commit hash as \"commit\" parameter")
+                     Optionally provide a commit hash as \"commit\" parameter. \
+    Endpoint /traceability lists the DFD items extracted from a \"file\" (optionally \"first_line\" to \"last_line\") \
+    of an analysed \"url\" and \"commit\"")
 
     return index_message
 
@@ -35,6 +37,29 @@ def dfd():
     return response
 
 
+@app.get('/traceability')
+def traceability():
+
+    url = request.args.get("url")
+    commit = request.args.get("commit")
+    file = request.args.get("file")
+    first_line = request.args.get("first_line", None, type=int)
+    last_line = request.args.get("last_line", None, type=int)
+
+    if not url or not commit or not file:
+        return "Please specify the URL and commit of an analysed repository and a file, e.g. /traceability?url=" \
+               "https://github.com/georgwittberger/apache-spring-boot-microservice-example&commit=...&file=...&first_line=10"
+
+    try:
+        results = code2DFD.query_invocation(url, commit, file, first_line, last_line)
+    except FileNotFoundError as e:
+        return str(e), 404
+    except ValueError as e:
+        return str(e), 400
+
+    return jsonify(results)
+
+
 # starts local server
 if __name__ == '__main__':
     app.run(debug=True, host='127.0.0.1', port=5001)
@@ -1,156 +1,109 @@
+"""Traceability information of the extracted items, i.e. the file locations that led to each node, edge, and annotation.
+Nodes and edges are kept in dicts keyed by item name, each holding a compact CTrace record whose sub items (the
+annotations) are again keyed by name, so that adding a trace is a direct lookup. The JSON layout is only created for
+the output.
+"""
+
 import json
 import os
 from pathlib import Path
+import sys
 
+import core.extractor_profile as extractor_profile
+import output_generators.traceability_index as traceability_index
 import tmp.tmp as tmp
 
-traceability = dict()
-traceability["nodes"] = dict()
-traceability["edges"] = dict()
+
+class CTrace:
+    """Location of an item: file (interned), line, span, and the traces of its sub items, if any.
+    """
+
+    __slots__ = ("file", "line", "span", "sub_items")
+
+    def __init__(self, file, line, span: str):
+        self.file = sys.intern(file) if type(file) is str else file
+        self.line = line
+        self.span = span
+        self.sub_items = None   # sub item -> CTrace
+
+    def matches(self, file, line, span: str) -> bool:
+        return self.file == file and self.line == line and self.span == span
+
+    def as_dict(self) -> dict:
+        trace = {"file": self.file, "line": self.line, "span": self.span}
+        if self.sub_items is not None:
+            trace["sub_items"] = {str(sub_item): sub_trace.as_dict() for sub_item, sub_trace in self.sub_items.items()}
+        return trace
+
+
+nodes = dict()  # item -> CTrace
+edges = dict()  # "sender -> receiver" -> CTrace
+recorded = None     # (function name, arguments) of the calls below while they are recorded for replay, else None
 
 
 def add_trace(traceability_info: dict):
-    """Adds an entry to the traceability dictionary.
+    """Adds an entry to the traceability store.
     """
 
+    extractor_profile.count("traces")
+    if recorded is not None:
+        recorded.append(("add_trace", (dict(traceability_info),)))
+
     # traceability info entries: (itemname, [parentitem], file, line, length)
-    global traceability
+    item = traceability_info["item"]
+    if "->" in item:
+        items = edges
+    else:
+        items = nodes
+    file = traceability_info["file"]
+    line = traceability_info["line"]
+    span = str(traceability_info["span"])
 
     if "parent_item" in traceability_info.keys():
-        if "->" in traceability_info["item"]:
-            type = "edges"
-            for edge in traceability["edges"]:
-                if edge == traceability_info["parent_item"]:
-                    item = edge
-
-        else:
-            type = "nodes"
-            for node in traceability["nodes"]:
-                if node == traceability_info["parent_item"]:
-                    item = node
-
         # check if parent item exists, otherwise can't add
-        if not traceability_info["parent_item"] in traceability[type].keys():
-            #print("Can't add traceability " + str(traceability_info))
-            pass
-        else:
-
-            # Adding the highlighting of the lines to the link (GitHub's feature)
-            file = traceability_info["file"]
-
-            item = traceability_info["item"]
-            parent_item = traceability_info["parent_item"]
-
-            # add dict for sub items if not present yet
-            if not "sub_items" in traceability[type][parent_item].keys():
-                traceability[type][parent_item]["sub_items"] = dict()
-
-            exists = False
-            for sub_item in traceability[type][parent_item]["sub_items"].keys():
-                if sub_item == traceability_info["item"]:
-                    exists = True
-                    if (traceability[type][parent_item]["sub_items"][sub_item]["file"] != file or
-                            traceability[type][parent_item]["sub_items"][sub_item]["line"] != traceability_info["line"] or
-                            traceability[type][parent_item]["sub_items"][sub_item]["span"] != str(traceability_info["span"])):
-
-                        traceability[type][parent_item]["sub_items"][item] = dict()
-                        traceability[type][parent_item]["sub_items"][item]["file"] = file
-                        traceability[type][parent_item]["sub_items"][item]["line"] = traceability_info["line"]
-                        traceability[type][parent_item]["sub_items"][item]["span"] = str(traceability_info["span"])
-
-            # sub item does not exist yet
-            if not exists:
-                traceability[type][parent_item]["sub_items"][item] = dict()
-                traceability[type][parent_item]["sub_items"][item]["file"] = file
-                traceability[type][parent_item]["sub_items"][item]["line"] = traceability_info["line"]
-                traceability[type][parent_item]["sub_items"][item]["span"] = str(traceability_info["span"])
-
+        parent = items.get(traceability_info["parent_item"])
+        if parent is None:
+            return
+        if parent.sub_items is None:
+            parent.sub_items = dict()
+        sub_trace = parent.sub_items.get(item)
+        if sub_trace is None or not sub_trace.matches(file, line, span):
+            parent.sub_items[item] = CTrace(file, line, span)
 
     else:
-        # Adding the highlighting of the lines to the link (GitHub's feature)
-        file = traceability_info["file"]
-
-        # check, whether item is already in dict
-        exists = False
-
-        if "->" in traceability_info["item"]:
-            type = "edges"
-        else:
-            type = "nodes"
-
-        for item in traceability[type].keys():
-            if item == traceability_info["item"]:
-                exists = True
-                if (not traceability[type][item]["file"] == file
-                    or not traceability[type][item]["line"] == traceability_info["line"]
-                    or not traceability[type][item]["span"] == str(traceability_info["span"])):
-
-                    item = traceability_info["item"]
-                    traceability[type][item] = dict()
-                    traceability[type][item]["file"] = file
-                    traceability[type][item]["line"] = traceability_info["line"]
-                    traceability[type][item]["span"] = str(traceability_info["span"])
-                break
-
-        # item doesn't exist yet -> add it
-        if not exists:
-            item = traceability_info["item"]
-            traceability[type][item] = dict()
-            traceability[type][item]["file"] = file
-            traceability[type][item]["line"] = traceability_info["line"]
-            traceability[type][item]["span"] = str(traceability_info["span"])
-
-    return
+        # an item found at a different location replaces the existing trace, including its sub items
+        trace = items.get(item)
+        if trace is None or not trace.matches(file, line, span):
+            items[item] = CTrace(file, line, span)
 
 
 def revert_flow(old_sender: str, old_receiver: str):
     """Changes direction of flow
     """
 
-    global traceability
-
-    to_delete = False
+    if recorded is not None:
+        recorded.append(("revert_flow", (old_sender, old_receiver)))
 
-    for item in traceability["edges"].copy():
-        if item == (old_sender + " -> " + old_receiver):
-            #traceability["edges"][old_receiver + " -> " + old_sender] = dict()
-            traceability["edges"][old_receiver + " -> " + old_sender] = traceability["edges"][item]
-            to_delete = item
-
-    if to_delete:
-        del traceability["edges"][to_delete]
+    old_edge = old_sender + " -> " + old_receiver
+    if old_edge in edges:
+        edges[old_receiver + " -> " + old_sender] = edges[old_edge]
+        del edges[old_edge]
 
 
 def output_traceability():
-    """Cleans the traceability dict and writes it to an output file.
+    """Converts the traceability store to its JSON layout and writes it and its reverse index to output files.
     """
 
-    quotate_ids()
-    write_to_file()
+    traceability = dict()
+    traceability["nodes"] = {str(item): trace.as_dict() for item, trace in nodes.items()}
+    traceability["edges"] = {str(item): trace.as_dict() for item, trace in edges.items()}
+    write_to_file(traceability)
+    traceability_index.write_index(traceability)
 
     return traceability
 
 
-def quotate_ids():
-    """Puts double quotes around all ids from sub_items to make it readable.
-    """
-
-    global traceability
-
-    new_traceability = dict()
-
-    for trace in traceability:
-        if "sub_items" in traceability[trace]:
-            new_subs = dict()
-            for sub_trace in traceability[trace]["sub_items"]:
-                new_subs[str(sub_trace)] = traceability[trace]["sub_items"][sub_trace]
-            traceability[trace]["sub_items"] = new_subs
-
-        new_traceability[str(trace)] = traceability[trace]
-    traceability = new_traceability
-
-
-def write_to_file():
+def write_to_file(traceability: dict):
     """Writes tracebility info from dict to json file.
     """
 
@@ -0,0 +1,117 @@
+"""Reverse index of the traceability information: which DFD items were extracted from a given file and line.
+The index is written next to the traceability output as PROJECT_traceability_index.json. Queries load it once per
+process and answer by a lookup of the file and a binary search over the lines of its traces.
+
+File layout (JSON):
+    {"format": int, "files": {path: [[line, type, item, parent_item, span], ...]}, "names": {file name: [...]}}
+Entries are sorted by line. Paths are relative to the repository. Traces that only record a file name (no
+directory) are kept under "names" and match every file of that name. Type is "nodes" or "edges"; parent_item is
+None for nodes and edges themselves and set for their sub items (annotations).
+"""
+
+from bisect import bisect_left, bisect_right
+import json
+import os
+from pathlib import Path
+
+import tmp.tmp as tmp
+
+
+FORMAT = 1
+
+loaded = dict()     # index path -> (modification time, {"files": {path: (lines, entries)}, "names": {...}})
+
+
+def write_index(traceability: dict):
+    """Builds the reverse index from the traceability output and writes it next to it.
+    """
+
+    local_path = tmp.tmp_config.get("Repository", "local_path", fallback="")
+    index = {"format": FORMAT, "files": dict(), "names": dict()}
+    for type in ["nodes", "edges"]:
+        for item, trace in traceability[type].items():
+            add_entry(index, local_path, type, item, None, trace)
+            for sub_item, sub_trace in trace.get("sub_items", dict()).items():
+                add_entry(index, local_path, type, sub_item, item, sub_trace)
+    for section in ["files", "names"]:
+        for entries in index[section].values():
+            entries.sort(key=lambda entry: entry[0])
+
+    index_path = get_index_path(tmp.tmp_config["Analysis Settings"]["output_path"])
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    with open(index_path, "w") as index_file:
+        json.dump(index, index_file)
+
+
+def add_entry(index: dict, local_path: str, type: str, item: str, parent_item, trace: dict):
+    """Adds a trace to the index, if it points to a line in a file.
+    """
+
+    try:
+        line = int(trace["line"])
+    except (TypeError, ValueError):
+        return      # implicit and heuristic traces
+    file = trace["file"]
+    if not isinstance(file, str) or not file:
+        return
+    entry = [line, type, item, parent_item, trace["span"]]
+    if os.path.isabs(file):
+        if not local_path or os.path.commonpath([file, local_path]) != os.path.normpath(local_path):
+            return
+        file = os.path.relpath(file, start=local_path)
+    file = os.path.normpath(file)
+    if os.path.dirname(file):
+        index["files"].setdefault(file, list()).append(entry)
+    else:
+        index["names"].setdefault(file, list()).append(entry)
+
+
+def get_index_path(output_path: str) -> str:
+    """Returns the path of the index in an output directory.
+    """
+
+    parts = Path(output_path).parts
+    return os.path.join(output_path, f"{parts[-2]}--{parts[-1]}_traceability_index.json")
+
+
+def load_index(index_path: str) -> dict:
+    """Reads an index, or returns the one read before if the file hasn't changed since.
+    """
+
+    modified = os.path.getmtime(index_path)
+    if index_path not in loaded or loaded[index_path][0] != modified:
+        with open(index_path, "r") as index_file:
+            stored = json.load(index_file)
+        if stored.get("format") != FORMAT:
+            raise ValueError(f"Traceability index {index_path} has an unknown format")
+        index = dict()
+        for section in ["files", "names"]:
+            index[section] = {file: ([entry[0] for entry in entries], entries) for file, entries in stored[section].items()}
+        loaded[index_path] = (modified, index)
+    return loaded[index_path][1]
+
+
+def query(index_path: str, file: str, first_line=None, last_line=None) -> list:
+    """Returns the DFD items traced to a file (relative to the repository), optionally only those traced to lines
+    first_line to last_line (inclusive; only first_line if last_line is not given).
+    """
+
+    index = load_index(index_path)
+    file = os.path.normpath(file)
+    if first_line is not None and last_line is None:
+        last_line = first_line
+
+    results = list()
+    candidates = [index["files"].get(file), index["names"].get(os.path.basename(file))]
+    for lines, entries in (candidate for candidate in candidates if candidate is not None):
+        if first_line is None:
+            start, end = 0, len(entries)
+        else:
+            start, end = bisect_left(lines, int(first_line)), bisect_right(lines, int(last_line))
+        for line, type, item, parent_item, span in entries[start:end]:
+            result = {"type": type, "item": item, "line": line, "span": span}
+            if parent_item is not None:
+                result["parent_item"] = parent_item
+            results.append(result)
+    results.sort(key=lambda result: result["line"])
+    return results
@@ -2,11 +2,18 @@ import re
 import os
 
 import core.external_components as ext
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("aph", arguments=("microservices", "information_flows", "external_components", "dfd"),
+                      returns=("microservices", "information_flows", "external_components"),
+                      reads=("services", "annotations", "components", "model"),
+                      writes=("services", "annotations", "flows", "components"), keywords=("ProxyPass", "apache2ctl"),
+                      files=("*.conf",),
+                      triggers=("ProxyPass", "apache2ctl"))
 def detect_apachehttpd_webserver(microservices: dict, information_flows: dict, external_components: dict, dfd) -> dict:
     """Detects apachehttpd webservers and routes if possible.
     """
@@ -92,10 +99,7 @@ def mark_server(microservices: dict, microservice: str) -> dict:
 
     if not microservice:
         microservice = "apache-server"
-        try:
-            id = max(microservices.keys()) + 1
-        except:
-            id = 0
+        id = microservices.next_id()
         microservices[id] = dict()
         microservices[id]["name"] = microservice
         microservices[id]["stereotype_instances"] = ["web_server"]
@@ -167,10 +171,7 @@ def add_connections(microservices: dict, information_flows: dict, file, microser
                             if microservices[m]["name"] == host:
                                 target_service = host
                     if target_service:
-                        try:
-                            id = max(information_flows.keys()) + 1
-                        except:
-                            id = 0
+                        id = information_flows.next_id()
                         information_flows[id] = dict()
                         information_flows[id]["sender"] = microservice
                         information_flows[id]["receiver"] = target_service
@@ -1,7 +1,13 @@
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 
 
+@extractors.extractor("cbr", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"),
+                      reads=("services", "properties", "flows", "model"), writes=("annotations", "flows"),
+                      keywords=("@EnableCircuitBreaker",),
+                      triggers=("@EnableCircuitBreaker",))
 def detect_circuit_breakers(microservices: dict, information_flows: dict, dfd) -> dict:
     """Find circuit breakers.
     """
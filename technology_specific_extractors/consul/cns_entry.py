@@ -1,6 +1,10 @@
+import core.extractors as extractors
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("cns", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services", "properties"),
+                      writes=("annotations", "flows"))
 def detect_consul(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detects Consul server and clients (service discover, monitoring, configuration).
     """
@@ -26,10 +30,7 @@ def detect_consul(microservices: dict, information_flows: dict, dfd) -> dict:
                 if prop[0] == "consul_server":
                     for consul in consul_server:
                         if consul == prop[1]:
-                            try:
-                                id = max(information_flows.keys()) + 1
-                            except:
-                                id = 0
+                            id = information_flows.next_id()
                             information_flows[id] = dict()
                             information_flows[id]["sender"] = consul
                             information_flows[id]["receiver"] = microservices[m]["name"]
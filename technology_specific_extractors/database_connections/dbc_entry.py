@@ -1,32 +1,32 @@
-import ast
-
-import technology_specific_extractors.environment_variables as env
+from core.DFD import CCollection
+import core.extractors as extractors
 import core.technology_switch as tech_sw
-import tmp.tmp as tmp
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("dbc", arguments=("dfd",), reads=("services", "properties", "flows", "components", "model"),
+                      writes=("annotations", "flows", "components"))
 def set_information_flows(dfd) -> set:
     """Goes through services and checks if there are connections to databases.
     """
 
-    if tmp.tmp_config.has_option("DFD", "information_flows"):
-        information_flows = ast.literal_eval(tmp.tmp_config["DFD"]["information_flows"])
+    if dfd.information_flows is not None:
+        information_flows = dfd.information_flows
     else:
-        information_flows = dict()
+        information_flows = CCollection()
 
-    if tmp.tmp_config.has_option("DFD", "external_components"):
-        external_components = ast.literal_eval(tmp.tmp_config["DFD"]["external_components"])
+    if dfd.external_components is not None:
+        external_components = dfd.external_components
     else:
-        external_components = dict()
+        external_components = CCollection()
 
     microservices = tech_sw.get_microservices(dfd)
 
     microservices, information_flows, external_components = check_properties(microservices, information_flows, external_components)
 
-    tmp.tmp_config.set("DFD", "information_flows", str(information_flows).replace("%", "%%"))
-    tmp.tmp_config.set("DFD", "microservices", str(microservices).replace("%", "%%"))
-    tmp.tmp_config.set("DFD", "external_components", str(external_components).replace("%", "%%"))
+    dfd.information_flows = information_flows
+    dfd.microservices = microservices
+    dfd.external_components = external_components
     return microservices, information_flows
 
 
@@ -68,16 +68,13 @@ def check_properties(microservices: dict, information_flows: dict, external_comp
                     if microservices[mi]["name"] == database:
                         database_service = microservices[mi]["name"]
             if prop[0] == "datasource_username":
-                username = env.resolve_env_var(prop[1])
+                username = prop[1]
             if prop[0] == "datasource_password":
-                password = env.resolve_env_var(prop[1])
+                password = prop[1]
 
         if database_service:    # found a connection to a microservice
             # set information flow
-            try:
-                id = max(information_flows.keys()) + 1
-            except:
-                id = 0
+            id = information_flows.next_id()
             information_flows[id] = dict()
             information_flows[id]["sender"] = database_service
             information_flows[id]["receiver"] = sender
@@ -154,10 +151,7 @@ def check_properties(microservices: dict, information_flows: dict, external_comp
                     database_type = "Neo4j"
 
             # create external component
-            try:
-                id = max(external_components.keys()) + 1
-            except:
-                id = 0
+            id = external_components.next_id()
             external_components[id] = dict()
             external_components[id]["name"] = "database-" + str(microservices[m]["name"])
             external_components[id]["type"] = "external_component"
@@ -200,10 +194,7 @@ def check_properties(microservices: dict, information_flows: dict, external_comp
                     external_components[id]["stereotype_instances"] = ["plaintext_credentials"]
 
             # set information flow
-            try:
-                id = max(information_flows.keys()) + 1
-            except:
-                id = 0
+            id = information_flows.next_id()
             information_flows[id] = dict()
             information_flows[id]["sender"] = "database-" + str(microservices[m]["name"])
             information_flows[id]["receiver"] = microservices[m]["name"]
@@ -220,8 +211,6 @@ def check_properties(microservices: dict, information_flows: dict, external_comp
                 except:
                     information_flows[id]["tagged_values"] = [("Username", username.strip())]
 
-            tmp.tmp_config.set("DFD", "external_components", str(external_components).replace("%", "%%"))
-
             trace = dict()
             trace["item"] = "database-" + str(microservices[m]["name"]) + " -> " + microservices[m]["name"]
             trace["file"] = trace_info[0]
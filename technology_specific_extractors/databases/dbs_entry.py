@@ -1,6 +1,9 @@
+import core.extractors as extractors
 import core.file_interaction as fi
 import output_generators.traceability as traceability
 
+@extractors.extractor("dbs", arguments=("microservices",), returns=("microservices",), reads=("services",),
+                      writes=("annotations",), files=("Dockerfile",))
 def detect_databases(microservices: dict) -> dict:
     """Detects databases.
     """
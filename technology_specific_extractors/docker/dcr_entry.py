@@ -1,6 +1,6 @@
 import os
 
-import tmp.tmp as tmp
+import core.corpus as corpus
 
 
 def detect_port(path: str) -> int:
@@ -8,23 +8,13 @@ def detect_port(path: str) -> int:
     """
 
     port = False
-    local_repo_path = tmp.tmp_config["Repository"]["local_path"]
 
-    dirs = list()
-    dirs.append(os.scandir(os.path.join(local_repo_path, os.path.dirname(path))))
-
-    while dirs:
-        dir = dirs.pop()
-        for entry in dir:
-            if entry.is_file():
-                if entry.name.casefold() == "dockerfile":
-                    with open(entry.path, "r") as file:
-                        lines = file.readlines()
-                    for line in lines:
-                        line = line.casefold()
-                        if "expose" in line:
-                            port = line.split("expose")[1].split("/")[0].strip()
-            elif entry.is_dir():
-                dirs.append(os.scandir(entry.path))
+    for file in corpus.get_subtree_files(os.path.dirname(path)):
+        if file["name"].casefold() == "dockerfile":
+            lines = corpus.get_lines(file) or list()
+            for line in lines:
+                line = line.casefold()
+                if "expose" in line:
+                    port = line.split("expose")[1].split("/")[0].strip()
 
     return port
@@ -1,11 +1,12 @@
-import ast
 import os
 
+from core.DFD import CCollection
+import core.extractors as extractors
 import core.file_interaction as fi
+import core.service_roots as service_roots
 from output_generators.logger import logger
 import core.technology_switch as tech_sw
 import technology_specific_extractors.docker_compose.dcm_parser as dcm_parser
-import tmp.tmp as tmp
 import output_generators.traceability as traceability
 
 docker_compose_content = False
@@ -29,21 +30,21 @@ def set_microservices(dfd) -> None:
         if len(raw_files) == 0:
             microservices = tech_sw.get_microservices(dfd)
             microservices = clean_pom_names(microservices)
-            tmp.tmp_config.set("DFD", "microservices", str(microservices).replace("%", "%%"))
+            dfd.microservices = microservices
             return
         docker_compose_content = raw_files[0]["content"]
 
-    microservices_set, properties_dict = dcm_parser.extract_microservices(docker_compose_content, raw_files[0]["path"])
+    microservices_set, properties_dict = dcm_parser.extract_microservices(docker_compose_content, raw_files[0]["path"], dfd)
 
     if not microservices_set:
         microservices = tech_sw.get_microservices(dfd)
         microservices = clean_pom_names(microservices)
-        tmp.tmp_config.set("DFD", "microservices", str(microservices).replace("%", "%%"))
+        dfd.microservices = microservices
         return
-    microservices = dictionarify(microservices_set, properties_dict)
+    microservices = dictionarify(microservices_set, properties_dict, dfd)
     microservices = clean_pom_names(microservices)
 
-    tmp.tmp_config.set("DFD", "microservices", str(microservices).replace("%", "%%"))
+    dfd.microservices = microservices
 
 
 def clean_pom_names(microservices: dict) -> dict:
@@ -51,19 +52,19 @@ def clean_pom_names(microservices: dict) -> dict:
     """
 
     for m in microservices.keys():
-        microservices[m]["name"] = microservices[m]["name"].replace("pom_", "")
+        microservices.rename(m, microservices[m]["name"].replace("pom_", ""))
 
     return microservices
 
 
-def dictionarify(elements_set: set, properties_dict: dict) -> dict:
+def dictionarify(elements_set: set, properties_dict: dict, dfd) -> dict:
     """Turns set of services into dictionary.
     """
 
-    if tmp.tmp_config.has_option("DFD", "microservices"):
-        elements = ast.literal_eval(tmp.tmp_config["DFD"]["microservices"])
+    if dfd.microservices is not None:
+        elements = dfd.microservices
     else:
-        elements = dict()
+        elements = CCollection()
 
     for e in elements_set:
         try:
@@ -86,10 +87,7 @@ def dictionarify(elements_set: set, properties_dict: dict) -> dict:
             trace["line"] = e[3][2]
             trace["span"] = e[3][3]
             traceability.add_trace(trace)
-        try:
-            id = max(elements.keys()) + 1
-        except:
-            id = 0
+        id = elements.next_id()
         elements[id] = dict()
 
         elements[id]["name"] = e[0]
@@ -109,16 +107,18 @@ def dictionarify(elements_set: set, properties_dict: dict) -> dict:
     return elements
 
 
+@extractors.extractor("dcm", arguments=("dfd",), reads=("services", "flows", "model"), writes=("flows",),
+                      files=("docker-compose*",))
 def set_information_flows(dfd):
     """Adds information flows based on "links" parameter in docker-compose.
     """
 
     global docker_compose_content
 
-    if tmp.tmp_config.has_option("DFD", "information_flows"):
-        information_flows = ast.literal_eval(tmp.tmp_config["DFD"]["information_flows"])
+    if dfd.information_flows is not None:
+        information_flows = dfd.information_flows
     else:
-        information_flows = dict()
+        information_flows = CCollection()
 
     microservices = tech_sw.get_microservices(dfd)
 
@@ -135,7 +135,7 @@ def set_information_flows(dfd):
 
     information_flows = dcm_parser.extract_information_flows(docker_compose_content, microservices, information_flows)
 
-    tmp.tmp_config.set("DFD", "information_flows", str(information_flows).replace("%", "%%"))
+    dfd.information_flows = information_flows
     return information_flows
 
 
@@ -174,28 +174,12 @@ def detect_microservice(file_path: str, dfd) -> str:
 
     microservices = tech_sw.get_microservices(dfd)
     microservice = False
-    dockerfile_path = False
-
-    local_repo_path = tmp.tmp_config["Repository"]["local_path"]
 
     # Find corresponding dockerfile
-    dirs = list()
-    found_docker = False
-
-    path = os.path.dirname(file_path)
-    while not found_docker and path != "":
-        dirs.append(os.scandir(os.path.join(local_repo_path, path)))
-        while dirs:
-            dir = dirs.pop()
-            for entry in dir:
-                if entry.is_file():
-                    if entry.name.casefold() == "dockerfile":
-                        dockerfile_path = os.path.relpath(entry.path, start=local_repo_path).strip("/")
-                        found_docker = True
-        path = os.path.dirname(path)
-
-    if dockerfile_path:
-        dockerfile_location = os.path.dirname(dockerfile_path)
+    dockerfile_path = service_roots.find_build_file(file_path, "dockerfile")
+    if not dockerfile_path:
+        return microservice
+    dockerfile_location = os.path.dirname(dockerfile_path.strip("/"))
 
     # find docker-compose path
     try:
@@ -220,9 +204,9 @@ def detect_microservice(file_path: str, dfd) -> str:
 
     # go through microservices to see if dockerfile_image fits an image
     try:
-        for m in microservices.keys():
-            if microservices[m]["image"] == docker_image:
-                microservice = microservices[m]["name"]
+        services = microservices.find_by("image", docker_image)
+        if services:
+            microservice = microservices[services[-1]]["name"]
     except:
         pass
 
@@ -1,76 +1,25 @@
-import ast
 import re
 from pathlib import Path
 
-import ruamel.yaml
-
+from core.DFD import CCollection
+import core.yaml_loader as yaml_loader
 import output_generators.traceability as traceability
 import technology_specific_extractors.environment_variables as env
-import tmp.tmp as tmp
-
-
-# The following is taken from ruamel.yaml's authro as a workaround for getting line count for str objects
-# https://stackoverflow.com/questions/45716281/parsing-yaml-get-line-numbers-even-in-ordered-maps/45717104#45717104
-class Str(ruamel.yaml.scalarstring.ScalarString):
-    __slots__ = ('lc')
-
-    style = ""
-
-    def __new__(cls, value):
-        return ruamel.yaml.scalarstring.ScalarString.__new__(cls, value)
-
-class MyPreservedScalarString(ruamel.yaml.scalarstring.PreservedScalarString):
-    __slots__ = ('lc')
-
-class MyDoubleQuotedScalarString(ruamel.yaml.scalarstring.DoubleQuotedScalarString):
-    __slots__ = ('lc')
-
-class MySingleQuotedScalarString(ruamel.yaml.scalarstring.SingleQuotedScalarString):
-    __slots__ = ('lc')
-
-class MyConstructor(ruamel.yaml.constructor.RoundTripConstructor):
-    def construct_scalar(self, node):
 
-        if not isinstance(node, ruamel.yaml.nodes.ScalarNode):
-            raise ruamel.yaml.constructor.ConstructorError(
-                None, None,
-                "expected a scalar node, but found %s" % node.id,
-                node.start_mark)
 
-        if node.style == '|' and isinstance(node.value, ruamel.yaml.compat.text_type):
-            ret_val = MyPreservedScalarString(node.value)
-        elif bool(self._preserve_quotes) and isinstance(node.value, ruamel.yaml.compat.text_type):
-            if node.style == "'":
-                ret_val = MySingleQuotedScalarString(node.value)
-            elif node.style == '"':
-                ret_val = MyDoubleQuotedScalarString(node.value)
-            else:
-                ret_val = Str(node.value)
-        else:
-            ret_val = Str(node.value)
-        ret_val.lc = ruamel.yaml.comments.LineCol()
-        ret_val.lc.line = node.start_mark.line
-        ret_val.lc.col = node.start_mark.column
-        return ret_val
-# end of external code
-
-
-def extract_microservices(file_content, file_name) -> set:
+def extract_microservices(file_content, file_name, dfd) -> set:
     """ Extracts the list of microservices from the docker-compose file autonomously,
     i.e. without asking for user-input in case of errors.
     """
 
-    yaml = ruamel.yaml.YAML()
-    yaml.Constructor = MyConstructor
-
-    file = yaml.load(file_content)
+    file = yaml_loader.load(file_content, file_name)
 
     image = False
     build = False
-    if tmp.tmp_config.has_option("DFD", "microservices"):
-        microservices_dict =  ast.literal_eval(tmp.tmp_config["DFD"]["microservices"])
+    if dfd.microservices is not None:
+        microservices_dict = dfd.microservices
     else:
-        microservices_dict= dict()
+        microservices_dict = CCollection()
     microservices_set = set()
     properties_dict = dict()
 
@@ -127,7 +76,7 @@ def extract_microservices(file_content, file_name) -> set:
                     if new_image.split("/")[-1] == pom_path.parts[-2]:
                         exists = True
                         if "pom_" in microservices_dict[id]["name"]:
-                            microservices_dict[id]["name"] = s
+                            microservices_dict.rename(id, s)
             except:
                 pass
 
@@ -139,7 +88,7 @@ def extract_microservices(file_content, file_name) -> set:
                     if new_build.split("/")[-1] == pom_path.parts[-2]:
                         exists = True
                         if "pom_" in microservices_dict[id]["name"]:
-                            microservices_dict[id]["name"] = s
+                            microservices_dict.rename(id, s)
             except:
                 pass
 
@@ -205,6 +154,8 @@ def extract_microservices(file_content, file_name) -> set:
                         line_nr = file["services"][s]["environment"]["MONGODB_USERNAME"].lc.line
                         length_tuple = re.search(password.replace("$", "\$"), lines[line_nr].replace("$", "\$")).span()
                         span = "[" + str(length_tuple[0]) +  ":" + str(length_tuple[1]) + "]"
+                        if "$" in username:
+                            username = env.resolve_env_var(username)
                         if username != None:
                             properties.add(("datasource_username", username, (file_name, line_nr + 1, span)))
                     elif "MONGODB_USER" in entry:
@@ -212,6 +163,8 @@ def extract_microservices(file_content, file_name) -> set:
                         line_nr = file["services"][s]["environment"]["MONGODB_USER"].lc.line
                         length_tuple = re.search(password.replace("$", "\$"), lines[line_nr].replace("$", "\$")).span()
                         span = "[" + str(length_tuple[0]) +  ":" + str(length_tuple[1]) + "]"
+                        if "$" in username:
+                            username = env.resolve_env_var(username)
                         if username != None:
                             properties.add(("datasource_username", username, (file_name, line_nr + 1, span)))
                     elif "MYSQL_USERNAME" in entry:
@@ -219,6 +172,8 @@ def extract_microservices(file_content, file_name) -> set:
                         line_nr = file["services"][s]["environment"]["MYSQL_USERNAME"].lc.line
                         length_tuple = re.search(password.replace("$", "\$"), lines[line_nr].replace("$", "\$")).span()
                         span = "[" + str(length_tuple[0]) +  ":" + str(length_tuple[1]) + "]"
+                        if "$" in username:
+                            username = env.resolve_env_var(username)
                         if username != None:
                             properties.add(("datasource_username", username, (file_name, line_nr + 1, span)))
                     elif "MYSQL_USER" in entry:
@@ -226,6 +181,8 @@ def extract_microservices(file_content, file_name) -> set:
                         line_nr = file["services"][s]["environment"]["MYSQL_USER"].lc.line
                         length_tuple = re.search(password.replace("$", "\$"), lines[line_nr].replace("$", "\$")).span()
                         span = "[" + str(length_tuple[0]) +  ":" + str(length_tuple[1]) + "]"
+                        if "$" in username:
+                            username = env.resolve_env_var(username)
                         if username != None:
                             properties.add(("datasource_username", username, (file_name, line_nr + 1, span)))
 
@@ -234,6 +191,8 @@ def extract_microservices(file_content, file_name) -> set:
                         line_nr = file["services"][s]["environment"]["MONGODB_PASSWORD"].lc.line
                         length_tuple = re.search(password.replace("$", "\$"), lines[line_nr].replace("$", "\$")).span()
                         span = "[" + str(length_tuple[0]) +  ":" + str(length_tuple[1]) + "]"
+                        if "$" in password:
+                            password = env.resolve_env_var(password)
                         if password != None:
                             properties.add(("datasource_password", password, (file_name, line_nr + 1, span)))
                     elif "MONGODB_PASS" in entry:
@@ -241,6 +200,8 @@ def extract_microservices(file_content, file_name) -> set:
                         line_nr = file["services"][s]["environment"]["MONGODB_PASS"].lc.line
                         length_tuple = re.search(password.replace("$", "\$"), lines[line_nr].replace("$", "\$")).span()
                         span = "[" + str(length_tuple[0]) +  ":" + str(length_tuple[1]) + "]"
+                        if "$" in password:
+                            password = env.resolve_env_var(password)
                         if password != None:
                             properties.add(("datasource_password", password, (file_name, line_nr + 1, span)))
                     elif "MYSQL_PASSWORD" in entry:
@@ -248,6 +209,8 @@ def extract_microservices(file_content, file_name) -> set:
                         line_nr = file["services"][s]["environment"]["MYSQL_PASSWORD"].lc.line
                         length_tuple = re.search(password.replace("$", "\$"), lines[line_nr].replace("$", "\$")).span()
                         span = "[" + str(length_tuple[0]) +  ":" + str(length_tuple[1]) + "]"
+                        if "$" in password:
+                            password = env.resolve_env_var(password)
                         if password != None:
                             properties.add(("datasource_password", password, (file_name, line_nr + 1, span)))
                     elif "MYSQL_PASS" in entry:
@@ -255,6 +218,8 @@ def extract_microservices(file_content, file_name) -> set:
                         line_nr = file["services"][s]["environment"]["MYSQL_PASS"].lc.line
                         length_tuple = re.search(password.replace("$", "\$"), lines[line_nr].replace("$", "\$")).span()
                         span = "[" + str(length_tuple[0]) +  ":" + str(length_tuple[1]) + "]"
+                        if "$" in password:
+                            password = env.resolve_env_var(password)
                         if password != None:
                             properties.add(("datasource_password", password, (file_name, line_nr + 1, span)))
             except:
@@ -277,6 +242,8 @@ def extract_microservices(file_content, file_name) -> set:
                 line_nr = file["services"][s]["environment"]["POSTGRES_PASSWORD"].lc.line
                 length_tuple = re.search(password.replace("$", "\$"), lines[line_nr].replace("$", "\$")).span()
                 span = "[" + str(length_tuple[0]) +  ":" + str(length_tuple[1]) + "]"
+                if "$" in password:
+                    password = env.resolve_env_var(password)
                 if password != None:
                     properties.add(("datasource_password", password, (file_name, line_nr + 1, span)))
             except:
@@ -287,6 +254,8 @@ def extract_microservices(file_content, file_name) -> set:
                 line_nr = file["services"][s]["environment"]["POSTGRES_USER"].lc.line
                 length_tuple = re.search(username.replace("$", "\$"), lines[line_nr].replace("$", "\$")).span()
                 span = "[" + str(length_tuple[0]) +  ":" + str(length_tuple[1]) + "]"
+                if "$" in username:
+                    username = env.resolve_env_var(username)
                 if username != None:
                     properties.add(("datasource_username", username, (file_name, line_nr + 1, span)))
             except:
@@ -400,7 +369,7 @@ def extract_microservices(file_content, file_name) -> set:
                     if new_image.split("/")[-1] == pom_path.parts[-2]:
                         exists = True
                         if "pom_" in microservices_dict[id]["name"]:
-                            microservices_dict[id]["name"] = s
+                            microservices_dict.rename(id, s)
             except:
                 pass
 
@@ -412,7 +381,7 @@ def extract_microservices(file_content, file_name) -> set:
                     if new_build.split("/")[-1] == pom_path.parts[-2]:
                         exists = True
                         if "pom_" in microservices_dict[id]["name"]:
-                            microservices_dict[id]["name"] = s
+                            microservices_dict.rename(id, s)
             except:
                 pass
 
@@ -621,7 +590,7 @@ def extract_microservices(file_content, file_name) -> set:
                 else:
                     microservices_dict[correct_id]["properties"] = properties
 
-    tmp.tmp_config.set("DFD", "microservices", str(microservices_dict).replace("%", "%%"))
+    dfd.microservices = microservices_dict
     return microservices_set, properties_dict
 
 
@@ -629,9 +598,6 @@ def extract_information_flows(file_content, microservices, information_flows):
     """Adds information flows based on "links".
     """
 
-    yaml = ruamel.yaml.YAML()
-    yaml.Constructor = MyConstructor
-
     discovery_server, config_server = False, False
     for m in microservices.keys():
         if "stereotype_instances" in microservices[m] and "service_discovery" in microservices[m]["stereotype_instances"]:
@@ -639,7 +605,7 @@ def extract_information_flows(file_content, microservices, information_flows):
         if "stereotype_instances" in microservices[m] and "configuration_server" in microservices[m]["stereotype_instances"]:
             config_server = microservices[m]["name"]
 
-    file = yaml.load(file_content)
+    file = yaml_loader.load(file_content)
 
     if "services" in file:
         for s in file.get("services"):
@@ -652,10 +618,7 @@ def extract_information_flows(file_content, microservices, information_flows):
                         if microservices[m]["name"] == link:
                             found_service = True
                     if found_service and not link in {discovery_server, config_server}:
-                        try:
-                            id = max(information_flows.keys()) + 1
-                        except:
-                            id = 0
+                        id = information_flows.next_id()
                         information_flows[id] = dict()
                         information_flows[id]["sender"] = s
                         information_flows[id]["receiver"] = link
@@ -673,10 +636,7 @@ def extract_information_flows(file_content, microservices, information_flows):
                         if microservices[m]["name"] == link:
                             found_service = True
                     if found_service and not link in {discovery_server, config_server}:
-                        try:
-                            id = max(information_flows.keys()) + 1
-                        except:
-                            id = 0
+                        id = information_flows.next_id()
                         information_flows[id] = dict()
                         information_flows[id]["sender"] = s
                         information_flows[id]["receiver"] = link
@@ -1,6 +1,10 @@
+import core.extractors as extractors
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("ela", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services", "annotations", "flows"),
+                      writes=("annotations", "flows"))
 def detect_elasticsearch(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detects elasticsearch services.
     """
@@ -25,10 +29,7 @@ def detect_elasticsearch(microservices: dict, information_flows: dict, dfd) -> d
                 kibana = microservices[m]["name"]
 
         if kibana:
-            try:
-                id = max(information_flows.keys()) + 1
-            except:
-                id = 0
+            id = information_flows.next_id()
             information_flows[id] = dict()
             information_flows[id]["sender"] = elasticsearch
             information_flows[id]["receiver"] = kibana
@@ -1,8 +1,18 @@
+from core.DFD import CCollection
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("eur", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services", "properties", "model"),
+                      writes=("annotations", "flows"),
+                      keywords=("@EnableEurekaServer",
+                                "EnableEurekaClient",
+                                "EnableDiscoveryClient",
+                                "spring-cloud-starter-netflix-eureka-client"),
+                      triggers=("@EnableEurekaServer",))
 def detect_eureka(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detects Eureka servers if there are any.
     """
@@ -45,7 +55,7 @@ def detect_eureka(microservices: dict, information_flows: dict, dfd) -> dict:
                 result_paths.add((results[r]["path"], results[r]["line_nr"], results[r]["span"]))
 
         if not information_flows:
-            information_flows = dict()
+            information_flows = CCollection()
 
         participants = set()
         for result_path in result_paths:
@@ -61,10 +71,7 @@ def detect_eureka(microservices: dict, information_flows: dict, dfd) -> dict:
 
         for participant in participants:
             if not participant[0] == eureka_server:
-                try:
-                    id = max(information_flows.keys()) + 1
-                except:
-                    id = 0
+                id = information_flows.next_id()
                 information_flows[id] = dict()
                 information_flows[id]["sender"] = participant[0]
                 information_flows[id]["receiver"] = eureka_server
@@ -95,6 +102,9 @@ def is_eureka(microservice: tuple) -> bool:
     return False
 
 
+@extractors.extractor("eur_server", arguments=("microservices", "dfd"), returns=("microservices",),
+                      reads=("services", "model"), writes=("annotations",), keywords=("@EnableEurekaServer",),
+                      triggers=("@EnableEurekaServer",))
 def detect_eureka_server_only(microservices: dict, dfd):
 
     results = fi.search_keywords("@EnableEurekaServer")
@@ -1,21 +1,26 @@
-import ast
+import copy
 
+from core.DFD import CCollection
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
-import tmp.tmp as tmp
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("fgn", arguments=("dfd",), reads=("services", "properties", "flows", "model", "placeholders"),
+                      writes=("flows", "placeholders"),
+                      keywords=("@EnableFeignClients", "@FeignClient"),
+                      triggers=("@FeignClient",))
 def set_information_flows(dfd) -> dict:
     """Detects uses of Feign Client in the code.
     """
 
-    microservices = tech_sw.get_microservices(dfd)
+    microservices = copy.deepcopy(tech_sw.get_microservices(dfd))    # the hystrix marker below is only used locally
 
-    if tmp.tmp_config.has_option("DFD", "information_flows"):
-        information_flows = ast.literal_eval(tmp.tmp_config["DFD"]["information_flows"])
+    if dfd.information_flows is not None:
+        information_flows = dfd.information_flows
     else:
-        information_flows = dict()
+        information_flows = CCollection()
 
     # check for circuit breaker
     results = fi.search_keywords("@EnableFeignClients")     # content, name, path
@@ -75,10 +80,7 @@ def set_information_flows(dfd) -> dict:
                                     stereotype_instances.add("authenticated_request")
                 if target_service and microservice:
                     # set flow
-                    try:
-                        id2 = max(information_flows.keys()) + 1
-                    except:
-                        id2 = 0
+                    id2 = information_flows.next_id()
                     information_flows[id2] = dict()
 
                     information_flows[id2]["sender"] = microservice
@@ -94,7 +96,7 @@ def set_information_flows(dfd) -> dict:
 
                     traceability.add_trace(trace)
 
-    tmp.tmp_config.set("DFD", "information_flows", str(information_flows).replace("%", "%%"))
+    dfd.information_flows = information_flows
     return information_flows
 
 
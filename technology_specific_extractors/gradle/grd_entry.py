@@ -1,12 +1,13 @@
-import ast
 import os
 from pathlib import Path
 
+from core.DFD import CCollection
+import core.corpus as corpus
 import core.file_interaction as fi
 from output_generators.logger import logger
 import core.parse_files as parse
+import core.service_roots as service_roots
 import core.technology_switch as tech_sw
-import tmp.tmp as tmp
 import output_generators.traceability as traceability
 
 
@@ -17,10 +18,10 @@ def set_microservices(dfd) -> dict:
     if not used_in_application():
         return False
 
-    if tmp.tmp_config.has_option("DFD", "microservices"):
-        microservices = ast.literal_eval(tmp.tmp_config["DFD"]["microservices"])
+    if dfd.microservices is not None:
+        microservices = dfd.microservices
     else:
-        microservices = dict()
+        microservices = CCollection()
 
     gradle_files = fi.get_file_as_lines("build.gradle")
     for gf in gradle_files.keys():
@@ -31,10 +32,7 @@ def set_microservices(dfd) -> dict:
             microservice, properties = parse_configurations(gradle_file)
 
             if microservice[0]:
-                try:
-                    id = max(microservices.keys()) + 1
-                except:
-                    id = 0
+                id = microservices.next_id()
                 microservices[id] = dict()
 
                 microservices[id]["name"] = microservice[0]
@@ -56,7 +54,7 @@ def set_microservices(dfd) -> dict:
                 except:
                     pass
 
-    tmp.tmp_config.set("DFD", "microservices", str(microservices).replace("%", "%%"))
+    dfd.microservices = microservices
 
     return microservices
 
@@ -89,35 +87,25 @@ def parse_properties_file(gradle_path: str):
     # find properties file
     path = os.path.dirname(gradle_path)
 
-    local_repo_path = tmp.tmp_config["Repository"]["local_path"]
-
-    dirs = list()
-    dirs.append(os.scandir(os.path.join(local_repo_path, path)))
-
-    while dirs:
-        dir = dirs.pop()
-        for entry in dir:
-            if entry.is_file():
-                if not "test" in entry.path:
-                    filename = os.path.basename(entry.path)
-                    if filename in ["application.properties", "bootstrap.properties"]:
-                        logger.info("Found application.properties here: " + str(entry.path))
-                        file_path = os.path.relpath(entry.path, start=local_repo_path)
-                        new_microservice, new_properties = parse.parse_properties_file(file_path)
-                        if new_microservice[0]:
-                            microservice = new_microservice
-                        if new_properties:
-                            properties = properties.union(new_properties)
-                    elif filename in ["application.yaml", "application.yml", "bootstrap.yml", "bootstrap.yaml", "filebeat.yml", "filebeat.yaml"]:
-                        logger.info("Found properties file here: " + str(entry.path))
-                        file_path = os.path.relpath(entry.path, start=local_repo_path)
-                        new_microservice, new_properties = parse.parse_yaml_file(file_path)
-                        if new_microservice[0]:
-                            microservice = new_microservice
-                        if new_properties:
-                            properties = properties.union(new_properties)
-            elif entry.is_dir():
-                dirs.append(os.scandir(entry.path))
+    for file in corpus.get_subtree_files(path):
+        if not "test" in file["full_path"]:
+            filename = file["name"]
+            if filename in ["application.properties", "bootstrap.properties"]:
+                logger.info("Found application.properties here: " + str(file["full_path"]))
+                file_path = file["path"]
+                new_microservice, new_properties = parse.parse_properties_file(file_path)
+                if new_microservice[0]:
+                    microservice = new_microservice
+                if new_properties:
+                    properties = properties.union(new_properties)
+            elif filename in ["application.yaml", "application.yml", "bootstrap.yml", "bootstrap.yaml", "filebeat.yml", "filebeat.yaml"]:
+                logger.info("Found properties file here: " + str(file["full_path"]))
+                file_path = file["path"]
+                new_microservice, new_properties = parse.parse_yaml_file(file_path)
+                if new_microservice[0]:
+                    microservice = new_microservice
+                if new_properties:
+                    properties = properties.union(new_properties)
 
     return microservice, properties
 
@@ -132,34 +120,14 @@ def detect_microservice(file_path, dfd):
     microservice = [False, False]
     microservices = tech_sw.get_microservices(dfd)
 
+    gradle_path = service_roots.find_build_file(file_path, "build.gradle")
 
-    found_gradle = False
-
-    local_repo_path = tmp.tmp_config["Repository"]["local_path"]
-
-    dirs = list()
-    path = os.path.dirname(file_path)
-    while not found_gradle and path != "":
-        dirs.append(os.scandir(os.path.join(local_repo_path, path)))
-        while dirs:
-            dir = dirs.pop()
-            for entry in dir:
-                if entry.is_file():
-                    if os.path.basename(entry.path).casefold() == "build.gradle":
-                        logger.info("Found build.gradle here: " + str(entry.path))
-                        gradle_path = os.path.relpath(entry.path, start=local_repo_path)
-                        found_gradle = True
-        path = os.path.dirname(path)
-
-    if found_gradle:
+    if gradle_path:
         gradle_file = dict()
         gradle_file["path"] = gradle_path
-        for m in microservices.keys():
-            try:
-                if microservices[m]["gradle_path"] == gradle_path:
-                    microservice[0] = microservices[m]["name"]
-            except:
-                pass
+        services = microservices.find_by("gradle_path", gradle_path)
+        if services:
+            microservice[0] = microservices[services[-1]]["name"]
         if not microservice[0]:
 
             gradle_file["content"] = fi.file_as_lines(gradle_path)
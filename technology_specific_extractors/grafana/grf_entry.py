@@ -1,8 +1,13 @@
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("grf", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services", "model"),
+                      writes=("annotations",), keywords=("grafana/grafana",),
+                      triggers=("grafana/grafana",))
 def detect_grafana(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detects grafana server and connections.
     """
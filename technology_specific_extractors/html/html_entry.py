@@ -1,21 +1,23 @@
-import ast
-
+from core.DFD import CCollection
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 import output_generators.traceability as traceability
-import tmp.tmp as tmp
 
 
+@extractors.extractor("html", arguments=("dfd",), reads=("services", "flows", "model"), writes=("flows",),
+                      keywords=("href",),
+                      triggers=("href",))
 def set_information_flows(dfd):
     """Looks for connections between services via html sites / href's.
     """
 
     microservices = tech_sw.get_microservices(dfd)
 
-    if tmp.tmp_config.has_option("DFD", "information_flows"):
-        information_flows = ast.literal_eval(tmp.tmp_config["DFD"]["information_flows"])
+    if dfd.information_flows is not None:
+        information_flows = dfd.information_flows
     else:
-        information_flows = dict()
+        information_flows = CCollection()
 
     results = fi.search_keywords("href")
     for r in results.keys():
@@ -33,10 +35,7 @@ def set_information_flows(dfd):
                             if address_part == microservices[m]["name"]:
                                 microservice = tech_sw.detect_microservice(results[r]["path"], dfd)
                                 if microservice:
-                                    try:
-                                        id = max(information_flows.keys()) + 1
-                                    except:
-                                        id = 0
+                                    id = information_flows.next_id()
                                     information_flows[id] = dict()
 
                                     information_flows[id]["sender"] = microservice
@@ -52,5 +51,5 @@ def set_information_flows(dfd):
 
                 except:
                     pass
-    tmp.tmp_config.set("DFD", "information_flows", str(information_flows).replace("%", "%%"))
+    dfd.information_flows = information_flows
     return information_flows
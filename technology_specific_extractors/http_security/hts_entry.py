@@ -1,8 +1,14 @@
+import core.extractors as extractors
 import core.file_interaction as fi
+import core.java_index as java_index
 import core.technology_switch as tech_sw
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("hts", arguments=("microservices", "dfd"), returns=("microservices",),
+                      reads=("services", "model"), writes=("annotations",),
+                      keywords=("AuthenticationManagerBuilder", "HttpSecurity"),
+                      triggers=("AuthenticationManagerBuilder", "HttpSecurity"))
 def detect_authentication_scopes(microservices: dict, dfd) -> dict:
     """Detects authentication scopes via HttpSecurity configurations.
     """
@@ -25,9 +31,10 @@ def detect_configurations(dfd):
             microservice = tech_sw.detect_microservice(results[r]["path"], dfd)
             configurations = set()
             objects = list()
-            for line in results[r]["content"]:
-                if "configure(" + c_class in line:
-                    objects.append(line.split(c_class)[1].split(")")[0].strip())
+            for method in java_index.find_methods(results[r]["path"], "configure"):
+                parameter = method["parameters"].split(",")[0].split()
+                if c_class in parameter:
+                    objects.append(parameter[-1])
             for object in objects:
                 if object:
                     for line_nr in range(len(results[r]["content"])):
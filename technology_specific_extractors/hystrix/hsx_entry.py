@@ -1,8 +1,13 @@
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("hsx_dashboard", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services", "model"),
+                      writes=("annotations",), keywords=("@EnableHystrixDashboard",),
+                      triggers=("@EnableHystrixDashboard",))
 def detect_hystrix_dashboard(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detects hystrix monitoring dashboards .
     """
@@ -34,6 +39,10 @@ def detect_hystrix_dashboard(microservices: dict, information_flows: dict, dfd)
     return microservices, information_flows
 
 
+@extractors.extractor("hsx", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services", "model"),
+                      writes=("annotations",), keywords=("@EnableHystrix",),
+                      triggers=("@EnableHystrix",))
 def detect_hystrix_circuit_breakers(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detects HystrixCommand.
     """
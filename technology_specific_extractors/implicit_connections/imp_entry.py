@@ -1,23 +1,24 @@
-import ast
 import os
 
-import yaml
-
+from core.DFD import CCollection
+import core.extractors as extractors
 import core.file_interaction as fi
 from output_generators.logger import logger
 import core.technology_switch as tech_sw
-import tmp.tmp as tmp
+import core.yaml_loader as yaml_loader
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("imp", arguments=("dfd",), reads=("services", "properties", "annotations", "flows", "model"),
+                      writes=("flows",))
 def set_information_flows(dfd) -> dict:
     """Adds connections based on parsed config files.
     """
 
-    if tmp.tmp_config.has_option("DFD", "information_flows"):
-        information_flows = ast.literal_eval(tmp.tmp_config["DFD"]["information_flows"])
+    if dfd.information_flows is not None:
+        information_flows = dfd.information_flows
     else:
-        information_flows = dict()
+        information_flows = CCollection()
 
     microservices = tech_sw.get_microservices(dfd)
 
@@ -25,37 +26,26 @@ def set_information_flows(dfd) -> dict:
     new_information_flows = weavescope(microservices)
     # merge old and new flows
     for ni in new_information_flows.keys():
-        try:
-            id = max(information_flows.keys()) + 1
-        except:
-            id = 0
-        information_flows[id] = new_information_flows[ni]
+        information_flows.add(new_information_flows[ni])
 
     # Zuul
     new_information_flows = zuul(microservices)
     for ni in new_information_flows.keys():
-        try:
-            id = max(information_flows.keys()) + 1
-        except:
-            id = 0
-        information_flows[id] = new_information_flows[ni]
+        information_flows.add(new_information_flows[ni])
 
-    tmp.tmp_config.set("DFD", "information_flows", str(information_flows).replace("%", "%%"))
+    dfd.information_flows = information_flows
     return information_flows
 
 
 def weavescope(microservices):
 
-    new_information_flows = dict()
+    new_information_flows = CCollection()
     if microservices != None:
         for m in microservices.keys():
             if ("Monitoring Dashboard", "Weave Scope") in microservices[m]["tagged_values"]:
                 for mi in microservices.keys():
                     if not microservices[mi]["name"] == microservices[m]["name"]:
-                        try:
-                            id = max(new_information_flows.keys()) + 1
-                        except:
-                            id = 0
+                        id = new_information_flows.next_id()
                         new_information_flows[id] = dict()
 
                         new_information_flows[id]["sender"] = microservices[mi]["name"]
@@ -74,7 +64,7 @@ def weavescope(microservices):
 
 
 def zuul(microservices):
-    new_information_flows = dict()
+    new_information_flows = CCollection()
     for m in microservices.values():
         if ("Gateway", "Zuul") in m["tagged_values"]:
             try:
@@ -108,12 +98,9 @@ def extract_routes_properties(path, service):
                 microservice = str()
                 if "=" in line:
                     microservice = line.split("=")[1].strip()
-                new_information_flows = dict()
+                new_information_flows = CCollection()
                 if microservice:
-                    try:
-                        id = max(new_information_flows.keys()) + 1
-                    except:
-                        id = 0
+                    id = new_information_flows.next_id()
                     new_information_flows[id] = dict()
 
                     new_information_flows[id]["sender"] = service
@@ -127,16 +114,12 @@ def extract_routes_properties(path, service):
 
 def extract_routes_yaml(path, service):
     try:
-        with open(path, 'r') as f:
-            text = f.read()
-        for document in yaml.load(text, Loader=yaml.FullLoader):
+        text = "".join(fi.file_as_lines(path))
+        for document in yaml_loader.load_all(text, path):
             routes = document.get("zuul").get("routes")
 
-            new_information_flows = dict()
-            try:
-                id = max(new_information_flows.keys()) + 1
-            except:
-                id = 0
+            new_information_flows = CCollection()
+            id = new_information_flows.next_id()
             new_information_flows[id] = dict()
 
             new_information_flows[id]["sender"] = service
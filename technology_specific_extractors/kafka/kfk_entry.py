@@ -1,25 +1,29 @@
 import ast
+import copy
 import re
 
-import yaml
-
+from core.DFD import CCollection
+import core.extractors as extractors
 import core.file_interaction as fi
+import core.java_index as java_index
 import core.technology_switch as tech_sw
-import tmp.tmp as tmp
+import core.yaml_loader as yaml_loader
 import output_generators.traceability as traceability
 from output_generators.logger import logger
 
 kafka_server = str()
 
 
+@extractors.extractor("kfk", arguments=("dfd",), reads=("services", "properties", "annotations", "flows", "model"),
+                      writes=("flows",), keywords=("@KafkaListener", "@SendTo", "@StreamListener", "KafkaTemplate"))
 def set_information_flows(dfd) -> set:
     """Connects incoming endpoints, outgoing endpoints, and routings to information flows
     """
 
-    if tmp.tmp_config.has_option("DFD", "information_flows"):
-        information_flows = ast.literal_eval(tmp.tmp_config["DFD"]["information_flows"])
+    if dfd.information_flows is not None:
+        information_flows = dfd.information_flows
     else:
-        information_flows = dict()
+        information_flows = CCollection()
 
 
     microservices = tech_sw.get_microservices(dfd)
@@ -27,19 +31,15 @@ def set_information_flows(dfd) -> set:
     incoming_endpoints = get_incoming_endpoints(dfd)
     outgoing_endpoints = get_outgoing_endpoints(dfd)
 
-    new_information_flows = match_incoming_to_outgoing_endpoints(microservices, incoming_endpoints, outgoing_endpoints)
+    new_information_flows = match_incoming_to_outgoing_endpoints(microservices, incoming_endpoints, outgoing_endpoints, dfd)
 
     # merge old and new flows
     for ni in new_information_flows.keys():
-        try:
-            id = max(information_flows.keys()) + 1
-        except:
-            id = 0
-        information_flows[id] = new_information_flows[ni]
+        information_flows.add(new_information_flows[ni])
 
     information_flows = detect_stream_binders(microservices, information_flows, dfd)
 
-    tmp.tmp_config.set("DFD", "information_flows", str(information_flows).replace("%", "%%"))
+    dfd.information_flows = information_flows
 
     return information_flows
 
@@ -56,9 +56,10 @@ def get_incoming_endpoints(dfd) -> set:
         if "README" in file["name"]:
             pass
         else:
-            for line in range(len(file["content"])):
-                if "@KafkaListener" in file["content"][line] and "topics" in file["content"][line]:
-                    new_listening_topic = file["content"][line].split("topics")[1]
+            for annotation in java_index.find_annotations(file["path"], "KafkaListener"):
+                if annotation["arguments"] and "topics" in annotation["arguments"]:
+                    line = annotation["line"]
+                    new_listening_topic = annotation["arguments"].split("topics")[1]
                     if "," in new_listening_topic:
                         new_listening_topic = new_listening_topic.split(",")[0]
                     new_listening_topic = new_listening_topic.strip().strip("=").strip(")").strip()
@@ -106,37 +107,37 @@ def get_outgoing_endpoints(dfd) -> set:
                     pass
                 else:
                     microservice = tech_sw.detect_microservice(f["path"], dfd)
-                    for line in range(len(f["content"])):
-                        if (template + "." + command) in f["content"][line]:    #found correct (starting) line
-                            topic = str()
-
-                            # look for semicolon indicating end of command -> ´complete_call´ contains whole command
-                            if not ";" in f["content"][line]:
-                                complete_call = f["content"][line]
-                                found_semicolon = False
-                                i = line + 1
-                                while not found_semicolon and i < len(f["content"]):
-                                    if ";" in f["content"][i]:
-                                        found_semicolon = True
-                                    complete_call += f["content"][i]
-                                    i += 1
-                            else:
-                                complete_call = f["content"][line]
-
-                            # extract topic
-                            topic = complete_call.split(command)[1].strip().strip("(").split(",")[0].strip()
-                            topic = fi.find_variable(topic, f)
-
-                            # extract data / asset
-                            asset = extract_asset(complete_call, command)
-                            if asset_is_input(asset, f, line):
-                                asset = "Function input " + asset
-                            else:
-                                asset = fi.find_variable(asset, f)
-
-                            span = re.search(f"{template}.{command}", f["content"][line])
-                            trace = (f["path"], line, span)
-                            outgoing_endpoints.add((topic, microservice, asset, trace))
+                    calls = java_index.find_calls(f["path"], command, template)
+                    for line in dict.fromkeys(call["line"] for call in calls):    #found correct (starting) line
+                        topic = str()
+
+                        # look for semicolon indicating end of command -> ´complete_call´ contains whole command
+                        if not ";" in f["content"][line]:
+                            complete_call = f["content"][line]
+                            found_semicolon = False
+                            i = line + 1
+                            while not found_semicolon and i < len(f["content"]):
+                                if ";" in f["content"][i]:
+                                    found_semicolon = True
+                                complete_call += f["content"][i]
+                                i += 1
+                        else:
+                            complete_call = f["content"][line]
+
+                        # extract topic
+                        topic = complete_call.split(command)[1].strip().strip("(").split(",")[0].strip()
+                        topic = fi.find_variable(topic, f)
+
+                        # extract data / asset
+                        asset = extract_asset(complete_call, command)
+                        if asset_is_input(asset, f, line):
+                            asset = "Function input " + asset
+                        else:
+                            asset = fi.find_variable(asset, f)
+
+                        span = re.search(f"{template}.{command}", f["content"][line])
+                        trace = (f["path"], line, span)
+                        outgoing_endpoints.add((topic, microservice, asset, trace))
 
     return outgoing_endpoints
 
@@ -178,16 +179,16 @@ def asset_is_input(variable: str, file, line_nr: int) -> bool:
     return False
 
 
-def match_incoming_to_outgoing_endpoints(microservices: dict, incoming_endpoints: set, outgoing_endpoints: set) -> dict:
+def match_incoming_to_outgoing_endpoints(microservices: dict, incoming_endpoints: set, outgoing_endpoints: set, dfd) -> dict:
     """Finds information flows by regexing routing keys of outgoing endpoints to queues of incoming endpoints.
     """
     # incoming: (topic, microservice, (file, line, span))
     # outgoing: (topic, microservice, asset, (file, line, span))
 
-    if tmp.tmp_config.has_option("DFD", "information_flows"):
-        information_flows = ast.literal_eval(tmp.tmp_config["DFD"]["information_flows"])
+    if dfd.information_flows is not None:
+        information_flows = copy.deepcopy(dfd.information_flows)   # the caller merges the returned flows into the model
     else:
-        information_flows = dict()
+        information_flows = CCollection()
 
     kafka_server = False
     for id in microservices.keys():
@@ -196,10 +197,7 @@ def match_incoming_to_outgoing_endpoints(microservices: dict, incoming_endpoints
 
     if kafka_server:
         for i in incoming_endpoints:
-            try:
-                id = max(information_flows.keys()) + 1
-            except:
-                id = 0
+            id = information_flows.next_id()
             information_flows[id] = dict()
 
             information_flows[id]["sender"] = kafka_server
@@ -226,10 +224,7 @@ def match_incoming_to_outgoing_endpoints(microservices: dict, incoming_endpoints
             traceability.add_trace(trace)
 
         for o in outgoing_endpoints:
-            try:
-                id = max(information_flows.keys()) + 1
-            except:
-                id = 0
+            id = information_flows.next_id()
             information_flows[id] = dict()
 
             information_flows[id]["sender"] = o[1]
@@ -279,10 +274,7 @@ def match_incoming_to_outgoing_endpoints(microservices: dict, incoming_endpoints
 
         # turn it into a dictionary
         for i in information_flows_set:
-            try:
-                id = max(information_flows.keys()) + 1
-            except:
-                id = 0
+            id = information_flows.next_id()
             information_flows[id] = dict()
 
             information_flows[id]["sender"] = i[0]
@@ -323,7 +315,7 @@ def detect_kafka_server(microservices: dict) -> dict:
         raw_files = fi.get_file_as_yaml("docker-compose*")
     if len(raw_files) == 0:
         return microservices
-    file = yaml.load(raw_files[0]["content"], Loader = yaml.FullLoader)
+    file = yaml_loader.load(raw_files[0]["content"], raw_files[0]["path"])
 
     if "services" in file:
         for s in file.get("services"):
@@ -406,10 +398,7 @@ def detect_stream_binders(microservices: dict, information_flows: dict, dfd) ->
             results = fi.search_keywords("@SendTo")
             for r in results.keys():
                 if tech_sw.detect_microservice(results[r]["path"], dfd) == microservices[m]["name"]:
-                    try:
-                        id = max(information_flows.keys()) + 1
-                    except:
-                        id = 0
+                    id = information_flows.next_id()
                     information_flows[id] = dict()
 
                     information_flows[id]["sender"] = microservices[m]["name"]
@@ -441,10 +430,7 @@ def detect_stream_binders(microservices: dict, information_flows: dict, dfd) ->
             for r in results.keys():
                 if tech_sw.detect_microservice(results[r]["path"], dfd) == microservices[m]["name"]:
 
-                    try:
-                        id = max(information_flows.keys()) + 1
-                    except:
-                        id = 0
+                    id = information_flows.next_id()
                     information_flows[id] = dict()
 
                     information_flows[id]["sender"] = kafka_server
@@ -1,5 +1,8 @@
+import core.extractors as extractors
 import output_generators.traceability as traceability
 
+@extractors.extractor("kib", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services",), writes=("annotations",))
 def detect_kibana(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detects logstash services.
     """
@@ -1,8 +1,13 @@
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("lob", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services", "flows", "model"),
+                      writes=("annotations", "flows"), keywords=("@LoadBalanced",),
+                      triggers=("@LoadBalanced",))
 def detect_load_balancers(microservices: dict, information_flows: dict, dfd) -> dict:
     """Find load balancers.
     """
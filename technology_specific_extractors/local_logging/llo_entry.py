@@ -1,8 +1,13 @@
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("llo", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services", "model"),
+                      writes=("annotations",), keywords=("LoggerFactory", "Slf4j", "Log", "Log4j2", "CommonsLog"),
+                      triggers=("LoggerFactory", "Slf4j", "Log", "Log4j2", "CommonsLog"))
 def detect_local_logging(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detects if a service performs local logging.
     """
@@ -1,6 +1,10 @@
+import core.extractors as extractors
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("log", arguments=("microservices", "information_flows", "external_components", "dfd"),
+                      returns=("microservices", "information_flows", "external_components"),
+                      reads=("services", "properties", "annotations"), writes=("annotations", "flows", "components"))
 def detect_logstash(microservices: dict, information_flows: dict, external_components: dict, dfd) -> dict:
     """Detects logstash services.
     """
@@ -65,10 +69,7 @@ def detect_logstash(microservices: dict, information_flows: dict, external_compo
                             # external
                             if not logstash:
                                 logstash_port = int(logstash_server.split(":")[1].strip().strip(""))
-                                try:
-                                    id = max(external_components.keys()) + 1
-                                except:
-                                    id = 0
+                                id = external_components.next_id()
                                 external_components[id] = dict()
                                 external_components[id]["name"] = "logstash"
                                 external_components[id]["type"] = "external_component"
@@ -82,10 +83,7 @@ def detect_logstash(microservices: dict, information_flows: dict, external_compo
                                 trace["span"] = trace_info[2]
                                 traceability.add_trace(trace)
 
-                                try:
-                                    id = max(information_flows.keys()) + 1
-                                except:
-                                    id = 0
+                                id = information_flows.next_id()
                                 information_flows[id] = dict()
                                 information_flows[id]["sender"] = microservices[m]["name"]
                                 information_flows[id]["receiver"] = "logstash"
@@ -116,10 +114,7 @@ def detect_logstash(microservices: dict, information_flows: dict, external_compo
             if ("Search Engine", "Elasticsearch") in microservices[m]["tagged_values"]:
                 elasticsearch = microservices[m]["name"]
         if elasticsearch:
-            try:
-                id = max(information_flows.keys()) + 1
-            except:
-                id = 0
+            id = information_flows.next_id()
             information_flows[id] = dict()
             information_flows[id]["sender"] = logstash
             information_flows[id]["receiver"] = elasticsearch
@@ -138,10 +133,7 @@ def detect_logstash(microservices: dict, information_flows: dict, external_compo
             for prop in microservices[m]["properties"]:
                 if prop[0] == "logstash_server":
                     if logstash in prop[1]:
-                        try:
-                            id = max(information_flows.keys()) + 1
-                        except:
-                            id = 0
+                        id = information_flows.next_id()
                         information_flows[id] = dict()
                         information_flows[id]["sender"] = microservices[m]["name"]
                         information_flows[id]["receiver"] = logstash
@@ -0,0 +1,125 @@
+"""Reactor graph of the repository's Maven projects.
+Every pom.xml of the corpus is parsed once (the facts are kept in the fact cache per content) and entered into a graph
+keyed by the pom's path, in which the <modules> of aggregators are resolved to the poms of their modules. All Maven
+lookups of the extraction query this graph. It is built on first use and kept until the corpus is reset.
+"""
+
+import os
+
+import core.corpus as corpus
+import core.fact_cache as fact_cache
+import tmp.tmp as tmp
+
+try:
+    from lxml import etree
+    XML_BACKEND = "LXML"
+except ImportError:
+    import xml.etree.ElementTree as etree
+    XML_BACKEND = "PYTHON"
+NAMESPACE = {"mvn": "http://maven.apache.org/POM/4.0.0"}
+
+
+# pom path -> {"path", "name", "name_line", "dependencies", "module_names", "modules": [pom paths], "parent": pom path
+# of the aggregator listing it or None, "configuration": servicename and properties once resolved or None}
+projects = None
+
+
+def reset():
+    """Drops the graph. Has to be called together with corpus.reset().
+    """
+
+    global projects
+
+    projects = None
+
+
+def build():
+    """Parses all poms of the corpus, in walk order, and links aggregators with their modules.
+    """
+
+    global projects
+
+    projects = dict()
+    for file in corpus.find_files("pom.xml"):
+        if corpus.get_lines(file) is not False:
+            projects[file["path"]] = create_project(file["path"])
+
+    for path, project in projects.items():
+        for module in sorted(project["module_names"]):
+            module_path = os.path.normpath(os.path.join(os.path.dirname(path), module))
+            if not module_path.endswith(".xml"):
+                module_path = os.path.join(module_path, "pom.xml")
+            if module_path in projects and module_path != path:
+                project["modules"].append(module_path)
+                if projects[module_path]["parent"] is None:
+                    projects[module_path]["parent"] = path
+
+
+def create_project(path: str) -> dict:
+    """Creates the project of a pom, not yet linked to others.
+    """
+
+    pom = parse_pom_file(path)
+    return {
+        "path": path,
+        "name": pom["name"],
+        "name_line": pom["name_line"],
+        "dependencies": pom["dependencies"],
+        "module_names": pom["modules"],
+        "modules": list(),
+        "parent": None,
+        "configuration": None,
+    }
+
+
+def get_projects() -> dict:
+    """Returns all projects, keyed by the path of their pom.
+    """
+
+    if projects is None:
+        build()
+    return projects
+
+
+def get_project(pom_path: str):
+    """Returns the project of a pom (path relative to the repository or absolute). Poms that aren't named pom.xml are
+    added on first lookup, without links to other projects.
+    """
+
+    path = corpus.relative_path(pom_path)
+    if path not in get_projects():
+        projects[path] = create_project(path)
+    return projects[path]
+
+
+@fact_cache.cached("pom")
+def parse_pom_file(pom_path: str) -> dict:
+    """Parses a pom.xml and returns the facts the extraction needs: modules, dependencies' artifactIds, and the
+    module's name (<finalName> if existing, else <artifactId>) with its line index.
+    """
+
+    tree = etree.parse(os.path.join(tmp.tmp_config.get("Repository", "local_path"), pom_path))
+    root = tree.getroot()
+
+    pom = {"modules": set(), "dependencies": list(), "name": None, "name_line": None}
+
+    modules = root.find('mvn:modules', NAMESPACE)
+    if modules is not None:
+        pom["modules"] = {module.text.strip() for module in modules.findall('mvn:module', NAMESPACE)}
+
+    dependencies = root.find('mvn:dependencies', NAMESPACE)
+    if dependencies is not None:
+        for dependency in dependencies.findall('mvn:dependency', NAMESPACE):
+            artifactId = dependency.find('mvn:artifactId', NAMESPACE)
+            if artifactId is not None and artifactId.text:
+                pom["dependencies"].append(artifactId.text.strip())
+
+    artifactId = root.find('mvn:build/mvn:finalName', NAMESPACE)
+    if artifactId is None:
+        artifactId = root.find('mvn:artifactId', NAMESPACE)
+    if artifactId is not None and artifactId.text:
+        pom["name"] = artifactId.text.strip()
+        if XML_BACKEND == "LXML":
+            pom["name_line"] = artifactId.sourceline - 1
+
+    return pom
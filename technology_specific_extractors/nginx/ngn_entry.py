@@ -1,59 +1,19 @@
-import ruamel.yaml
 import os
 
 import core.external_components as ext
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
+import core.yaml_loader as yaml_loader
 import tmp.tmp as tmp
 import output_generators.traceability as traceability
 
 
-# The following is taken from ruamel.yaml's authro as a workaround for getting line count for str objects
-# https://stackoverflow.com/questions/45716281/parsing-yaml-get-line-numbers-even-in-ordered-maps/45717104#45717104
-class Str(ruamel.yaml.scalarstring.ScalarString):
-    __slots__ = ('lc')
-
-    style = ""
-
-    def __new__(cls, value):
-        return ruamel.yaml.scalarstring.ScalarString.__new__(cls, value)
-
-class MyPreservedScalarString(ruamel.yaml.scalarstring.PreservedScalarString):
-    __slots__ = ('lc')
-
-class MyDoubleQuotedScalarString(ruamel.yaml.scalarstring.DoubleQuotedScalarString):
-    __slots__ = ('lc')
-
-class MySingleQuotedScalarString(ruamel.yaml.scalarstring.SingleQuotedScalarString):
-    __slots__ = ('lc')
-
-class MyConstructor(ruamel.yaml.constructor.RoundTripConstructor):
-    def construct_scalar(self, node):
-
-        if not isinstance(node, ruamel.yaml.nodes.ScalarNode):
-            raise ruamel.yaml.constructor.ConstructorError(
-                None, None,
-                "expected a scalar node, but found %s" % node.id,
-                node.start_mark)
-
-        if node.style == '|' and isinstance(node.value, ruamel.yaml.compat.text_type):
-            ret_val = MyPreservedScalarString(node.value)
-        elif bool(self._preserve_quotes) and isinstance(node.value, ruamel.yaml.compat.text_type):
-            if node.style == "'":
-                ret_val = MySingleQuotedScalarString(node.value)
-            elif node.style == '"':
-                ret_val = MyDoubleQuotedScalarString(node.value)
-            else:
-                ret_val = Str(node.value)
-        else:
-            ret_val = Str(node.value)
-        ret_val.lc = ruamel.yaml.comments.LineCol()
-        ret_val.lc.line = node.start_mark.line
-        ret_val.lc.col = node.start_mark.column
-        return ret_val
-# end of external code
-
-
+@extractors.extractor("ngn", arguments=("microservices", "information_flows", "external_components", "dfd"),
+                      returns=("microservices", "information_flows", "external_components"),
+                      reads=("services", "annotations", "flows", "components", "model"),
+                      writes=("services", "annotations", "flows", "components"), keywords=("FROM nginx:",),
+                      files=("docker-compose*", "*.conf"))
 def detect_nginx(microservices: dict, information_flows: dict, external_components: dict, dfd) -> dict:
     """Detects nginx web applications.
     """
@@ -95,10 +55,7 @@ def detect_nginx(microservices: dict, information_flows: dict, external_componen
                             microservices[m]["tagged_values"] = [("Web Application", "Nginx")]
 
             else:
-                try:
-                    id = max(microservices.keys()) + 1
-                except:
-                    id = 0
+                id = microservices.next_id()
                 microservices[id] = dict()
 
                 local_repo_path = tmp.tmp_config["Repository"]["local_path"]
@@ -116,10 +73,7 @@ def detect_nginx(microservices: dict, information_flows: dict, external_componen
                     raw_files = fi.get_file_as_yaml("docker-compose*")
                 docker_compose_content = raw_files[0]["content"]
 
-                yaml = ruamel.yaml.YAML()
-                yaml.Constructor = MyConstructor
-
-                file = yaml.load(docker_compose_content)
+                file = yaml_loader.load(docker_compose_content, raw_files[0]["path"])
                 if "services" in file.keys():
                     for s in file.get("services"):
                         image = False
@@ -232,36 +186,28 @@ def detect_nginx(microservices: dict, information_flows: dict, external_componen
                                 if "stereotype_instances" in microservices[mi] and "service_discovery" in microservices[mi]["stereotype_instances"]:
                                     discovery_server = microservices[mi]["name"]
                             if discovery_server:
-                                for i in information_flows:
-                                    if information_flows[i]["sender"] == gateway and information_flows[i]["receiver"] == discovery_server:
-                                        information_flows[i]["sender"] = discovery_server
-                                        information_flows[i]["receiver"] = gateway
+                                for i in information_flows.find_flows(gateway, discovery_server):
+                                    information_flows.set_flow_ends(i, discovery_server, gateway)
                     else:
                         microservices[m]["stereotype_instances"] = ["gateway"]
 
             # Set connection between web app and gateway
-            try:
-                id = max(information_flows.keys()) + 1
-            except:
-                id = 0
+            id = information_flows.next_id()
             information_flows[id] = dict()
             information_flows[id]["sender"] = web_app
             information_flows[id]["receiver"] = gateway
             information_flows[id]["stereotype_instances"] = ["restful_http"]
 
             # Check if user exists
-            user_exists = False
-            for e in external_components.keys():
-                if external_components[e]["name"] == "user":
-                    user_exists = True
+            user_exists = bool(external_components.find_by_name("user"))
 
             if user_exists:
                 # Divert flows between gateway and user
                 for i in information_flows.keys():
                     if information_flows[i]["sender"] == gateway and information_flows[i]["receiver"] == "user":
-                        information_flows[i]["sender"] = web_app
+                        information_flows.set_flow_ends(i, web_app, "user")
                     elif information_flows[i]["sender"] == "user" and information_flows[i]["receiver"] == gateway:
-                        information_flows[i]["receiver"] = web_app
+                        information_flows.set_flow_ends(i, "user", web_app)
 
                     trace = dict()
                     trace["item"] = web_app + " -> user"
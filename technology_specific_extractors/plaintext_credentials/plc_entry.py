@@ -1,8 +1,9 @@
-
+import core.extractors as extractors
 import output_generators.traceability as traceability
-import technology_specific_extractors.environment_variables as env
 
 
+@extractors.extractor("plc", arguments=("microservices",), returns=("microservices",),
+                      reads=("services", "properties", "annotations"), writes=("annotations",))
 def set_plaintext_credentials(microservices: dict) -> dict:
     """Goes through properties and sets stereotype and tagged values, if plaintext credentials are found.
     """
@@ -15,34 +16,34 @@ def set_plaintext_credentials(microservices: dict) -> dict:
                 if prop[0] == "datasource_password" and "database" in microservices[m]["stereotype_instances"]:
                     plaintext_credentials = True
                     trace_info = (prop[2][0], prop[2][1], prop[2][2])
-                    password = env.resolve_env_var(prop[1])
+                    password = prop[1]
                     tagged_values.add(("Password", password))
                 elif prop[0] == "datasource_username" and "database" in microservices[m]["stereotype_instances"]:
                     plaintext_credentials = True
                     trace_info = (prop[2][0], prop[2][1], prop[2][2])
-                    username = env.resolve_env_var(prop[1])
+                    username = prop[1]
                     tagged_values.add(("Username", username))
 
                 elif prop[0] == "mail_password" and "mail_server" in microservices[m]["stereotype_instances"]:
                     plaintext_credentials = True
                     trace_info = (prop[2][0], prop[2][1], prop[2][2])
-                    password = env.resolve_env_var(prop[1])
+                    password = prop[1]
                     tagged_values.add(("Password", password))
                 elif prop[0] == "mail_username" and "mail_server" in microservices[m]["stereotype_instances"]:
                     plaintext_credentials = True
                     trace_info = (prop[2][0], prop[2][1], prop[2][2])
-                    username = env.resolve_env_var(prop[1])
+                    username = prop[1]
                     tagged_values.add(("Username", username))
 
                 elif prop[0] == "config_password" and "configuration_server" in microservices[m]["stereotype_instances"]:
                     plaintext_credentials = True
                     trace_info = (prop[2][0], prop[2][1], prop[2][2])
-                    password = env.resolve_env_var(prop[1])
+                    password = prop[1]
                     tagged_values.add(("Password", password))
                 elif prop[0] == "config_username" and "configuration_server" in microservices[m]["stereotype_instances"]:
                     plaintext_credentials = True
                     trace_info = (prop[2][0], prop[2][1], prop[2][2])
-                    username = env.resolve_env_var(prop[1])
+                    username = prop[1]
                     tagged_values.add(("Username", username))
 
         if plaintext_credentials:
@@ -1,11 +1,16 @@
 import os
 
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 import tmp.tmp as tmp
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("prm", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services", "annotations", "model"),
+                      writes=("services", "annotations", "flows"), keywords=("prom/prometheus",),
+                      triggers=("prom/prometheus",))
 def detect_prometheus_server(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detects prometheus server and adds information flows.
     """
@@ -40,10 +45,7 @@ def detect_server_docker(microservices: dict, information_flows: dict, dfd) -> d
         if not found:
             prometheus_server = "prometheus_server"
             # add service
-            try:
-                id = max(microservices.keys()) + 1
-            except:
-                id = 0
+            id = microservices.next_id()
             microservices[id] = dict()
             microservices[id]["name"] = "prometheus_server"
             microservices[id]["image"] = results[r]["path"]
@@ -100,10 +102,7 @@ def detect_connections(microservices: dict, information_flows: dict, dockerfile,
                                     if microservices[m]["name"] == part:
                                         target_service = microservices[m]["name"]
                     if target_service:
-                        try:
-                            id = max(information_flows.keys()) + 1
-                        except:
-                            id = 0
+                        id = information_flows.next_id()
                         information_flows[id] = dict()
                         information_flows[id]["sender"] = target_service
                         information_flows[id]["receiver"] = prometheus_server
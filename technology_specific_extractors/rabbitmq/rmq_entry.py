@@ -1,26 +1,28 @@
-import ast
+import copy
 import re
 
-import yaml
-
+from core.DFD import CCollection
+import core.extractors as extractors
 import core.file_interaction as fi
+import core.java_index as java_index
 import core.technology_switch as tech_sw
-import tmp.tmp as tmp
+import core.yaml_loader as yaml_loader
 import output_generators.traceability as traceability
 from output_generators.logger import logger
 
 
+@extractors.extractor("rmq", arguments=("dfd",), reads=("services", "properties", "annotations", "flows", "model"),
+                      writes=("annotations", "flows"),
+                      keywords=("RabbitTemplate", "@RabbitListener", "@RabbitListenerConfigurer"),
+                      triggers=("RabbitTemplate",))
 def set_information_flows(dfd) -> set:
     """Connects incoming endpoints, outgoing endpoints, and routings to information flows
     """
 
-    if not used_in_application():
-        return
-
-    if tmp.tmp_config.has_option("DFD", "information_flows"):
-        information_flows = ast.literal_eval(tmp.tmp_config["DFD"]["information_flows"])
+    if dfd.information_flows is not None:
+        information_flows = dfd.information_flows
     else:
-        information_flows = dict()
+        information_flows = CCollection()
 
     new_information_flows = dict()
 
@@ -31,22 +33,12 @@ def set_information_flows(dfd) -> set:
 
     # merge old and new flows
     for ni in new_information_flows.keys():
-        try:
-            id = max(information_flows.keys()) + 1
-        except:
-            id = 0
-        information_flows[id] = new_information_flows[ni]
+        information_flows.add(new_information_flows[ni])
 
-    tmp.tmp_config.set("DFD", "information_flows", str(information_flows).replace("%", "%%"))
+    dfd.information_flows = information_flows
     return information_flows
 
 
-def used_in_application():
-    if len(fi.search_keywords("RabbitTemplate")) > 0:
-        return True
-    return False
-
-
 def get_routings() -> set:
     """Finds routings defined via RabbitListenerConfigurer
     """
@@ -80,11 +72,11 @@ def get_incoming_endpoints(dfd) -> set:
             pass
         else:
             microservice = tech_sw.detect_microservice(f["path"], dfd)
-            for line in range(len(f["content"])):
-                l = f["content"][line]
-                if "@RabbitListener" in l and "queues" in l and "=" in l:
-                    
-                    new_incoming_queue = f["content"][line].split("queues")[1].split("=")[1].strip().strip(")")
+            for annotation in java_index.find_annotations(f["path"], "RabbitListener"):
+                arguments = annotation["arguments"]
+                if arguments and "queues" in arguments and "=" in arguments.split("queues")[1]:
+                    line = annotation["line"]
+                    new_incoming_queue = arguments.split("queues")[1].split("=")[1].strip().strip(")")
                     new_incoming_queue = fi.find_variable(new_incoming_queue, f)
 
                     span = re.search("@RabbitListener", f["content"][line])
@@ -109,42 +101,42 @@ def get_outgoing_endpoints(routings: set, dfd) -> set:
                     pass
                 else:
                     microservice = tech_sw.detect_microservice(f["path"], dfd)
-                    for line in range(len(f["content"])):
-                        if ("rabbitTemplate." + command) in f["content"][line]: #found correct (starting) line
-                            exchange = None
-                            routingKey = None
-                            if not ";" in f["content"][line]:   # i.e., multi-line command -> search for next line with a semicolon
-                                complete_command = f["content"][line]
-                                found_semicolon = False
-                                i = line + 1
-                                while not found_semicolon and i < len(f["content"]):
-                                    if ";" in f["content"][i]:
-                                        found_semicolon = True
-                                    complete_command += f["content"][i]
-                                    i += 1
-                            else:
-                                complete_command = f["content"][line]
-                            parameters = "".join(complete_command.split(command)[1]).split(",")
-                            for p in range(len(parameters)): #strip and find correct variables
-                                parameters[p] = parameters[p].strip().strip(";").strip().strip(")").strip().strip("(").strip()
-                                parameters[p] = fi.find_variable(parameters[p], f)
-                            found = False
-                            i = 0
-                            while found == False and i < len(parameters):
-                                for r in routings:
-                                    if r[0] in parameters[i] or parameters[i] in r[0]:
-                                        try:
-                                            exchange = parameters[i]
-                                            routingKey = parameters[i + 1]
-                                        except:
-                                            print("Could not extract exchange and routing key from sending-statement")
-                                        found = True
+                    calls = java_index.find_calls(f["path"], command, template)
+                    for line in dict.fromkeys(call["line"] for call in calls): #found correct (starting) line
+                        exchange = None
+                        routingKey = None
+                        if not ";" in f["content"][line]:   # i.e., multi-line command -> search for next line with a semicolon
+                            complete_command = f["content"][line]
+                            found_semicolon = False
+                            i = line + 1
+                            while not found_semicolon and i < len(f["content"]):
+                                if ";" in f["content"][i]:
+                                    found_semicolon = True
+                                complete_command += f["content"][i]
                                 i += 1
-
-                            span = re.search("rabbitTemplate." + command, f["content"][line])
-                            trace = (f["name"], line, span)
-
-                            outgoing_endpoints.add((exchange, routingKey, microservice, trace))
+                        else:
+                            complete_command = f["content"][line]
+                        parameters = "".join(complete_command.split(command)[1]).split(",")
+                        for p in range(len(parameters)): #strip and find correct variables
+                            parameters[p] = parameters[p].strip().strip(";").strip().strip(")").strip().strip("(").strip()
+                            parameters[p] = fi.find_variable(parameters[p], f)
+                        found = False
+                        i = 0
+                        while found == False and i < len(parameters):
+                            for r in routings:
+                                if r[0] in parameters[i] or parameters[i] in r[0]:
+                                    try:
+                                        exchange = parameters[i]
+                                        routingKey = parameters[i + 1]
+                                    except:
+                                        print("Could not extract exchange and routing key from sending-statement")
+                                    found = True
+                            i += 1
+
+                        span = re.search(f"{template}.{command}", f["content"][line])
+                        trace = (f["name"], line, span)
+
+                        outgoing_endpoints.add((exchange, routingKey, microservice, trace))
     return outgoing_endpoints
 
 
@@ -155,10 +147,10 @@ def match_incoming_to_outgoing_endpoints(incoming_endpoints: set, outgoing_endpo
     # outgoing: (exchange, routingkey, microservice, (file, line, span))
     # incoming: (queue, microservice, (file, line, span))
 
-    if tmp.tmp_config.has_option("DFD", "information_flows"):
-        information_flows = ast.literal_eval(tmp.tmp_config["DFD"]["information_flows"])
+    if dfd.information_flows is not None:
+        information_flows = copy.deepcopy(dfd.information_flows)   # the caller merges the returned flows into the model
     else:
-        information_flows = dict()
+        information_flows = CCollection()
 
     microservices = tech_sw.get_microservices(dfd)
     rabbit_server = False
@@ -169,10 +161,7 @@ def match_incoming_to_outgoing_endpoints(incoming_endpoints: set, outgoing_endpo
 
     if rabbit_server:
         for i in incoming_endpoints:
-            try:
-                id = max(information_flows.keys()) + 1
-            except:
-                id = 0
+            id = information_flows.next_id()
             information_flows[id] = dict()
 
             information_flows[id]["sender"] = rabbit_server
@@ -232,10 +221,7 @@ def match_incoming_to_outgoing_endpoints(incoming_endpoints: set, outgoing_endpo
                                 else:
                                     microservices[rabbit_id]["tagged_values"] = [("Password", password)]
 
-            try:
-                id = max(information_flows.keys()) + 1
-            except:
-                id = 0
+            id = information_flows.next_id()
             information_flows[id] = dict()
 
             information_flows[id]["sender"] = o[2]
@@ -267,7 +253,7 @@ def match_incoming_to_outgoing_endpoints(incoming_endpoints: set, outgoing_endpo
 
     else:
         information_flows_set = set()
-        information_flows = dict()
+        information_flows = CCollection()
         for o in outgoing_endpoints:
             try:
                 regex = re.compile(o[1])
@@ -278,7 +264,7 @@ def match_incoming_to_outgoing_endpoints(incoming_endpoints: set, outgoing_endpo
                 logger.info(f"Error in regex compiling {o[1]}: {e}")
         
         for i in information_flows_set:
-            id_ = max(information_flows.keys(), default=-1) + 1
+            id_ = information_flows.next_id()
             information_flows[id_] = dict()
             information_flows[id_]["sender"] = i[0]
             information_flows[id_]["receiver"] = i[1]
@@ -304,7 +290,7 @@ def match_incoming_to_outgoing_endpoints(incoming_endpoints: set, outgoing_endpo
 
             traceability.add_trace(trace)
 
-    tmp.tmp_config.set("DFD", "microservices", str(microservices).replace("%", "%%"))
+    dfd.microservices = microservices
     return information_flows
 
 
@@ -319,7 +305,7 @@ def detect_rabbitmq_server(microservices: dict) -> dict:
         raw_files = fi.get_file_as_yaml("docker-compose*")
     if len(raw_files) == 0:
         return microservices
-    file = yaml.load(raw_files[0]["content"], Loader = yaml.FullLoader)
+    file = yaml_loader.load(raw_files[0]["content"], raw_files[0]["path"])
 
     if "services" in file.keys():
         for s in file.get("services"):
@@ -1,7 +1,11 @@
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 
 
+@extractors.extractor("rrr", arguments=("microservices", "dfd"), returns=("microservices",),
+                      reads=("services", "model"), writes=("annotations",), keywords=("@RepositoryRestResource",),
+                      triggers=("@RepositoryRestResource",))
 def detect_endpoints(microservices: dict, dfd) -> dict:
     """Detects endpoints offered via @RepositoryRestResource
     """
@@ -1,23 +1,26 @@
-import ast
-
+from core.DFD import CCollection
+import core.corpus as corpus
+import core.extractors as extractors
 import core.file_interaction as fi
+import core.java_index as java_index
+import core.symbol_table as symbol_table
 import core.technology_switch as tech_sw
 from output_generators.logger import logger
 import output_generators.traceability as traceability
-import tmp.tmp as tmp
 
 
+@extractors.extractor("rst", arguments=("dfd",), reads=("services", "properties", "flows", "model"),
+                      writes=("annotations", "flows"),
+                      keywords=("RestTemplate", "RequestMapping", "restTemplate.exchange", "restTemplate.getForObject"),
+                      triggers=("RestTemplate",))
 def set_information_flows(dfd) -> dict:
     """Goes through outgoing endpoints and matches them against incoming ones.
     """
 
-    if not used_in_application():
-        return
-
-    if tmp.tmp_config.has_option("DFD", "information_flows"):
-        information_flows = ast.literal_eval(tmp.tmp_config["DFD"]["information_flows"])
+    if dfd.information_flows is not None:
+        information_flows = dfd.information_flows
     else:
-        information_flows = dict()
+        information_flows = CCollection()
 
     incoming_endpoints = get_incoming_endpoints(dfd)
     add_endpoints_tagged_values(incoming_endpoints, dfd)
@@ -25,22 +28,12 @@ def set_information_flows(dfd) -> dict:
     new_information_flows = match_incoming_to_outgoing_endpoints(incoming_endpoints, outgoing_endpoints, dfd)
 
     for ni in new_information_flows.keys():
-        try:
-            id = max(information_flows.keys()) + 1
-        except:
-            id = 0
-        information_flows[id] = new_information_flows[ni]
+        information_flows.add(new_information_flows[ni])
 
-    tmp.tmp_config.set("DFD", "information_flows", str(information_flows).replace("%", "%%"))
+    dfd.information_flows = information_flows
     return information_flows
 
 
-def used_in_application():
-    if len(fi.search_keywords("RestTemplate")) > 0:
-        return True
-    return False
-
-
 def get_incoming_endpoints(dfd) -> list:
     """Returns incoming API-endpoints of a repository using RestTemplate. Detection based on keywords '@[Request, Post, Get, Patch, Delete, Put]Mapping'
     """
@@ -56,42 +49,34 @@ def get_incoming_endpoints(dfd) -> list:
         else:
             service = tech_sw.detect_microservice(f["path"], dfd)
 
-            bracket_count = 0               # variable for number of curly brackets to detect nested @RequestMappings
             current_parts = []              # list of "parts" of the path (e.g. /a/b/c -> ["a", "b", "c"])
             last_bc = -1                    # var to compare against last added endpoint
 
-            for l in range(len(f["content"])):
-                line = f["content"][l]
-                mappings = ["RequestMapping", "GetMapping", "PostMapping", "PutMapping", "DeleteMapping", "PatchMapping"]
-                mapping_in_line = False
-                for m in mappings:
-                    if m in line:
-                        mapping_in_line = True
-                        method = m.split("Mapping")[0]
-                if mapping_in_line and not "import" in line:
-                    endpoint_part = extract_endpoint_part(line)
+            mappings = ["RequestMapping", "GetMapping", "PostMapping", "PutMapping", "DeleteMapping", "PatchMapping"]
+            for annotation in java_index.find_annotations(f["path"], mappings):
+                bracket_count = annotation["depth"]     # number of curly brackets, to detect nested @RequestMappings
+                method = annotation["name"].split("Mapping")[0]
+                endpoint_part = extract_endpoint_part(annotation["arguments"] or "")
 
                 # manages the list of path-parts
-                    if bracket_count > last_bc:
-                        current_parts.append(endpoint_part)
-                    elif bracket_count == last_bc:
-                        current_parts = current_parts[:-1]
-                        current_parts.append(endpoint_part)
-                    elif bracket_count < last_bc:
-                        dif = last_bc - bracket_count
-                        current_parts = current_parts[:-dif]
-                        current_parts.append(endpoint_part)
+                if bracket_count > last_bc:
+                    current_parts.append(endpoint_part)
+                elif bracket_count == last_bc:
+                    current_parts = current_parts[:-1]
+                    current_parts.append(endpoint_part)
+                elif bracket_count < last_bc:
+                    dif = last_bc - bracket_count
+                    current_parts = current_parts[:-dif]
+                    current_parts.append(endpoint_part)
 
                 # adds new endpoint
-                    complete_endpoint = "/" + ("".join(current_parts).strip("/"))
-                    if not complete_endpoint in [a for (a, b, c, d, e, f) in endpoints if b == service]:
-                        endpoints.add((complete_endpoint, service, method, files[file]["path"], files[file]["line_nr"], files[file]["span"]))
-
-                    last_bc = bracket_count
+                complete_endpoint = "/" + ("".join(current_parts).strip("/"))
+                if not complete_endpoint in [a for (a, b, c, d, e, f) in endpoints if b == service]:
+                    endpoints.add((complete_endpoint, service, method, files[file]["path"], files[file]["line_nr"], files[file]["span"]))
 
-                bracket_count = adjust_bracket_count(bracket_count, line)
+                last_bc = bracket_count
 
-    tmp.tmp_config.set("DFD", "endpoints", str(endpoints))
+    dfd.endpoints = endpoints
     return endpoints
 
 
@@ -106,15 +91,6 @@ def extract_endpoint_part(line: str) -> str:
     return endpoint_part
 
 
-def adjust_bracket_count(bracket_count: int, line: str) -> int:
-    """Helper function keeping track of number of opened brackets.
-    """
-
-    bracket_count += line.count("{")
-    bracket_count -= line.count("}")
-    return bracket_count
-
-
 def add_endpoints_tagged_values(endpoint_tuples: list, dfd):
     """Adds tagged values containing the endpoitns to the microservices.
     """
@@ -135,7 +111,7 @@ def add_endpoints_tagged_values(endpoint_tuples: list, dfd):
                     microservices[m]["tagged_values"].append(('Endpoints', list(ordered_endpoints[endpoint])))
                 else:
                     microservices[m]["tagged_values"] = [('Endpoints', list(ordered_endpoints[endpoint]))]
-    tmp.tmp_config.set("DFD", "microservices", str(microservices).replace("%", "%%"))
+    dfd.microservices = microservices
 
 
 def get_outgoing_endpoints(information_flows: dict, dfd) -> set:
@@ -158,7 +134,9 @@ def get_outgoing_endpoints(information_flows: dict, dfd) -> set:
             if "README" in f["name"] or "test" in f["path"].casefold():
                 continue
             microservice = tech_sw.detect_microservice(f["path"], dfd)
-            for line in range(len(f["content"])):
+            qualifier, method = command.split(".")
+            calls = java_index.find_calls(f["path"], method, qualifier)
+            for line in dict.fromkeys(call["line"] for call in calls):
                 if command in f["content"][line]:
                     func_inp = f["content"][line].split(command)[1]
                     if "," in func_inp:
@@ -189,10 +167,7 @@ def find_rst_variable(parameter: str, file: dict, line_nr: int, information_flow
     microservices = tech_sw.get_microservices(dfd)
     for m in microservices.keys():
         if microservices[m]["name"] in parameter:
-            try:
-                id = max(information_flows.keys()) + 1
-            except:
-                id = 0
+            id = information_flows.next_id()
             information_flows[id] = dict()
 
             information_flows[id]["sender"] = microservice
@@ -221,33 +196,18 @@ def find_rst_variable(parameter: str, file: dict, line_nr: int, information_flow
             parameters[p] = "{" + parameters[p] + "}"
         elif parameters[p][0] == "\"" and parameters[p][-1] == "\"" and parameters[p].count("\"") == 2:     # it's a string, no change needed
             parameters[p] = parameters[p].strip().strip("\"")
-        elif "." in parameters[p]:               # means that it refers to some other file or class -> look for that file, then go through lines
-            try:
-                parameter_variable = parameters[p].split(".")[-1]
-                parameter_class = parameters[p].split(".")[-2]
-                files_containing_class = fi.search_keywords("class " + str(parameter_class))
-                correct_file = None
-                for filec in files_containing_class.keys():
-                    fc = files_containing_class[filec]
-                    for linec in range(len(fc["content"])):
-                        if "class" in fc["content"][linec] and parameter_class in fc["content"][linec]:
-                            correct_file = fc["name"]
-                            inside_class_definition = True
-                            lines_class = len(fc["content"]) - linec
-                            i = 0
-                            while inside_class_definition and i < lines_class:
-                                if "}" in fc["content"][i]:
-                                    inside_class_definition = False
-                                i += 1
-                                if parameter_variable in fc["content"][linec + i] and "=" in fc["content"][linec + i]:
-                                    parameters[p] = fc["content"][linec + i].split("=")[1].strip().strip(";").strip().strip("\"")
-                                    print("\t\tFound " + str(parameters[p]) + " in file " + str(correct_file))
-                                    if parameters[p][0] != "\"" or parameters[p][-1] != "\"":
-                                        if count < 50:
-                                            parameters[p], x = find_rst_variable(parameters[p], fc, linec, information_flows, microservice, dfd, count + 1)     # recursive step
-            except:
-                print("\tCould not find a definition for " + str(parameters[p]) + ".")
-                return False, information_flows
+        elif "." in parameters[p]:               # means that it refers to some other file or class -> look it up in the project's fields
+            parameter_variable = parameters[p].split(".")[-1]
+            parameter_class = parameters[p].split(".")[-2]
+            value = symbol_table.resolve(parameter_class, parameter_variable)
+            declarations = symbol_table.lookup(parameter_class, parameter_variable)
+            if value is not None:
+                print("\t\tFound " + str(value) + " for " + str(parameters[p]))
+                parameters[p] = value
+            elif declarations and count < 50:      # not a constant expression, e.g. a function's return value
+                declaration = declarations[0]       # names in the initialiser refer to the declaring class' file
+                declaring_file = get_declaring_file(declaration, parameter_variable)
+                parameters[p], x = find_rst_variable(declaration["initialiser"], declaring_file, declaration["line"], information_flows, microservice, dfd, count + 1)     # recursive step
         else:           # means that it's a variable in this file -> go through lines to find it
             found = False
             line = 0
@@ -284,6 +244,16 @@ def find_rst_variable(parameter: str, file: dict, line_nr: int, information_flow
     return variable, information_flows
 
 
+def get_declaring_file(declaration: dict, field_name: str) -> dict:
+    """Returns the file declaring a field in the format of keyword search results, matched at the field's name.
+    """
+
+    file = corpus.get_file(declaration["path"])
+    return {"content": corpus.get_lines(file) or list(), "name": file["name"], "path": file["path"],
+            "line_nr": str(declaration["line"] + 1),
+            "span": str((declaration["column"], declaration["column"] + len(field_name)))}
+
+
 def check_if_variable_is_input(variable: str, file, line_nr: int) -> bool:
     """Detects if a string in a given line is an input parameter.
     """
@@ -313,7 +283,7 @@ def match_incoming_to_outgoing_endpoints(incoming_endpoints: list, outgoing_endp
 
     microservices = tech_sw.get_microservices(dfd)
     information_flows_set = set()
-    information_flows = dict()
+    information_flows = CCollection()
     for o in outgoing_endpoints:
         for i in incoming_endpoints:
             if i[0] in o[0] and i[1] in o[0]:
@@ -349,10 +319,7 @@ def match_incoming_to_outgoing_endpoints(incoming_endpoints: list, outgoing_endp
                         stereotype_instances.append("ssl_secured")
 
         # set flow
-        try:
-            id = max(information_flows.keys()) + 1
-        except:
-            id = 0
+        id = information_flows.next_id()
         information_flows[id] = dict()
 
         information_flows[id]["sender"] = i[0]
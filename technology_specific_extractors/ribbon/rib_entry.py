@@ -1,7 +1,12 @@
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 
 
+@extractors.extractor("rib", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services", "model"),
+                      writes=("annotations",), keywords=("RibbonClient",),
+                      triggers=("RibbonClient",))
 def detect_ribbon_load_balancers(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detects load balancing via Ribbon.
     """
@@ -1,5 +1,8 @@
+import core.extractors as extractors
 import output_generators.traceability as traceability
 
+@extractors.extractor("itf", arguments=("microservices",), returns=("microservices",),
+                      reads=("services", "annotations"), writes=("annotations",))
 def classify_internal_infrastructural(microservices: dict) -> dict:
     """Classifies processes as either internal or infrastructural.
     The latter if they are marked as one of the known infrastructural technologies.
@@ -1,8 +1,14 @@
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("sad", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"),
+                      reads=("services", "properties", "annotations", "flows", "model"),
+                      writes=("annotations", "flows"), keywords=("@EnableAdminServer",),
+                      triggers=("@EnableAdminServer",))
 def detect_spring_admin_server(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detects Spring Admin Servers.
     """
@@ -53,25 +59,20 @@ def detect_spring_admin_server(microservices: dict, information_flows: dict, dfd
         if host and host == admin_server:
             if reverse: # flow admin -> service-discovery
                 found = False
-                for i in information_flows.keys():
-                    if information_flows[i]["sender"] == admin_server and information_flows[i]["receiver"] == microservices[m]["name"]:
-                        found = True
-                        information_flows[i]["sender"] = microservices[m]["name"]
-                        information_flows[i]["receiver"] = admin_server
+                for i in information_flows.find_flows(admin_server, microservices[m]["name"]):
+                    found = True
+                    information_flows.set_flow_ends(i, microservices[m]["name"], admin_server)
 
-                        trace = dict()
-                        trace["item"] = microservices[m]["name"] + " -> " + admin_server
-                        trace["file"] = trace_info[0]
-                        trace["line"] = trace_info[1]
-                        trace["span"] = trace_info[2]
+                    trace = dict()
+                    trace["item"] = microservices[m]["name"] + " -> " + admin_server
+                    trace["file"] = trace_info[0]
+                    trace["line"] = trace_info[1]
+                    trace["span"] = trace_info[2]
 
-                        traceability.add_trace(trace)
+                    traceability.add_trace(trace)
 
                 if not found:
-                    try:
-                        id = max(information_flows.keys()) + 1
-                    except:
-                        id = 0
+                    id = information_flows.next_id()
                     information_flows[id] = dict()
 
                     information_flows[id]["sender"] = microservices[m]["name"]
@@ -89,25 +90,20 @@ def detect_spring_admin_server(microservices: dict, information_flows: dict, dfd
 
             elif config_reverse:
                 found = False
-                for i in information_flows.keys():
-                    if information_flows[i]["sender"] == microservices[m]["name"] and information_flows[i]["receiver"] == admin_server:
-                        found = True
-                        information_flows[i]["sender"] = admin_server
-                        information_flows[i]["receiver"] = microservices[m]["name"]
+                for i in information_flows.find_flows(microservices[m]["name"], admin_server):
+                    found = True
+                    information_flows.set_flow_ends(i, admin_server, microservices[m]["name"])
 
-                        trace = dict()
-                        trace["item"] = admin_server + " -> " + microservices[m]["name"]
-                        trace["file"] = trace_info[0]
-                        trace["line"] = trace_info[1]
-                        trace["span"] = trace_info[2]
+                    trace = dict()
+                    trace["item"] = admin_server + " -> " + microservices[m]["name"]
+                    trace["file"] = trace_info[0]
+                    trace["line"] = trace_info[1]
+                    trace["span"] = trace_info[2]
 
-                        traceability.add_trace(trace)
+                    traceability.add_trace(trace)
 
                 if not found:
-                    try:
-                        id = max(information_flows.keys()) + 1
-                    except:
-                        id = 0
+                    id = information_flows.next_id()
                     information_flows[id] = dict()
 
                     information_flows[id]["sender"] = admin_server
@@ -123,10 +119,7 @@ def detect_spring_admin_server(microservices: dict, information_flows: dict, dfd
                     traceability.add_trace(trace)
 
             else:
-                try:
-                    id = max(information_flows.keys()) + 1
-                except:
-                    id = 0
+                id = information_flows.next_id()
 
                 information_flows[id] = dict()
                 information_flows[id]["sender"] = admin_server
@@ -1,13 +1,19 @@
 import os.path
 
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.parse_files as parse
-import technology_specific_extractors.environment_variables as env
+import core.placeholders as placeholders
 import core.technology_switch as tech_sw
 import tmp.tmp as tmp
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("cnf", arguments=("microservices", "information_flows", "external_components", "dfd"),
+                      returns=("microservices", "information_flows", "external_components"),
+                      reads=("services", "properties", "model", "placeholders"),
+                      writes=("properties", "annotations", "flows", "components", "placeholders"), keywords=("@EnableConfigServer",),
+                      files=("*.yml", "*.yaml", "*.properties"))
 def detect_spring_config(microservices: dict, information_flows: dict, external_components: dict, dfd) -> dict:
     """Detects Spring Cloud Config server and connections to it. And parses config files.
     """
@@ -116,12 +122,12 @@ def detect_config_clients(microservices: dict, information_flows: dict, config_s
                 trace_line = prop[2][1]
                 trace_span = prop[2][2]
             elif prop[0] == "config_username":
-                config_username = env.resolve_env_var(prop[1])
+                config_username = prop[1]
                 trace_file = prop[2][0]
                 trace_line = prop[2][1]
                 trace_span = prop[2][2]
             elif prop[0] == "config_password":
-                config_password = env.resolve_env_var(prop[1])
+                config_password = prop[1]
                 trace_file = prop[2][0]
                 trace_line = prop[2][1]
                 trace_span = prop[2][2]
@@ -142,10 +148,7 @@ def detect_config_clients(microservices: dict, information_flows: dict, config_s
                 if "localhost:" + str(port) in config_uri:
                     config_connected = True
         if config_connected:
-            try:
-                id = max(information_flows.keys()) + 1
-            except:
-                id = 0
+            id = information_flows.next_id()
             information_flows[id] = dict()
             information_flows[id]["sender"] = config_server
             information_flows[id]["receiver"] = microservices[m]["name"]
@@ -245,17 +248,18 @@ def parse_config_files(config_server: str, config_file_path: str, config_file_pa
             contents.add((file.name, file.path))
 
     if contents:
+        ids_by_name = dict()
+        for m in microservices.keys():
+            ids_by_name.setdefault(microservices[m]["name"], m)
         for file in contents:
             ending = False
             microservice = False
             properties = set()
-            for m in microservices.keys():
-                if file[0].split(".")[0] == microservices[m]["name"]:
-                    microservice = microservices[m]["name"]
-                    correct_id = m
-                    if "." in file[0]:
-                        ending = file[0].split(".")[1]
-                    break
+            if file[0].split(".")[0] in ids_by_name:
+                correct_id = ids_by_name[file[0].split(".")[0]]
+                microservice = microservices[correct_id]["name"]
+                if "." in file[0]:
+                    ending = file[0].split(".")[1]
             if not microservice:
                 for m in microservices.keys():
                     if  microservices[m]["name"] in file[0].split(".")[0]:
@@ -276,6 +280,7 @@ def parse_config_files(config_server: str, config_file_path: str, config_file_pa
                         microservices[correct_id]["properties"] |= properties
                     else:
                         microservices[correct_id]["properties"] = properties
+                    placeholders.resolve_service(microservices[correct_id])
 
     return microservices, information_flows, external_components
 
@@ -284,19 +289,13 @@ def set_repo(information_flows: dict, external_components: dict, config_repo_uri
     """Adds a repo to the external components.
     """
 
-    try:
-        id = max(information_flows.keys()) + 1
-    except:
-        id = 0
+    id = information_flows.next_id()
     information_flows[id] = dict()
     information_flows[id]["sender"] = "github-repository"
     information_flows[id]["receiver"] = config_server
     information_flows[id]["stereotype_instances"] = ["restful_http"]
 
-    try:
-        id = max(external_components.keys()) + 1
-    except:
-        id = 0
+    id = external_components.next_id()
     external_components[id] = dict()
     external_components[id]["name"] = "github-repository"
     external_components[id]["type"] = "external_component"
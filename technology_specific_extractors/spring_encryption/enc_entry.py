@@ -1,7 +1,31 @@
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 
 
+@extractors.extractor("enc", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services", "model"),
+                      writes=("annotations",),
+                      keywords=("BCryptPasswordEncoder",
+                                "Pbkdf2PasswordEncoder",
+                                "ShaPasswordEncoder",
+                                "Keygenerator",
+                                "Encryptors stronger",
+                                "Encryptors standard",
+                                "Encryptors text",
+                                "Encryptors delux",
+                                "Encryptors queryableText",
+                                "Encryptors noOpText"),
+                      triggers=("BCryptPasswordEncoder",
+                                "Pbkdf2PasswordEncoder",
+                                "ShaPasswordEncoder",
+                                "Keygenerator",
+                                "Encryptors stronger",
+                                "Encryptors standard",
+                                "Encryptors text",
+                                "Encryptors delux",
+                                "Encryptors queryableText",
+                                "Encryptors noOpText"))
 def detect_spring_encryption(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detects use of Spring's crypto module encryption functions.
     """
@@ -1,9 +1,15 @@
 import core.external_components as ext
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("sgt", arguments=("microservices", "information_flows", "external_components", "dfd"),
+                      returns=("microservices", "information_flows", "external_components"),
+                      reads=("services", "properties", "annotations", "flows", "components", "model"),
+                      writes=("annotations", "flows", "components"), keywords=("spring-cloud-starter-gateway",),
+                      triggers=("spring-cloud-starter-gateway",))
 def detect_spring_cloud_gateway(microservices: dict, information_flows: dict, external_components: dict, dfd) -> dict:
     """Detetcs Spring Cloud Gateway.
     """
@@ -45,12 +51,10 @@ def detect_spring_cloud_gateway(microservices: dict, information_flows: dict, ex
                     discovery_server = microservices[m2]["name"]
                     break
         if discovery_server:
-            for i in information_flows.keys():
-                if information_flows[i]["sender"] == server and information_flows[i]["receiver"] == discovery_server:
-                    information_flows[i]["sender"] = discovery_server
-                    information_flows[i]["receiver"] = server
+            for i in information_flows.find_flows(server, discovery_server):
+                information_flows.set_flow_ends(i, discovery_server, server)
 
-                    traceability.revert_flow(server, discovery_server)
+                traceability.revert_flow(server, discovery_server)
 
         # Adding user
         external_components = ext.add_user(external_components)
@@ -68,10 +72,7 @@ def detect_spring_cloud_gateway(microservices: dict, information_flows: dict, ex
                         if microservices[m2]["name"] == prop[1]:
                             target_service = prop[1]
                 if target_service:
-                    try:
-                        id = max(information_flows.keys()) + 1
-                    except:
-                        id = 0
+                    id = information_flows.next_id()
                     information_flows[id] = dict()
                     information_flows[id]["sender"] = server
                     information_flows[id]["receiver"] = target_service
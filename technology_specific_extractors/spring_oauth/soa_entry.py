@@ -1,9 +1,14 @@
+import core.extractors as extractors
 import core.file_interaction as fi
-import technology_specific_extractors.environment_variables as env
+import core.java_index as java_index
 import core.technology_switch as tech_sw
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("soa", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services", "properties", "model", "placeholders"),
+                      writes=("annotations", "flows", "placeholders"),
+                      keywords=("@EnableAuthorizationServer", "@EnableResourceServer", "@PreAuthorize"))
 def detect_spring_oauth(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detect Spring OAuth Server and connections to it.
     """
@@ -87,7 +92,7 @@ def detect_token_server(microservices: dict, information_flows: dict, dfd) -> di
         client_secret = False
         for prop in microservices[m]["properties"]:
             if prop[0] == "oauth_client_secret":
-                client_secret = env.resolve_env_var(prop[1])
+                client_secret = prop[1]
         if client_secret:
             stereotypes = ["authentication_with_plaintext_credentials", "auth_provider", "restful_http", "plaintext_credentials_link"]
             tagged_values = [("Password", client_secret)]
@@ -114,10 +119,7 @@ def detect_token_server(microservices: dict, information_flows: dict, dfd) -> di
 
                             traceability.add_trace(trace)
 
-                    try:
-                        id = max(information_flows.keys()) + 1
-                    except:
-                        id = 0
+                    id = information_flows.next_id()
                     information_flows[id] = dict()
 
                     information_flows[id]["sender"] = token_server
@@ -147,7 +149,7 @@ def detect_preauthorized_methods(microservices: dict, dfd) -> dict:
         if not "readme" in results[r]["path"].casefold() and not "test" in results[r]["path"].casefold():
             # Try extracting endpoints
             tagged_values = set()
-            endpoints = extract_endpoints(results[r]["content"])
+            endpoints = extract_endpoints(results[r]["path"])
             if endpoints:
                 tagged_values = [("Pre-authorized Endpoints", endpoints)]
 
@@ -176,20 +178,20 @@ def detect_preauthorized_methods(microservices: dict, dfd) -> dict:
     return microservices
 
 
-def extract_endpoints(file_as_lines):
-    """Extracts the endpoints that are pre-authorized.
+def extract_endpoints(path: str):
+    """Extracts the endpoints that are pre-authorized, i.e. mapped by the annotation on the line after @PreAuthorize.
     """
 
     endpoints = set()
     mappings = ["RequestMapping", "GetMapping", "PostMapping", "PutMapping", "DeleteMapping", "PatchMapping"]
 
-    for line_nr in range(len(file_as_lines)):
-        line = file_as_lines[line_nr]
-        if "@PreAuthorize" in line:
+    annotations = java_index.get_index(path)["annotations"]
+    for number in range(len(annotations) - 1):
+        if annotations[number]["name"] == "PreAuthorize":
             endpoint = False
-            for mapping in mappings:
-                if mapping in file_as_lines[line_nr + 1]:
-                    endpoint = extract_endpoint_part(file_as_lines[line_nr + 1])
+            mapping = annotations[number + 1]
+            if mapping["name"] in mappings and mapping["line"] == annotations[number]["line"] + 1:
+                endpoint = extract_endpoint_part(mapping["arguments"] or "")
 
             if endpoint:
                 endpoints.add(endpoint)
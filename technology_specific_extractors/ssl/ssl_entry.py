@@ -1,4 +1,8 @@
+import core.extractors as extractors
 
+
+@extractors.extractor("ssl", arguments=("microservices",), returns=("microservices",), reads=("properties",),
+                      writes=("annotations",))
 def detect_ssl_services(microservices: dict) -> dict:
     """Checks if services have ssl enabled.
     """
@@ -1,11 +1,20 @@
 import os
 
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
 import tmp.tmp as tmp
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("trb", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"),
+                      reads=("services", "annotations", "flows", "model"), writes=("annotations", "flows"),
+                      keywords=("@EnableTurbine",
+                                "@EnableTurbineAmqp",
+                                "EnableTurbineStream",
+                                "spring-cloud-netflix-hystrix-stream"),
+                      triggers=("@EnableTurbine", "EnableTurbineStream"))
 def detect_turbine(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detects turbine server.
     """
@@ -78,10 +87,7 @@ def detect_turbineamqp(microservices: dict, information_flows: dict, dfd) -> dic
 
                     if ("Monitoring Dashboard", "Hystrix") in microservices[m]["tagged_values"]:
                         dashboard = microservices[m]["name"]
-                        try:
-                            id = max(information_flows.keys()) + 1
-                        except:
-                            id = 0
+                        id = information_flows.next_id()
                         information_flows[id] = dict()
                         information_flows[id]["sender"] = microservice
                         information_flows[id]["receiver"] = dashboard
@@ -97,10 +103,7 @@ def detect_turbineamqp(microservices: dict, information_flows: dict, dfd) -> dic
 
                     elif ("Message Broker", "RabbitMQ") in microservices[m]["tagged_values"]:
                         rabbitmq = microservices[m]["name"]
-                        try:
-                            id = max(information_flows.keys()) + 1
-                        except:
-                            id = 0
+                        id = information_flows.next_id()
                         information_flows[id] = dict()
                         information_flows[id]["sender"] = rabbitmq
                         information_flows[id]["receiver"] = microservice
@@ -178,10 +181,7 @@ def detect_turbine_stream(microservices: dict, information_flows: dict, dfd) ->
 
                     if ("Monitoring Dashboard", "Hystrix") in microservices[id]["tagged_values"]:
                         dashboard = microservices[id]["name"]
-                        try:
-                            id = max(information_flows.keys()) + 1
-                        except:
-                            id = 0
+                        id = information_flows.next_id()
                         information_flows[id] = dict()
                         information_flows[id]["sender"] = microservice
                         information_flows[id]["receiver"] = dashboard
@@ -199,10 +199,7 @@ def detect_turbine_stream(microservices: dict, information_flows: dict, dfd) ->
         for m in microservices.keys():
             if ("Message Broker", "RabbitMQ") in microservices[m]["tagged_values"]:
                 rabbitmq = microservices[m]["name"]
-                try:
-                    id = max(information_flows.keys()) + 1
-                except:
-                    id = 0
+                id = information_flows.next_id()
                 information_flows[id] = dict()
                 information_flows[id]["sender"] = rabbitmq
                 information_flows[id]["receiver"] = turbine_server
@@ -226,10 +223,7 @@ def detect_turbine_stream(microservices: dict, information_flows: dict, dfd) ->
         results = fi.search_keywords("spring-cloud-netflix-hystrix-stream")     # content, name, path
         for r in results.keys():
             microservice = tech_sw.detect_microservice(results[r]["path"], dfd)
-            try:
-                id = max(information_flows.keys()) + 1
-            except:
-                id = 0
+            id = information_flows.next_id()
             information_flows[id] = dict()
             information_flows[id]["sender"] = microservice
             information_flows[id]["receiver"] = rabbitmq
@@ -1,6 +1,10 @@
+import core.extractors as extractors
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("zip", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services", "properties"),
+                      writes=("services", "annotations", "flows"))
 def detect_zipkin_server(microservices: dict, information_flows: dict, iterative=False) -> dict:
     """Detects zipkin server and connections to it.
     """
@@ -47,10 +51,7 @@ def detect_zipkin_server(microservices: dict, information_flows: dict, iterative
                                 zipkin_server = microservices[m2]["name"]
                         if zipkin_server:
                             correct_id = m2
-                            try:
-                                id = max(information_flows.keys()) + 1
-                            except:
-                                id = 0
+                            id = information_flows.next_id()
                             information_flows[id] = dict()
                             information_flows[id]["sender"] = microservices[m]["name"]
                             information_flows[id]["receiver"] = zipkin_server
@@ -90,7 +91,7 @@ def detect_zipkin_server(microservices: dict, information_flows: dict, iterative
             port = connections_exist.split("http:")[1]
             if ":" in port:
                 port = port.split(":")[1].strip("/").strip()
-        id_ = max(microservices.keys(), default=-1) + 1
+        id_ = microservices.next_id()
         microservices[id_] = dict()
         microservices[id_]["name"] = "zipkin-server"
         microservices[id_]["image"] = "placeholder_image"
@@ -1,6 +1,10 @@
+import core.extractors as extractors
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("zoo", arguments=("microservices", "information_flows", "dfd"),
+                      returns=("microservices", "information_flows"), reads=("services", "annotations", "flows"),
+                      writes=("annotations", "flows"))
 def detect_zookeeper(microservices: dict, information_flows: dict, dfd) -> dict:
     """Detects ZooKeeper config services.
     """
@@ -28,10 +32,7 @@ def detect_zookeeper(microservices: dict, information_flows: dict, dfd) -> dict:
                 if prop == ("Message Broker", "Kafka"):
                     kafka_service = microservices[m]["name"]
         if kafka_service:
-            try:
-                id = max(information_flows.keys()) + 1
-            except:
-                id = 0
+            id = information_flows.next_id()
             information_flows[id] = dict()
             information_flows[id]["sender"] = zookeeper_service
             information_flows[id]["receiver"] = kafka_service
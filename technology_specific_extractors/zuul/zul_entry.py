@@ -1,25 +1,21 @@
 import core.external_components as ext
+import core.extractors as extractors
 import core.file_interaction as fi
 import core.technology_switch as tech_sw
-import tmp.tmp as tmp
 import output_generators.traceability as traceability
 
 
+@extractors.extractor("zul", arguments=("microservices", "information_flows", "external_components", "dfd"),
+                      returns=("microservices", "information_flows", "external_components"),
+                      reads=("services", "properties", "annotations", "flows", "components", "model"),
+                      writes=("annotations", "flows", "components"), keywords=("@EnableZuulProxy", "@EnableZuulServer"),
+                      triggers=("@EnableZuulProxy", "@EnableZuulServer"))
 def detect_zuul(microservices: dict, information_flows: dict, external_components: dict, dfd) -> dict:
     """Detects Zuul gateway if there is one.
     """
 
     # Server (/microservice classification)
-    results = fi.search_keywords("@EnableZuulServer")
-    new_results = fi.search_keywords("@EnableZuulProxy")
-
-    for r in new_results.keys():
-        try:
-            id = max(results.keys()) + 1
-        except:
-            id = 0
-        results[id] = dict()
-        results[id] = new_results[r]
+    results = fi.search_keywords(["@EnableZuulServer", "@EnableZuulProxy"])
     zuul_server = str()
     for r in results.keys():
         zuul_server = tech_sw.detect_microservice(results[r]["path"], dfd)
@@ -53,10 +49,8 @@ def detect_zuul(microservices: dict, information_flows: dict, external_component
                             break
                 if discovery_server:
                     traceability.revert_flow(zuul_server, discovery_server)
-                    for i in information_flows.keys():
-                        if information_flows[i]["sender"] == zuul_server and information_flows[i]["receiver"] == discovery_server:
-                            information_flows[i]["sender"] = discovery_server
-                            information_flows[i]["receiver"] = zuul_server
+                    for i in information_flows.find_flows(zuul_server, discovery_server):
+                        information_flows.set_flow_ends(i, discovery_server, zuul_server)
 
                 # Adding user
                 external_components = ext.add_user(external_components)
@@ -86,10 +80,7 @@ def detect_zuul(microservices: dict, information_flows: dict, external_component
                                     if microservices[m]["name"] in part.split(":")[0].casefold():
                                         receiver = microservices[m]["name"]
                         if receiver:
-                            try:
-                                id = max(information_flows.keys()) + 1
-                            except:
-                                id = 0
+                            id = information_flows.next_id()
                             information_flows[id] = dict()
                             information_flows[id]["sender"] = zuul_server
                             information_flows[id]["receiver"] = receiver
@@ -112,5 +103,5 @@ def detect_zuul(microservices: dict, information_flows: dict, external_component
                                 except:
                                     information_flows[id]["tagged_values"] = [("Load Balancer", load_balancer)]
 
-    tmp.tmp_config.set("DFD", "external_components", str(external_components).replace("%", "%%"))
+    dfd.external_components = external_components
     return microservices, information_flows, external_components
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.corpus as corpus
+import core.placeholders as placeholders
+import core.symbol_table as symbol_table
+import tmp.tmp as tmp
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Returns a function writing files into an empty repository that the corpus is loaded from.
+    """
+
+    tmp.tmp_config.read_dict({"Repository": {"local_path": str(tmp_path)}, "Analysis Settings": {}})
+    corpus.reset()
+    placeholders.reset()
+    symbol_table.reset()
+
+    def write(files: dict):
+        for path, content in files.items():
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text(content)
+        corpus.reset()
+        placeholders.reset()
+        symbol_table.reset()
+        return tmp_path
+
+    yield write
+    corpus.reset()
+    placeholders.reset()
+    symbol_table.reset()
+    tmp.tmp_config.remove_option("Repository", "local_path")
@@ -0,0 +1,9 @@
+package com.ex.registry;
+
+@SpringBootApplication
+@EnableEurekaServer
+public class RegistryApplication {
+    public static void main(String[] args) {
+        SpringApplication.run(RegistryApplication.class, args);
+    }
+}
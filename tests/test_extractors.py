@@ -0,0 +1,49 @@
+import ast
+
+import code2DFD
+import core.dfd_extraction as dfd_extraction
+import core.extractors as extractors
+
+
+def get_level_names(names) -> list:
+    sequence = extractors.get_extractors(names)
+    return [[sequence[i]["name"] for i in level] for level in extractors.get_levels(sequence)]
+
+
+def test_service_levels():
+    assert get_level_names(dfd_extraction.SERVICE_EXTRACTORS) == [
+        ["dbs", "port", "ssl", "cnf", "eur_server"],
+        ["port", "brokers"],
+        ["hts"],
+    ]
+
+
+def test_information_flow_levels():
+    communication_techs = ast.literal_eval(code2DFD.COMMUNICATIONS_TECH_LIST)
+    assert get_level_names([tech[1] for tech in communication_techs]) == [
+        ["rmq"], ["kfk"], ["rst"], ["fgn"], ["imp"], ["dbc"], ["html"], ["dcm"],
+    ]
+
+
+def test_classification_levels():
+    assert get_level_names(dfd_extraction.CLASSIFICATION_EXTRACTORS) == [
+        ["eur"], ["zul"], ["sgt", "soa", "cns", "hsx_dashboard"], ["trb", "llo", "zip"], ["sad"], ["prm"], ["cbr"],
+        ["lob", "rib", "hsx"], ["zoo", "kib"], ["ela"], ["log"], ["ngn"], ["grf", "enc", "rrr"], ["misc"], ["aph"],
+        ["itf"], ["plc"],
+    ]
+
+
+def test_levels_keep_order_of_conflicting_extractors():
+    for names in [dfd_extraction.SERVICE_EXTRACTORS, dfd_extraction.CLASSIFICATION_EXTRACTORS]:
+        sequence = extractors.get_extractors(names)
+        level_of = {j: level for level, positions in enumerate(extractors.get_levels(sequence)) for j in positions}
+        for j in range(len(sequence)):
+            for i in range(j):
+                if extractors.conflicts_with(sequence[j], sequence[i]):
+                    assert level_of[j] >= level_of[i], (sequence[i]["name"], sequence[j]["name"])
+
+
+def test_graph_follows_declarations():
+    sequence = extractors.get_extractors(("cnf", "soa", "hts"))
+
+    assert extractors.create_graph(sequence) == {0: set(), 1: {0}, 2: set()}    # soa reads what cnf writes
@@ -0,0 +1,33 @@
+import core.java_index as java_index
+
+
+SOURCE = """public class Client {
+    private int a = 1, b = 2;
+    static final String URL = "http://" + HOST, OTHER = "y";
+    private Map<String, Integer> m = new HashMap<String, Integer>(), n;
+    boolean c = x < y, d = f(1, 2) > 0;
+    private RestTemplate restTemplate;
+
+    void run() {
+        int local = 1, other = 2;
+    }
+}
+"""
+
+
+def test_fields_of_every_declarator():
+    fields = java_index.create_index(SOURCE.splitlines(True))["fields"]
+
+    assert [(field["type"], field["name"], field["initialiser"]) for field in fields] == [
+        ("int", "a", "1"),
+        ("int", "b", "2"),
+        ("String", "URL", '"http://" + HOST'),
+        ("String", "OTHER", '"y"'),
+        ("Map<String, Integer>", "m", "new HashMap<String, Integer>()"),
+        ("Map<String, Integer>", "n", None),
+        ("boolean", "c", "x < y"),
+        ("boolean", "d", "f(1, 2) > 0"),
+        ("RestTemplate", "restTemplate", None),
+    ]
+    assert fields[3]["modifiers"] == ["static", "final"]
+    assert (fields[3]["line"], fields[3]["column"]) == (2, 48)
@@ -0,0 +1,60 @@
+import core.parse_files as parse
+
+
+PROPERTIES = """# order service
+spring.application.name=order-service
+server.port: 8080
+server.port = 9090
+spring.datasource.url=jdbc:mysql://db:3306/orders?user=root
+spring.datasource.username = admin
+spring.cloud.config.uri=http://config:8888
+eureka.client.serviceUrl.defaultZone: http://registry:8761/eureka/
+spring.cloud.stream.kafka.binder.brokers="kafka:9092"
+spring.boot.admin.url=http://admin:9000,http://admin2:9000
+server.ssl.key-store: classpath:keystore.p12
+server.ssl.key-store-password=changeit
+  server.ssl.enabled=false
+"""
+
+PATH = "order-service/src/main/resources/application.properties"
+
+
+def test_properties_match_previous_parser(repository):
+    # Expected tuples as emitted by the elif chain the table replaced
+    repository({PATH: PROPERTIES})
+
+    microservice, properties = parse.parse_properties_file(PATH)
+
+    assert microservice == ["order-service", (PATH, 2, "(24:37)")]
+    assert properties == {
+        ("port", 9090, (PATH, 3, (0, 11))),
+        ("datasource_url", "jdbc:mysql://db:3306/orders?user", (PATH, 4, (0, 21))),
+        ("datasource_username", " admin\n", (PATH, 5, (0, 26))),
+        ("config_uri", "http://config:8888\n", (PATH, 6, (0, 23))),
+        ("config_connected", True, (PATH, 6, (0, 23))),
+        ("eureka_connected", True, (PATH, 7, (0, 36))),
+        ("kafka_stream_binder", "kafka:9092", (PATH, 8, (0, 40))),
+        ("admin_server_url", "http://admin:9000", (PATH, 9, (0, 21))),
+        ("ssl_enabled", True, (PATH, 10, (0, 10))),
+        ("ssl_enabled", True, (PATH, 11, (0, 10))),
+        ("ssl_enabled", True, (PATH, 12, (2, 12))),
+        ("ssl_enabled", "false\n", (PATH, 12, (2, 20))),
+    }
+
+
+def test_keys_are_matched_anywhere_in_the_line(repository):
+    repository({PATH: "# spring.datasource.password=commented\nmanagement.server.port=8081\n"})
+
+    microservice, properties = parse.parse_properties_file(PATH)
+
+    assert properties == {
+        ("datasource_password", "commented\n", (PATH, 0, (2, 28))),
+        ("port", 8081, (PATH, 1, (11, 22))),
+    }
+
+
+def test_values_without_equals_sign_are_skipped(repository):
+    # The previous parser failed on these lines
+    repository({PATH: "spring.application.name: order-service\nspring.datasource.url: jdbc:mysql://db/orders\n"})
+
+    assert parse.parse_properties_file(PATH) == ([False, False], set())
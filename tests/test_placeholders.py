@@ -0,0 +1,45 @@
+import core.placeholders as placeholders
+import core.yaml_loader as yaml_loader
+
+
+COMPOSE = """services:
+  account-service:
+    build: ./account-service
+    environment:
+      MONGODB_PASSWORD: $MONGODB_PASSWORD
+      ESCAPED: $$HOME
+      UNDEFINED: $UNDEFINED_PASSWORD
+      DEFAULTED: ${UNDEFINED_PASSWORD:-compose}
+"""
+
+
+def resolve(value: str) -> str:
+    microservice = {"name": "account-service", "properties": {("value", value, ("file", 1, "span"))}}
+    placeholders.resolve_service(microservice)
+    return next(iter(microservice["properties"]))[1]
+
+
+def test_compose_variable_resolved_from_dotenv(repository):
+    repository({"docker-compose.yml": COMPOSE, ".env": "MONGODB_PASSWORD=mongopw\n"})
+
+    assert resolve("${MONGODB_PASSWORD:secret}") == "mongopw"
+
+
+def test_yaml_value_resolved(repository):
+    repository({"docker-compose.yml": COMPOSE, ".env": "MONGODB_PASSWORD=mongopw\n"})
+
+    assert resolve(yaml_loader.CStr("${MONGODB_PASSWORD:secret}")) == "mongopw"
+
+
+def test_unresolved_compose_variable_is_unset(repository):
+    repository({"docker-compose.yml": COMPOSE})
+
+    assert resolve("${MONGODB_PASSWORD:secret}") == "secret"
+    assert resolve("${UNDEFINED:secret}") == "secret"
+
+
+def test_compose_escape_and_default(repository):
+    repository({"docker-compose.yml": COMPOSE})
+
+    assert resolve("${ESCAPED}") == "$HOME"
+    assert resolve("${DEFAULTED}") == "compose"
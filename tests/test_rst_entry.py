@@ -0,0 +1,37 @@
+from core.DFD import CCollection, CDFD
+import core.corpus as corpus
+import technology_specific_extractors.resttemplate.rst_entry as rst
+
+
+URLS = """public class Urls {
+    private static String base;
+
+    static {
+        base = "http://order-service";
+    }
+
+    public static final String ORDERS = base + "/orders";
+}
+"""
+
+CLIENT = """public class Client {
+    private String base = "http://payment-service";
+
+    public void order() {
+        restTemplate.getForObject(Urls.ORDERS, String.class);
+    }
+}
+"""
+
+
+def test_initialiser_resolved_in_declaring_file(repository):
+    repository({"client/src/main/java/Urls.java": URLS, "client/src/main/java/Client.java": CLIENT})
+    dfd = CDFD("test")
+    dfd.microservices = CCollection({0: {"name": "client"}, 1: {"name": "order-service"}, 2: {"name": "payment-service"}})
+    file = corpus.get_file("client/src/main/java/Client.java")
+    caller = {"content": corpus.get_lines(file), "name": file["name"], "path": file["path"], "line_nr": "5",
+              "span": "(8, 33)"}
+
+    url, information_flows = rst.find_rst_variable("Urls.ORDERS", caller, 4, CCollection(), "client", dfd)
+
+    assert url == "http://order-service/orders"
@@ -0,0 +1,68 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+import pytest
+
+import core.corpus as corpus
+import core.search_index as search_index
+import tmp.tmp as tmp
+
+
+@pytest.fixture
+def git_repository():
+    """Returns the path of a git repository with one committed service. Paths containing "test" are not searchable,
+    so it is created outside of pytest's tmp_path.
+    """
+
+    path = tempfile.mkdtemp(prefix="code2dfd-")
+    os.makedirs(os.path.join(path, "service"))
+    write(path, "service/application.properties", "server.port=8080\n")
+    write(path, "service/Main.java", "class Main {}\n")
+    subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+    subprocess.run(["git", "add", "-A"], cwd=path, check=True)
+    subprocess.run(["git", "-c", "user.name=code2dfd", "-c", "user.email=code2dfd@example.com", "commit", "-q", "-m", "init"],
+                   cwd=path, check=True)
+    tmp.tmp_config.read_dict({"Repository": {"local_path": path}, "Analysis Settings": {}})
+    corpus.reset()
+    yield path
+    corpus.reset()
+    tmp.tmp_config.remove_option("Repository", "local_path")
+    shutil.rmtree(path)
+
+
+def write(path: str, name: str, content: str):
+    with open(os.path.join(path, name), "w") as file:
+        file.write(content)
+
+
+def test_signature_of_clean_repository_reads_no_files(git_repository):
+    signature = search_index.corpus_signature()
+
+    assert all("hash" not in file for file in corpus.get_files().values())
+    corpus.reset()
+    assert search_index.corpus_signature() == signature
+
+
+def test_signature_changes_with_working_tree(git_repository):
+    signature = search_index.corpus_signature()
+
+    write(git_repository, "service/application.properties", "server.port=9090\n")
+    corpus.reset()
+    modified = search_index.corpus_signature()
+    assert modified != signature
+    assert corpus.get_file("service/application.properties")["hash"]
+
+    write(git_repository, "service/application.properties", "server.port=8080\n")
+    write(git_repository, "service/Client.java", "class Client {}\n")
+    corpus.reset()
+    assert search_index.corpus_signature() not in (signature, modified)
+
+
+def test_signature_without_git(git_repository):
+    signature = search_index.corpus_signature()
+    shutil.rmtree(os.path.join(git_repository, ".git"))
+    corpus.reset()
+
+    assert search_index.corpus_signature() == signature
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+import output_generators.traceability as traceability
+import tmp.tmp as tmp
+
+
+# Expected outputs below are those of the list-scanning implementation the CTrace records replaced
+CALLS = [
+    ("add_trace", {"item": "order-service", "file": "order/pom.xml", "line": 5, "span": (10, 23)}),
+    ("add_trace", {"parent_item": "order-service", "item": "Port", "file": "order/application.yml", "line": 3, "span": "(8:12)"}),
+    ("add_trace", {"parent_item": "order-service", "item": "Port", "file": "order/application.yml", "line": 3, "span": "(8:12)"}),
+    ("add_trace", {"parent_item": "order-service", "item": "internal", "file": "heuristic", "line": "heuristic", "span": "heuristic"}),
+    ("add_trace", {"parent_item": "order-service", "item": "Port", "file": "order/application.properties", "line": 7, "span": (0, 11)}),
+    ("add_trace", {"parent_item": "unknown-service", "item": "Port", "file": "unknown/application.yml", "line": 1, "span": "(0:4)"}),
+    ("add_trace", {"item": "config-server", "file": "config/pom.xml", "line": 4, "span": (10, 23)}),
+    ("add_trace", {"parent_item": "config-server", "item": "configuration_server", "file": "config/Application.java", "line": 9, "span": (0, 22)}),
+    ("add_trace", {"item": "config-server", "file": "config/pom.xml", "line": 4, "span": (10, 23)}),
+    ("add_trace", {"item": "registry", "file": "registry/pom.xml", "line": 6, "span": (10, 18)}),
+    ("add_trace", {"item": "order-service -> config-server", "file": "order/bootstrap.yml", "line": 2, "span": "(4:30)"}),
+    ("add_trace", {"parent_item": "order-service -> config-server", "item": "restful_http", "file": "heuristic", "line": "heuristic", "span": "heuristic"}),
+    ("add_trace", {"item": "config-server -> registry", "file": "config/application.yml", "line": 11, "span": "(2:40)"}),
+    ("add_trace", {"item": "registry -> config-server", "file": "registry/application.yml", "line": 1, "span": "(0:9)"}),
+    ("add_trace", {"item": "order-service -> registry", "file": "order/application.yml", "line": 12, "span": "(2:40)"}),
+    ("add_trace", {"item": "order-service", "file": "order/build.gradle", "line": 1, "span": (0, 13)}),
+    ("add_trace", {"parent_item": "order-service", "item": "Port", "file": "order/build.gradle", "line": 2, "span": (0, 4)}),
+    ("revert_flow", ("order-service", "config-server")),
+    ("revert_flow", ("config-server", "registry")),
+    ("revert_flow", ("gateway", "order-service")),
+    ("add_trace", {"item": "order-service -> registry", "file": "order/bootstrap.yml", "line": 5, "span": "(2:40)"}),
+]
+
+
+@pytest.fixture
+def output(tmp_path, monkeypatch):
+    """Returns a function replaying calls on an empty traceability store and returning the written JSON.
+    """
+
+    monkeypatch.setattr(traceability, "nodes", dict())
+    monkeypatch.setattr(traceability, "edges", dict())
+    output_path = tmp_path / "org" / "repo"
+    tmp.tmp_config.read_dict({"Repository": {"local_path": str(tmp_path)}, "Analysis Settings": {"output_path": str(output_path)}})
+
+    def replay(calls: list) -> dict:
+        for name, arguments in calls:
+            if name == "add_trace":
+                traceability.add_trace(dict(arguments))
+            else:
+                traceability.revert_flow(*arguments)
+        traceability.output_traceability()
+        with open(output_path / "org--repo_traceability.json") as file:
+            return json.load(file)
+
+    yield replay
+    tmp.tmp_config.remove_option("Analysis Settings", "output_path")
+    tmp.tmp_config.remove_option("Repository", "local_path")
+
+
+def test_sub_item_at_new_location_replaces_it(output):
+    assert output(CALLS[:6]) == {
+        "nodes": {
+            "order-service": {"file": "order/pom.xml", "line": 5, "span": "(10, 23)", "sub_items": {
+                "Port": {"file": "order/application.properties", "line": 7, "span": "(0, 11)"},
+                "internal": {"file": "heuristic", "line": "heuristic", "span": "heuristic"},
+            }},
+        },
+        "edges": {},
+    }
+
+
+def test_output_matches_previous_layout(output):
+    traces = output(CALLS)
+
+    assert traces == {
+        "nodes": {
+            "order-service": {"file": "order/build.gradle", "line": 1, "span": "(0, 13)", "sub_items": {
+                "Port": {"file": "order/build.gradle", "line": 2, "span": "(0, 4)"},
+            }},
+            "config-server": {"file": "config/pom.xml", "line": 4, "span": "(10, 23)", "sub_items": {
+                "configuration_server": {"file": "config/Application.java", "line": 9, "span": "(0, 22)"},
+            }},
+            "registry": {"file": "registry/pom.xml", "line": 6, "span": "(10, 18)"},
+        },
+        "edges": {
+            "registry -> config-server": {"file": "config/application.yml", "line": 11, "span": "(2:40)"},
+            "order-service -> registry": {"file": "order/bootstrap.yml", "line": 5, "span": "(2:40)"},
+            "config-server -> order-service": {"file": "order/bootstrap.yml", "line": 2, "span": "(4:30)"},
+        },
+    }
+    assert list(traces["nodes"]) == ["order-service", "config-server", "registry"]
+    assert list(traces["edges"]) == ["registry -> config-server", "order-service -> registry", "config-server -> order-service"]
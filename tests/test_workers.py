@@ -0,0 +1,79 @@
+import glob
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+import core.extractors as extractors
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE = os.path.join(ROOT, "tests", "fixtures", "config_server")
+CONFIG = """[Repository]
+
+[Technology Profiles]
+communication_techs_list = [("RabbitMQ", "rmq"), ("Kafka", "kfk"), ("RestTemplate", "rst"), ("FeignClient", "fgn"), ("Implicit Connections", "imp"), ("Database Connections", "dbc"), ("HTML", "html"), ("Docker-Compose", "dcm")]
+
+[Analysis Settings]
+development_mode = False
+extractor_workers = {workers}
+
+[DFD]
+"""
+
+
+def test_replaced_set_keeps_changes_of_other_extractors():
+    before = {"properties": {("port", 8080), ("password", "${PASSWORD}")}}
+    extended = {"properties": {("port", 8080), ("password", "${PASSWORD}"), ("ssl", True)}}
+    resolved = {"properties": {("port", 8080), ("password", "secret")}}       # replaced by another set
+
+    item = {"properties": set(before["properties"])}
+    extractors.apply_item_changes(item, extractors.get_item_changes(before, extended))
+    extractors.apply_item_changes(item, extractors.get_item_changes(before, resolved))
+
+    assert item["properties"] == {("port", 8080), ("password", "secret"), ("ssl", True)}
+
+
+def analyse(repository: str, directory: str, workers: int) -> dict:
+    config_path = os.path.join(directory, "config.ini")
+    with open(config_path, "w") as file:
+        file.write(CONFIG.format(workers=workers))
+    environment = dict(os.environ, PYTHONPATH=ROOT, PYTHONHASHSEED="0")
+    subprocess.run([sys.executable, os.path.join(ROOT, "code2DFD.py"), "--config_path", config_path,
+                    "--repo_url", repository], cwd=directory, env=environment, check=True, capture_output=True)
+
+    outputs = dict()
+    for suffix in ["_results.txt", "_traceability.json"]:
+        paths = glob.glob(os.path.join(directory, "code2DFD_output", "*", "*", "*" + suffix))
+        assert len(paths) == 1
+        with open(paths[0]) as file:
+            outputs[suffix] = file.read()
+    return outputs
+
+
+@pytest.mark.skipif(shutil.which("git") is None or "fork" not in multiprocessing.get_all_start_methods(),
+                    reason="needs git and forked worker processes")
+def test_workers_match_sequential_run():
+    directory = tempfile.mkdtemp(prefix="code2dfd-")     # the keyword search skips paths containing "test"
+    try:
+        repository = os.path.join(directory, "config_server")
+        shutil.copytree(FIXTURE, repository)
+        for command in [["init", "-q"], ["add", "-A"], ["-c", "user.name=code2DFD", "-c", "user.email=code2DFD@localhost",
+                                                         "commit", "-q", "-m", "Fixture"]]:
+            subprocess.run(["git", *command], cwd=repository, check=True)
+        os.makedirs(os.path.join(directory, "sequential"))
+        os.makedirs(os.path.join(directory, "workers"))
+
+        sequential = analyse(repository, os.path.join(directory, "sequential"), 1)
+        concurrent = analyse(repository, os.path.join(directory, "workers"), 4)
+
+        assert "('Password', 'mongopw')" in sequential["_results.txt"]
+        assert "('Gateway', 'Zuul')" in sequential["_results.txt"]
+        assert "'name': 'zipkin-server'" in sequential["_results.txt"]     # added by zip, after zul ran
+        assert concurrent == sequential
+    finally:
+        shutil.rmtree(directory)